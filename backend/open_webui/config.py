@@ -33,6 +33,7 @@ from open_webui.env import (
     log,
 )
 from open_webui.internal.db import Base, get_db
+from open_webui.utils.cache import PERMISSIONS_CACHE
 from open_webui.utils.redis import get_redis_connection
 
 
@@ -224,6 +225,7 @@ class AppConfig:
     ):
         super().__setattr__("_state", {})
         super().__setattr__("_redis_key_prefix", redis_key_prefix)
+        super().__setattr__("_version", 0)
         if redis_url:
             super().__setattr__(
                 "_redis",
@@ -236,10 +238,14 @@ class AppConfig:
         else:
             self._state[key].value = value
             self._state[key].save()
+            super().__setattr__("_version", self._version + 1)
+            # Resolved permissions are merged with USER_PERMISSIONS
+            PERMISSIONS_CACHE.invalidate()
 
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._redis.incr(f"{self._redis_key_prefix}:config:version")
 
     def __getattr__(self, key):
         if key not in self._state:
@@ -264,6 +270,20 @@ class AppConfig:
 
         return self._state[key].value
 
+    def get_version(self) -> int:
+        """
+        Counter bumped on every config update (shared between nodes through
+        Redis), usable as a cache key for anything derived from the config.
+        """
+        if self._redis:
+            try:
+                return int(
+                    self._redis.get(f"{self._redis_key_prefix}:config:version") or 0
+                )
+            except Exception as e:
+                log.error(f"Failed to read the config version from Redis: {e}")
+        return self._version
+
 
 ####################################
 # WEBUI_AUTH (Required for security)
@@ -966,6 +986,18 @@ ENABLE_BASE_MODELS_CACHE = PersistentConfig(
     os.environ.get("ENABLE_BASE_MODELS_CACHE", "False").lower() == "true",
 )
 
+# Seconds a /api/bootstrap payload is reused for the same user, config, models
+# and groups versions, 0 disables the cache
+try:
+    BOOTSTRAP_CACHE_TTL = int(os.environ.get("BOOTSTRAP_CACHE_TTL", "30"))
+except ValueError:
+    BOOTSTRAP_CACHE_TTL = 30
+
+try:
+    BOOTSTRAP_CACHE_SIZE = int(os.environ.get("BOOTSTRAP_CACHE_SIZE", "1000"))
+except ValueError:
+    BOOTSTRAP_CACHE_SIZE = 1000
+
 
 ####################################
 # TOOL_SERVERS
@@ -1823,6 +1855,31 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Periodically drop vector collections whose file is gone,
+# and web search collections older than WEB_SEARCH_COLLECTION_TTL seconds.
+# VECTOR_GC_INTERVAL=0 disables the collector.
+try:
+    VECTOR_GC_INTERVAL = int(os.environ.get("VECTOR_GC_INTERVAL", "3600"))
+except ValueError:
+    VECTOR_GC_INTERVAL = 3600
+
+try:
+    VECTOR_GC_BATCH_SIZE = int(os.environ.get("VECTOR_GC_BATCH_SIZE", "50"))
+except ValueError:
+    VECTOR_GC_BATCH_SIZE = 50
+
+try:
+    VECTOR_GC_BATCH_DELAY = float(os.environ.get("VECTOR_GC_BATCH_DELAY", "1"))
+except ValueError:
+    VECTOR_GC_BATCH_DELAY = 1.0
+
+try:
+    WEB_SEARCH_COLLECTION_TTL = int(
+        os.environ.get("WEB_SEARCH_COLLECTION_TTL", "86400")
+    )
+except ValueError:
+    WEB_SEARCH_COLLECTION_TTL = 86400
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
@@ -1955,6 +2012,10 @@ PINECONE_DIMENSION = int(os.getenv("PINECONE_DIMENSION", 1536))  # or 3072, 1024
 PINECONE_METRIC = os.getenv("PINECONE_METRIC", "cosine")
 PINECONE_CLOUD = os.getenv("PINECONE_CLOUD", "aws")  # or "gcp" or "azure"
 
+# BM25 (sparse index used by hybrid search)
+BM25_INDEX_DIR = CACHE_DIR / "bm25"
+BM25_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+
 ####################################
 # Information Retrieval (RAG)
 ####################################
@@ -2285,6 +2346,81 @@ RAG_EMBEDDING_BATCH_SIZE = PersistentConfig(
     ),
 )
 
+# Maximum number of embedding batch requests in flight at once
+try:
+    RAG_EMBEDDING_CONCURRENT_REQUESTS = int(
+        os.environ.get("RAG_EMBEDDING_CONCURRENT_REQUESTS", "4")
+    )
+except ValueError:
+    RAG_EMBEDDING_CONCURRENT_REQUESTS = 4
+
+# Connections reserved for search query embeddings, so large ingests cannot
+# hold up interactive searches
+try:
+    RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS = int(
+        os.environ.get("RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS", "2")
+    )
+except ValueError:
+    RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS = 2
+
+# Number of chunks embedded and inserted per step of the ingestion pipeline
+try:
+    RAG_INGEST_BATCH_SIZE = int(os.environ.get("RAG_INGEST_BATCH_SIZE", "256"))
+except ValueError:
+    RAG_INGEST_BATCH_SIZE = 256
+
+# Run file extraction and embedding as persistent background jobs instead of
+# inside the upload request
+ENABLE_BACKGROUND_FILE_PROCESSING = (
+    os.environ.get("ENABLE_BACKGROUND_FILE_PROCESSING", "False").lower() == "true"
+)
+
+try:
+    FILE_PROCESSING_CONCURRENCY = int(
+        os.environ.get("FILE_PROCESSING_CONCURRENCY", "2")
+    )
+except ValueError:
+    FILE_PROCESSING_CONCURRENCY = 2
+
+# Files embedded concurrently by /process/files/batch
+try:
+    FILE_PROCESSING_BATCH_CONCURRENCY = int(
+        os.environ.get("FILE_PROCESSING_BATCH_CONCURRENCY", "4")
+    )
+except ValueError:
+    FILE_PROCESSING_BATCH_CONCURRENCY = 4
+
+# Per-engine limits, e.g. {"docling": 1, "audio": 1}; engines not listed use
+# FILE_PROCESSING_CONCURRENCY
+try:
+    FILE_PROCESSING_ENGINE_CONCURRENCY = json.loads(
+        os.environ.get("FILE_PROCESSING_ENGINE_CONCURRENCY", "{}")
+    )
+except Exception:
+    FILE_PROCESSING_ENGINE_CONCURRENCY = {}
+
+try:
+    FILE_PROCESSING_MAX_RETRIES = int(
+        os.environ.get("FILE_PROCESSING_MAX_RETRIES", "2")
+    )
+except ValueError:
+    FILE_PROCESSING_MAX_RETRIES = 2
+
+try:
+    FILE_PROCESSING_POLL_INTERVAL = float(
+        os.environ.get("FILE_PROCESSING_POLL_INTERVAL", "5")
+    )
+except ValueError:
+    FILE_PROCESSING_POLL_INTERVAL = 5.0
+
+# Running jobs without a heartbeat for this long are requeued (node crashed)
+try:
+    FILE_PROCESSING_STALE_TIMEOUT = int(
+        os.environ.get("FILE_PROCESSING_STALE_TIMEOUT", "600")
+    )
+except ValueError:
+    FILE_PROCESSING_STALE_TIMEOUT = 600
+
 RAG_EMBEDDING_QUERY_PREFIX = os.environ.get("RAG_EMBEDDING_QUERY_PREFIX", None)
 
 RAG_EMBEDDING_CONTENT_PREFIX = os.environ.get("RAG_EMBEDDING_CONTENT_PREFIX", None)
@@ -2293,6 +2429,46 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Persistent cache of chunk embeddings keyed by (engine, model, prefix, chunk hash)
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_DIR = CACHE_DIR / "embeddings"
+RAG_EMBEDDING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_ENTRIES", "200000")
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES = 200000
+
+# When set, embeddings are cached in Redis (shared between nodes) instead of SQLite
+RAG_EMBEDDING_CACHE_REDIS_URL = os.environ.get("RAG_EMBEDDING_CACHE_REDIS_URL", "")
+
+try:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_REDIS_TTL", str(60 * 60 * 24 * 30))
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = 60 * 60 * 24 * 30
+
+# In-process LRU cache of query embeddings (0 disables it). When
+# RAG_EMBEDDING_CACHE_REDIS_URL is set, entries are also shared through Redis.
+try:
+    RAG_QUERY_EMBEDDING_CACHE_SIZE = int(
+        os.environ.get("RAG_QUERY_EMBEDDING_CACHE_SIZE", "1000")
+    )
+except ValueError:
+    RAG_QUERY_EMBEDDING_CACHE_SIZE = 1000
+
+try:
+    RAG_QUERY_EMBEDDING_CACHE_TTL = int(
+        os.environ.get("RAG_QUERY_EMBEDDING_CACHE_TTL", "3600")
+    )
+except ValueError:
+    RAG_QUERY_EMBEDDING_CACHE_TTL = 3600
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
@@ -2709,6 +2885,28 @@ PLAYWRIGHT_TIMEOUT = PersistentConfig(
     int(os.environ.get("PLAYWRIGHT_TIMEOUT", "10000")),
 )
 
+# Long-lived browsers shared by all Playwright web loads
+try:
+    PLAYWRIGHT_MAX_BROWSERS = int(os.environ.get("PLAYWRIGHT_MAX_BROWSERS", "1"))
+except ValueError:
+    PLAYWRIGHT_MAX_BROWSERS = 1
+
+try:
+    PLAYWRIGHT_MAX_PAGES_PER_BROWSER = int(
+        os.environ.get("PLAYWRIGHT_MAX_PAGES_PER_BROWSER", "4")
+    )
+except ValueError:
+    PLAYWRIGHT_MAX_PAGES_PER_BROWSER = 4
+
+# Resource types aborted while rendering, text extraction does not need them
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = [
+    resource_type.strip()
+    for resource_type in os.environ.get(
+        "PLAYWRIGHT_BLOCKED_RESOURCE_TYPES", "image,font,media"
+    ).split(",")
+    if resource_type.strip()
+]
+
 FIRECRAWL_API_KEY = PersistentConfig(
     "FIRECRAWL_API_KEY",
     "rag.web.loader.firecrawl_api_key",
@@ -103,6 +103,9 @@ class ERROR_MESSAGES(str, Enum):
         "Duplicate content detected. Please provide unique content to proceed."
     )
     FILE_NOT_PROCESSED = "Extracted content is not available for this file. Please ensure that the file is processed before proceeding."
+    NOTE_VERSION_CONFLICT = (
+        "This note was changed by someone else. Reload it and apply your changes again."
+    )
 
 
 class TASKS(str, Enum):
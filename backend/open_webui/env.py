@@ -342,6 +342,18 @@ else:
     except Exception:
         DATABASE_POOL_RECYCLE = 3600
 
+# Threads for database calls made from async code, defaults to the number of
+# connections the pool can hand out
+DATABASE_THREAD_POOL_SIZE = os.environ.get("DATABASE_THREAD_POOL_SIZE", "")
+
+try:
+    DATABASE_THREAD_POOL_SIZE = int(DATABASE_THREAD_POOL_SIZE)
+except Exception:
+    if isinstance(DATABASE_POOL_SIZE, int) and DATABASE_POOL_SIZE > 0:
+        DATABASE_THREAD_POOL_SIZE = DATABASE_POOL_SIZE + DATABASE_POOL_MAX_OVERFLOW
+    else:
+        DATABASE_THREAD_POOL_SIZE = 10
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -368,6 +380,39 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Seconds the group ids and merged permissions of a user are reused across
+# requests, 0 disables the cache. Group and config updates invalidate it.
+try:
+    PERMISSION_CACHE_TTL = float(os.environ.get("PERMISSION_CACHE_TTL", "60"))
+except ValueError:
+    PERMISSION_CACHE_TTL = 60.0
+
+try:
+    PERMISSION_CACHE_SIZE = int(os.environ.get("PERMISSION_CACHE_SIZE", "10000"))
+except ValueError:
+    PERMISSION_CACHE_SIZE = 10000
+
+# Seconds authenticated users are reused across requests by id and API key,
+# 0 disables the cache. User updates invalidate it.
+try:
+    USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "30"))
+except ValueError:
+    USER_CACHE_TTL = 30.0
+
+try:
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "10000"))
+except ValueError:
+    USER_CACHE_SIZE = 10000
+
+# Seconds between bulk writes of the users' last active timestamps, which are
+# buffered in memory (and aggregated in Redis across nodes) in between
+try:
+    LAST_ACTIVE_FLUSH_INTERVAL = float(
+        os.environ.get("LAST_ACTIVE_FLUSH_INTERVAL", "15")
+    )
+except ValueError:
+    LAST_ACTIVE_FLUSH_INTERVAL = 15.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -478,6 +523,41 @@ WEBSOCKET_SENTINEL_HOSTS = os.environ.get("WEBSOCKET_SENTINEL_HOSTS", "")
 
 WEBSOCKET_SENTINEL_PORT = os.environ.get("WEBSOCKET_SENTINEL_PORT", "26379")
 
+# Seconds a node may serve session/user pool entries from its local cache,
+# writes from other nodes invalidate them earlier through pub/sub
+try:
+    WEBSOCKET_POOL_CACHE_TTL = float(os.environ.get("WEBSOCKET_POOL_CACHE_TTL", "5"))
+except ValueError:
+    WEBSOCKET_POOL_CACHE_TTL = 5.0
+
+# Compact the stored Yjs updates of a document into a single snapshot once
+# there are more than this many of them, or they take more than this many bytes
+try:
+    YDOC_COMPACTION_MAX_UPDATES = int(
+        os.environ.get("YDOC_COMPACTION_MAX_UPDATES", "500")
+    )
+except ValueError:
+    YDOC_COMPACTION_MAX_UPDATES = 500
+
+try:
+    YDOC_COMPACTION_MAX_BYTES = int(
+        os.environ.get("YDOC_COMPACTION_MAX_BYTES", str(1024 * 1024))
+    )
+except ValueError:
+    YDOC_COMPACTION_MAX_BYTES = 1024 * 1024
+
+# Collaborative notes are saved this many seconds after the last edit, and at
+# most this many seconds after the first unsaved one while edits keep coming
+try:
+    YDOC_SAVE_DELAY = float(os.environ.get("YDOC_SAVE_DELAY", "1"))
+except ValueError:
+    YDOC_SAVE_DELAY = 1.0
+
+try:
+    YDOC_SAVE_MAX_DELAY = float(os.environ.get("YDOC_SAVE_MAX_DELAY", "10"))
+except ValueError:
+    YDOC_SAVE_MAX_DELAY = 10.0
+
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
 if AIOHTTP_CLIENT_TIMEOUT == "":
@@ -641,6 +721,20 @@ OTEL_OTLP_SPAN_EXPORTER = os.environ.get(
     "OTEL_OTLP_SPAN_EXPORTER", "grpc"
 ).lower()  # grpc or http
 
+# Seconds between event loop lag probes, 0 disables the monitor
+try:
+    EVENT_LOOP_LAG_INTERVAL = float(os.environ.get("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+except ValueError:
+    EVENT_LOOP_LAG_INTERVAL = 0.5
+
+# Log a warning when the event loop is blocked for longer than this (seconds)
+try:
+    EVENT_LOOP_LAG_WARN_THRESHOLD = float(
+        os.environ.get("EVENT_LOOP_LAG_WARN_THRESHOLD", "0.2")
+    )
+except ValueError:
+    EVENT_LOOP_LAG_WARN_THRESHOLD = 0.2
+
 
 ####################################
 # TOOLS/FUNCTIONS PIP OPTIONS
@@ -1,7 +1,11 @@
+import asyncio
+import contextvars
+import functools
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from open_webui.internal.wrappers import register_connection
 from open_webui.env import (
@@ -13,6 +17,7 @@ from open_webui.env import (
     DATABASE_POOL_RECYCLE,
     DATABASE_POOL_SIZE,
     DATABASE_POOL_TIMEOUT,
+    DATABASE_THREAD_POOL_SIZE,
 )
 from peewee_migrate import Router
 from sqlalchemy import Dialect, create_engine, MetaData, types
@@ -120,3 +125,21 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+T = TypeVar("T")
+
+# Database calls from async code (socket handlers, event emitters) run on their
+# own bounded threads: they never block the event loop, and never wait behind
+# unrelated work in the default threadpool used by sync endpoints.
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, DATABASE_THREAD_POOL_SIZE), thread_name_prefix="db"
+)
+
+
+async def run_in_db_threadpool(func: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        DB_EXECUTOR, functools.partial(context.run, func, *args, **kwargs)
+    )
@@ -78,6 +78,12 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
+from open_webui.retrieval.web.browser_pool import close_browser_pools
+from open_webui.utils.loop_monitor import EVENT_LOOP_MONITOR
+from open_webui.utils.last_active import LAST_ACTIVE_TRACKER
+from open_webui.retrieval.vector.reconciler import periodic_vector_gc
+from open_webui.utils.ingestion import INGESTION_WORKER
 
 from open_webui.internal.db import Session, engine
 from open_webui.models.users import UserModel, Users
@@ -188,6 +194,8 @@ from open_webui.config import (
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
     RAG_EMBEDDING_ENGINE,
     RAG_EMBEDDING_BATCH_SIZE,
+    ENABLE_BACKGROUND_FILE_PROCESSING,
+    VECTOR_GC_INTERVAL,
     RAG_TOP_K,
     RAG_TOP_K_RERANKER,
     RAG_RELEVANCE_THRESHOLD,
@@ -402,6 +410,7 @@ from open_webui.env import (
     RESET_CONFIG_ON_START,
     ENABLE_VERSION_UPDATE_CHECK,
     ENABLE_OTEL,
+    EVENT_LOOP_LAG_INTERVAL,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
 )
@@ -419,13 +428,26 @@ from open_webui.utils.chat import (
 )
 from open_webui.utils.embeddings import generate_embeddings
 # from open_webui.utils.middleware import process_chat_payload, process_chat_response - Disabled for notes-only app
-from open_webui.utils.access_control import has_access
+from open_webui.utils.access_control import (
+    PERMISSIONS_REQUEST_CACHE,
+    get_permissions,
+    has_access,
+)
+from open_webui.utils.bootstrap import BOOTSTRAP_CACHE, get_bootstrap_cache_key
+from open_webui.utils.versions import (
+    VERSIONS,
+    get_etag,
+    get_not_modified_response,
+    is_not_modified,
+    set_etag_headers,
+)
 
 from open_webui.utils.auth import (
     get_license_data,
     get_http_authorization_cred,
     decode_token,
     get_admin_user,
+    get_cached_user_by_id,
     get_verified_user,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
@@ -573,6 +595,20 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    if EVENT_LOOP_LAG_INTERVAL > 0:
+        asyncio.create_task(EVENT_LOOP_MONITOR.start())
+
+    if LAST_ACTIVE_TRACKER.interval > 0:
+        app.state.last_active_task = asyncio.create_task(LAST_ACTIVE_TRACKER.start())
+
+    if VECTOR_GC_INTERVAL > 0:
+        asyncio.create_task(periodic_vector_gc(app))
+
+    if ENABLE_BACKGROUND_FILE_PROCESSING:
+        app.state.ingestion_worker_task = asyncio.create_task(
+            INGESTION_WORKER.start(app)
+        )
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -599,6 +635,17 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "ingestion_worker_task"):
+        app.state.ingestion_worker_task.cancel()
+        INGESTION_WORKER.stop()
+
+    if hasattr(app.state, "last_active_task"):
+        app.state.last_active_task.cancel()
+        LAST_ACTIVE_TRACKER.flush(force=True)
+
+    EMBEDDING_CLIENT.close()
+    close_browser_pools()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -1127,6 +1174,7 @@ app.state.config.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH = (
 ########################################
 
 app.state.MODELS = {}
+app.state.MODELS_VERSION = None
 
 
 class RedirectMiddleware(BaseHTTPMiddleware):
@@ -1165,6 +1213,15 @@ async def commit_session_after_request(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def reset_permissions_request_cache(request: Request, call_next):
+    token = PERMISSIONS_REQUEST_CACHE.set({})
+    try:
+        return await call_next(request)
+    finally:
+        PERMISSIONS_REQUEST_CACHE.reset(token)
+
+
 @app.middleware("http")
 async def check_url(request: Request, call_next):
     start_time = int(time.time())
@@ -1248,10 +1305,7 @@ if audit_level != AuditLevel.NONE:
 ##################################
 
 
-@app.get("/api/models")
-async def get_models(
-    request: Request, refresh: bool = False, user=Depends(get_verified_user)
-):
+async def get_user_models(request: Request, user, refresh: bool = False) -> list:
     def get_filtered_models(models, user):
         filtered_models = []
         for model in models:
@@ -1310,6 +1364,45 @@ async def get_models(
     log.debug(
         f"/api/models returned filtered models accessible to the user: {json.dumps([model['id'] for model in models])}"
     )
+    return models
+
+
+@app.get("/api/models")
+async def get_models(
+    request: Request,
+    response: Response,
+    refresh: bool = False,
+    user=Depends(get_verified_user),
+):
+    def get_models_etag():
+        return get_etag(
+            "models",
+            user.id,
+            user.role,
+            app.state.MODELS_VERSION,
+            app.state.config.get_version(),
+            *VERSIONS.get("groups"),
+        )
+
+    # With cached base models the list only changes with the config, so a
+    # conditional request can be answered without rebuilding it
+    if (
+        not refresh
+        and app.state.config.ENABLE_BASE_MODELS_CACHE
+        and app.state.MODELS
+        and app.state.BASE_MODELS
+    ):
+        etag = get_models_etag()
+        if is_not_modified(request, etag):
+            return get_not_modified_response(etag)
+
+    models = await get_user_models(request, user, refresh=refresh)
+
+    etag = get_models_etag()
+    if is_not_modified(request, etag):
+        return get_not_modified_response(etag)
+    set_etag_headers(response, etag)
+
     return {"data": models}
 
 
@@ -1539,7 +1632,7 @@ async def list_tasks_by_chat_id_endpoint(
 
 
 @app.get("/api/config")
-async def get_app_config(request: Request):
+async def get_app_config(request: Request, response: Response):
     user = None
     if "token" in request.cookies:
         token = request.cookies.get("token")
@@ -1552,8 +1645,24 @@ async def get_app_config(request: Request):
                 detail="Invalid token",
             )
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = get_cached_user_by_id(data["id"])
+
+    etag = get_etag(
+        "config",
+        user.id if user else None,
+        user.role if user else None,
+        app.state.config.get_version(),
+        app.state.USER_COUNT,
+        *VERSIONS.get("users"),
+    )
+    if is_not_modified(request, etag):
+        return get_not_modified_response(etag)
+    set_etag_headers(response, etag)
+
+    return get_app_config_data(user)
 
+
+def get_app_config_data(user) -> dict:
     user_count = Users.get_num_users()
     onboarding = False
 
@@ -1671,6 +1780,42 @@ async def get_app_config(request: Request):
     }
 
 
+@app.get("/api/bootstrap")
+async def get_bootstrap(
+    request: Request, response: Response, user=Depends(get_verified_user)
+):
+    """
+    Everything the frontend needs on page load in one response: the session
+    user, permissions, settings, config and models. It replaces separate calls
+    to /api/v1/auths/, /api/v1/users/permissions, /api/v1/users/user/settings,
+    /api/config and /api/models, which each re-authenticated the user and
+    resolved groups again.
+    """
+    key = get_bootstrap_cache_key(
+        user,
+        app.state.config.get_version(),
+        app.state.MODELS_VERSION,
+        *VERSIONS.get("groups"),
+    )
+    data = BOOTSTRAP_CACHE.get(key)
+
+    if data is None:
+        data = {
+            "permissions": get_permissions(user.id, app.state.config.USER_PERMISSIONS),
+            "settings": user.settings.model_dump() if user.settings else None,
+            "config": get_app_config_data(user),
+            "models": await get_user_models(request, user),
+        }
+        BOOTSTRAP_CACHE.set(key, data)
+
+    return {
+        "user": auths.get_session_user_data(
+            request, response, user, data["permissions"]
+        ),
+        **data,
+    }
+
+
 class UrlForm(BaseModel):
     url: str
 
@@ -1732,7 +1877,10 @@ async def get_current_usage(user=Depends(get_verified_user)):
     This is an experimental endpoint and subject to change.
     """
     try:
-        return {"model_ids": get_models_in_use(), "user_ids": get_active_user_ids()}
+        return {
+            "model_ids": await get_models_in_use(),
+            "user_ids": await get_active_user_ids(),
+        }
     except Exception as e:
         log.error(f"Error getting usage statistics: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
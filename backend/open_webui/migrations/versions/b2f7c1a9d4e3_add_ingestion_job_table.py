@@ -0,0 +1,45 @@
+"""Add ingestion job table
+
+Revision ID: b2f7c1a9d4e3
+Revises: 20250802223804
+Create Date: 2025-08-20 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b2f7c1a9d4e3"
+down_revision = "20250802223804"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingestion_job",
+        sa.Column("id", sa.Text(), nullable=False, primary_key=True, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("file_id", sa.Text(), nullable=True),
+        sa.Column("engine", sa.Text(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("status", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("progress", sa.JSON(), nullable=True),
+        sa.Column("task_id", sa.Text(), nullable=True),
+        sa.Column("instance_id", sa.Text(), nullable=True),
+        sa.Column("run_after", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        "idx_ingestion_job_status_run_after", "ingestion_job", ["status", "run_after"]
+    )
+    op.create_index("idx_ingestion_job_file_id", "ingestion_job", ["file_id"])
+
+
+def downgrade():
+    op.drop_index("idx_ingestion_job_file_id", "ingestion_job")
+    op.drop_index("idx_ingestion_job_status_run_after", "ingestion_job")
+    op.drop_table("ingestion_job")
@@ -0,0 +1,26 @@
+"""Add note version
+
+Revision ID: e4a8d2c6b1f0
+Revises: b2f7c1a9d4e3
+Create Date: 2025-08-22 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e4a8d2c6b1f0"
+down_revision = "b2f7c1a9d4e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "note",
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("note", "version")
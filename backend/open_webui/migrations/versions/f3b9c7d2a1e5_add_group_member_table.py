@@ -0,0 +1,57 @@
+"""Add group member table
+
+Revision ID: f3b9c7d2a1e5
+Revises: e4a8d2c6b1f0
+Create Date: 2025-08-25 10:00:00.000000
+
+"""
+
+import json
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column, select
+
+revision = "f3b9c7d2a1e5"
+down_revision = "e4a8d2c6b1f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    group_member_table = op.create_table(
+        "group_member",
+        sa.Column("group_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("group_id", "user_id", name="pk_group_id_user_id"),
+    )
+    op.create_index("idx_group_member_user_id", "group_member", ["user_id"])
+
+    # Backfill from the user_ids JSON column of the group table
+    group_table = table(
+        "group",
+        column("id", sa.Text()),
+        column("user_ids", sa.JSON()),
+    )
+
+    now = int(time.time())
+    rows = []
+    for group in op.get_bind().execute(
+        select(group_table.c.id, group_table.c.user_ids)
+    ):
+        user_ids = group.user_ids
+        if isinstance(user_ids, str):
+            user_ids = json.loads(user_ids)
+
+        for user_id in dict.fromkeys(user_ids or []):
+            rows.append({"group_id": group.id, "user_id": user_id, "created_at": now})
+
+    if rows:
+        op.bulk_insert(group_member_table, rows)
+
+
+def downgrade():
+    op.drop_index("idx_group_member_user_id", "group_member")
+    op.drop_table("group_member")
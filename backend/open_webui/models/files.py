@@ -147,6 +147,10 @@ class FilesTable:
         with get_db() as db:
             return [FileModel.model_validate(file) for file in db.query(File).all()]
 
+    def get_file_ids(self) -> list[str]:
+        with get_db() as db:
+            return [row[0] for row in db.query(File.id).all()]
+
     def get_files_by_ids(self, ids: list[str]) -> list[FileModel]:
         with get_db() as db:
             return [
@@ -211,6 +215,38 @@ class FilesTable:
             except Exception:
                 return None
 
+    def update_files_by_ids(self, updates: dict[str, dict]) -> bool:
+        """
+        Apply several file updates in a single transaction. Each value may set
+        "hash" and merge into "data" and "meta".
+        """
+        if not updates:
+            return True
+
+        with get_db() as db:
+            try:
+                files = db.query(File).filter(File.id.in_(list(updates.keys()))).all()
+                for file in files:
+                    update = updates[file.id]
+                    if "hash" in update:
+                        file.hash = update["hash"]
+                    if "data" in update:
+                        file.data = {
+                            **(file.data if file.data else {}),
+                            **update["data"],
+                        }
+                    if "meta" in update:
+                        file.meta = {
+                            **(file.meta if file.meta else {}),
+                            **update["meta"],
+                        }
+                db.commit()
+                return True
+            except Exception as e:
+                log.exception(f"Error updating files: {e}")
+                db.rollback()
+                return False
+
     def delete_file_by_id(self, id: str) -> bool:
         with get_db() as db:
             try:
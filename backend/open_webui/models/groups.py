@@ -6,12 +6,22 @@ import uuid
 
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.cache import PERMISSIONS_CACHE
+from open_webui.utils.versions import VERSIONS
 
 from open_webui.models.files import FileMetadataResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON, func
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    PrimaryKeyConstraint,
+    Text,
+    JSON,
+)
+from sqlalchemy.orm.attributes import flag_modified
 
 
 log = logging.getLogger(__name__)
@@ -41,6 +51,24 @@ class Group(Base):
     updated_at = Column(BigInteger)
 
 
+class GroupMember(Base):
+    """
+    Membership rows kept in sync with Group.user_ids, so finding the groups of
+    a user is an indexed lookup instead of a scan of every group's JSON.
+    """
+
+    __tablename__ = "group_member"
+
+    group_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("group_id", "user_id", name="pk_group_id_user_id"),
+        Index("idx_group_member_user_id", "user_id"),
+    )
+
+
 class GroupModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -91,7 +119,22 @@ class GroupUpdateForm(GroupForm, UserIdsForm):
     pass
 
 
+def bump_group_versions() -> None:
+    # Memberships and group permissions feed every user's resolved permissions
+    VERSIONS.bump("groups")
+    PERMISSIONS_CACHE.invalidate()
+
+
 class GroupTable:
+    def _set_group_members(self, db, id: str, user_ids: Optional[list[str]]):
+        db.query(GroupMember).filter_by(group_id=id).delete()
+        db.add_all(
+            [
+                GroupMember(group_id=id, user_id=user_id, created_at=int(time.time()))
+                for user_id in dict.fromkeys(user_ids or [])
+            ]
+        )
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -109,8 +152,10 @@ class GroupTable:
             try:
                 result = Group(**group.model_dump())
                 db.add(result)
+                self._set_group_members(db, group.id, group.user_ids)
                 db.commit()
                 db.refresh(result)
+                bump_group_versions()
                 if result:
                     return GroupModel.model_validate(result)
                 else:
@@ -131,16 +176,49 @@ class GroupTable:
             return [
                 GroupModel.model_validate(group)
                 for group in db.query(Group)
-                .filter(
-                    func.json_array_length(Group.user_ids) > 0
-                )  # Ensure array exists
-                .filter(
-                    Group.user_ids.cast(String).like(f'%"{user_id}"%')
-                )  # String-based check
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
                 .order_by(Group.updated_at.desc())
                 .all()
             ]
 
+    def get_group_ids_by_member_id(self, user_id: str) -> list[str]:
+        with get_db() as db:
+            return [
+                group_id
+                for (group_id,) in db.query(GroupMember.group_id)
+                .filter(GroupMember.user_id == user_id)
+                .all()
+            ]
+
+    def get_group_ids_by_member_ids(self, user_ids: list[str]) -> dict[str, list[str]]:
+        group_ids = {user_id: [] for user_id in user_ids}
+        if not user_ids:
+            return group_ids
+
+        with get_db() as db:
+            for group_id, user_id in (
+                db.query(GroupMember.group_id, GroupMember.user_id)
+                .filter(GroupMember.user_id.in_(user_ids))
+                .all()
+            ):
+                group_ids[user_id].append(group_id)
+        return group_ids
+
+    def get_user_ids_by_group_ids(self, group_ids: list[str]) -> dict[str, list[str]]:
+        user_ids = {group_id: [] for group_id in group_ids}
+        if not group_ids:
+            return user_ids
+
+        with get_db() as db:
+            for group_id, user_id in (
+                db.query(GroupMember.group_id, GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .all()
+            ):
+                user_ids[group_id].append(user_id)
+        return user_ids
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -167,7 +245,10 @@ class GroupTable:
                         "updated_at": int(time.time()),
                     }
                 )
+                if form_data.user_ids is not None:
+                    self._set_group_members(db, id, form_data.user_ids)
                 db.commit()
+                bump_group_versions()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -177,7 +258,9 @@ class GroupTable:
         try:
             with get_db() as db:
                 db.query(Group).filter_by(id=id).delete()
+                db.query(GroupMember).filter_by(group_id=id).delete()
                 db.commit()
+                bump_group_versions()
                 return True
         except Exception:
             return False
@@ -186,7 +269,9 @@ class GroupTable:
         with get_db() as db:
             try:
                 db.query(Group).delete()
+                db.query(GroupMember).delete()
                 db.commit()
+                bump_group_versions()
 
                 return True
             except Exception:
@@ -205,8 +290,10 @@ class GroupTable:
                             "updated_at": int(time.time()),
                         }
                     )
-                    db.commit()
+                db.query(GroupMember).filter_by(user_id=user_id).delete()
+                db.commit()
 
+                bump_group_versions()
                 return True
             except Exception:
                 return False
@@ -241,6 +328,9 @@ class GroupTable:
                     except Exception as e:
                         log.exception(e)
                         continue
+
+            if new_groups:
+                bump_group_versions()
             return new_groups
 
     def sync_groups_by_group_names(self, user_id: str, group_names: list[str]) -> bool:
@@ -261,6 +351,9 @@ class GroupTable:
                                 "updated_at": int(time.time()),
                             }
                         )
+                        db.query(GroupMember).filter_by(
+                            group_id=group.id, user_id=user_id
+                        ).delete()
 
                 # Add user to new groups
                 for group in groups:
@@ -272,8 +365,16 @@ class GroupTable:
                                 "updated_at": int(time.time()),
                             }
                         )
+                        db.add(
+                            GroupMember(
+                                group_id=group.id,
+                                user_id=user_id,
+                                created_at=int(time.time()),
+                            )
+                        )
 
                 db.commit()
+                bump_group_versions()
                 return True
             except Exception as e:
                 log.exception(e)
@@ -295,9 +396,13 @@ class GroupTable:
                     if user_id not in group.user_ids:
                         group.user_ids.append(user_id)
 
+                # The list was changed in place
+                flag_modified(group, "user_ids")
+                self._set_group_members(db, id, group.user_ids)
                 group.updated_at = int(time.time())
                 db.commit()
                 db.refresh(group)
+                bump_group_versions()
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -319,9 +424,13 @@ class GroupTable:
                     if user_id in group.user_ids:
                         group.user_ids.remove(user_id)
 
+                # The list was changed in place
+                flag_modified(group, "user_ids")
+                self._set_group_members(db, id, group.user_ids)
                 group.updated_at = int(time.time())
                 db.commit()
                 db.refresh(group)
+                bump_group_versions()
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -0,0 +1,286 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from open_webui.internal.db import Base, get_db
+from open_webui.env import SRC_LOG_LEVELS
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, Integer, Text, JSON
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+####################
+# Ingestion Job DB Schema
+####################
+
+
+class IngestionJobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_job"
+
+    id = Column(Text, primary_key=True)
+    user_id = Column(Text)
+    file_id = Column(Text)
+
+    # Concurrency bucket, e.g. the content extraction engine or "audio"
+    engine = Column(Text)
+    # Arguments of the processing step (collection_name, content, transcribe, ...)
+    data = Column(JSON, nullable=True)
+
+    status = Column(Text)
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    progress = Column(JSON, nullable=True)
+
+    # Id of the asyncio task running the job, usable with /api/tasks/stop/{task_id}
+    task_id = Column(Text, nullable=True)
+    # Node that claimed the job
+    instance_id = Column(Text, nullable=True)
+
+    run_after = Column(BigInteger)
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        Index("idx_ingestion_job_status_run_after", "status", "run_after"),
+        Index("idx_ingestion_job_file_id", "file_id"),
+    )
+
+
+class IngestionJobModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    file_id: str
+
+    engine: str
+    data: Optional[dict] = None
+
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+    progress: Optional[dict] = None
+
+    task_id: Optional[str] = None
+    instance_id: Optional[str] = None
+
+    run_after: int
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
+####################
+# Forms
+####################
+
+
+class IngestionJobForm(BaseModel):
+    file_id: str
+    engine: str
+    data: dict = {}
+
+
+class IngestionJobsTable:
+    def insert_new_job(
+        self, user_id: str, form_data: IngestionJobForm
+    ) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            now = int(time.time())
+            job = IngestionJobModel(
+                **{
+                    **form_data.model_dump(),
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "status": IngestionJobStatus.PENDING,
+                    "attempts": 0,
+                    "run_after": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+            try:
+                result = IngestionJob(**job.model_dump())
+                db.add(result)
+                db.commit()
+                db.refresh(result)
+                if result:
+                    return IngestionJobModel.model_validate(result)
+                else:
+                    return None
+            except Exception as e:
+                log.exception(f"Error inserting a new ingestion job: {e}")
+                return None
+
+    def get_job_by_id(self, id: str) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            try:
+                job = db.get(IngestionJob, id)
+                return IngestionJobModel.model_validate(job)
+            except Exception:
+                return None
+
+    def get_jobs_by_user_id(
+        self, user_id: str, status: Optional[str] = None
+    ) -> list[IngestionJobModel]:
+        with get_db() as db:
+            query = db.query(IngestionJob).filter_by(user_id=user_id)
+            if status:
+                query = query.filter_by(status=status)
+            return [
+                IngestionJobModel.model_validate(job)
+                for job in query.order_by(IngestionJob.created_at.desc()).all()
+            ]
+
+    def get_jobs_by_file_id(self, file_id: str) -> list[IngestionJobModel]:
+        with get_db() as db:
+            return [
+                IngestionJobModel.model_validate(job)
+                for job in db.query(IngestionJob)
+                .filter_by(file_id=file_id)
+                .order_by(IngestionJob.created_at.desc())
+                .all()
+            ]
+
+    def get_runnable_jobs(self, limit: int) -> list[IngestionJobModel]:
+        with get_db() as db:
+            return [
+                IngestionJobModel.model_validate(job)
+                for job in db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status == IngestionJobStatus.PENDING,
+                    IngestionJob.run_after <= int(time.time()),
+                )
+                .order_by(IngestionJob.run_after.asc())
+                .limit(limit)
+                .all()
+            ]
+
+    def claim_job_by_id(self, id: str, instance_id: str) -> bool:
+        """
+        Atomically move a pending job to running. Only one node can win the
+        claim, which makes the table safe to share as a queue between nodes.
+        """
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter_by(id=id, status=IngestionJobStatus.PENDING)
+                .update(
+                    {
+                        "status": IngestionJobStatus.RUNNING,
+                        "instance_id": instance_id,
+                        "attempts": IngestionJob.attempts + 1,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count == 1
+
+    def update_job_by_id(self, id: str, updated: dict) -> Optional[IngestionJobModel]:
+        with get_db() as db:
+            try:
+                db.query(IngestionJob).filter_by(id=id).update(
+                    {**updated, "updated_at": int(time.time())}
+                )
+                db.commit()
+                return IngestionJobModel.model_validate(db.get(IngestionJob, id))
+            except Exception as e:
+                log.exception(f"Error updating ingestion job {id}: {e}")
+                return None
+
+    def update_running_job_by_id(
+        self, id: str, instance_id: str, updated: dict
+    ) -> Optional[IngestionJobModel]:
+        """
+        Update a job only if it is still running on the given node, i.e. it was
+        not cancelled or requeued meanwhile. Returns None otherwise.
+        """
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter_by(
+                    id=id, status=IngestionJobStatus.RUNNING, instance_id=instance_id
+                )
+                .update(
+                    {**updated, "updated_at": int(time.time())},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if count != 1:
+                return None
+            return IngestionJobModel.model_validate(db.get(IngestionJob, id))
+
+    def cancel_job_by_id(self, id: str) -> bool:
+        """Cancel a job that has not been picked up by a worker yet."""
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter_by(id=id, status=IngestionJobStatus.PENDING)
+                .update(
+                    {
+                        "status": IngestionJobStatus.CANCELLED,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count == 1
+
+    def requeue_running_jobs_by_instance_id(self, instance_id: str) -> int:
+        """Put back jobs a node was running when it stopped."""
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter_by(instance_id=instance_id, status=IngestionJobStatus.RUNNING)
+                .update(
+                    {
+                        "status": IngestionJobStatus.PENDING,
+                        "task_id": None,
+                        "instance_id": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count
+
+    def requeue_stale_running_jobs(self, older_than: int) -> int:
+        """Put back running jobs whose node stopped reporting progress."""
+        with get_db() as db:
+            count = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status == IngestionJobStatus.RUNNING,
+                    IngestionJob.updated_at < older_than,
+                )
+                .update(
+                    {
+                        "status": IngestionJobStatus.PENDING,
+                        "task_id": None,
+                        "instance_id": None,
+                        "updated_at": int(time.time()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return count
+
+
+IngestionJobs = IngestionJobsTable()
@@ -10,6 +10,7 @@ from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
 from open_webui.utils.access_control import get_permissions
+from open_webui.utils.versions import VERSIONS
 
 
 log = logging.getLogger(__name__)
@@ -82,6 +83,7 @@ class NoteFolderTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                VERSIONS.bump(f"note_folders:{user_id}")
                 if result:
                     return NoteFolderModel.model_validate(result)
                 else:
@@ -184,6 +186,7 @@ class NoteFolderTable:
                 folder.updated_at = int(time.time())
 
                 db.commit()
+                VERSIONS.bump(f"note_folders:{user_id}")
 
                 return NoteFolderModel.model_validate(folder)
         except Exception as e:
@@ -225,6 +228,7 @@ class NoteFolderTable:
                 folder.updated_at = int(time.time())
 
                 db.commit()
+                VERSIONS.bump(f"note_folders:{user_id}")
 
                 return NoteFolderModel.model_validate(folder)
         except Exception as e:
@@ -245,6 +249,7 @@ class NoteFolderTable:
                 folder.updated_at = int(time.time())
 
                 db.commit()
+                VERSIONS.bump(f"note_folders:{user_id}")
 
                 return NoteFolderModel.model_validate(folder)
         except Exception as e:
@@ -284,6 +289,7 @@ class NoteFolderTable:
                 delete_children(folder)
                 db.delete(folder)
                 db.commit()
+                VERSIONS.bump(f"note_folders:{user_id}")
                 return True
         except Exception as e:
             log.error(f"delete_folder: {e}")
@@ -4,13 +4,14 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
-from open_webui.utils.access_control import has_access
-from open_webui.models.users import Users, UserResponse
+from open_webui.utils.access_control import get_user_group_ids, has_access
+from open_webui.models.users import User, Users, UserResponse
+from open_webui.utils.versions import VERSIONS
 
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import or_, func, select, and_, text, bindparam, cast
 from sqlalchemy.sql import exists
 
 ####################
@@ -30,6 +31,9 @@ class Note(Base):
 
     access_control = Column(JSON, nullable=True)
 
+    # Incremented on every write, used for compare-and-set patches
+    version = Column(BigInteger, default=0, nullable=False)
+
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
@@ -46,6 +50,8 @@ class NoteModel(BaseModel):
 
     access_control: Optional[dict] = None
 
+    version: int = 0
+
     created_at: int  # timestamp in epoch
     updated_at: int  # timestamp in epoch
 
@@ -69,10 +75,58 @@ class NoteUpdateForm(BaseModel):
     access_control: Optional[dict] = None
 
 
+class NotePatchForm(BaseModel):
+    # Version the patch was made against
+    version: int
+    title: Optional[str] = None
+    # JSON merge patches (RFC 7396): only changed keys, null removes a key
+    data: Optional[dict] = None
+    meta: Optional[dict] = None
+
+
 class NoteUserResponse(NoteModel):
     user: Optional[UserResponse] = None
 
 
+class NoteTitleIdResponse(BaseModel):
+    id: str
+    title: str
+    updated_at: int
+    created_at: int
+
+
+class NoteVersionConflict(Exception):
+    def __init__(self, version: int):
+        super().__init__(f"Note version conflict, current version is {version}")
+        self.version = version
+
+
+def apply_merge_patch(target: Optional[dict], patch: dict) -> dict:
+    result = dict(target or {})
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_merge_patch(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def bump_note_versions(user_id: str, *access_controls: Optional[dict]) -> None:
+    """
+    Bump the note list versions seen by the owner and, when the note is (or
+    was) writable by others, by everyone.
+    """
+    keys = [f"notes:{user_id}"]
+    for access_control in access_controls:
+        write = (access_control or {}).get("write", {})
+        if write.get("group_ids") or write.get("user_ids"):
+            keys.append("notes:shared")
+            break
+    VERSIONS.bump(*keys)
+
+
 class NoteTable:
     def insert_new_note(
         self,
@@ -94,6 +148,7 @@ class NoteTable:
 
             db.add(new_note)
             db.commit()
+            bump_note_versions(user_id, note.access_control)
             return note
 
     def get_notes(self) -> list[NoteModel]:
@@ -101,16 +156,144 @@ class NoteTable:
             notes = db.query(Note).order_by(Note.updated_at.desc()).all()
             return [NoteModel.model_validate(note) for note in notes]
 
+    def _filter_by_access(self, db, query, user_id: str, permission: str = "write"):
+        """
+        Restrict a note query to the notes a user owns or was granted the
+        permission on, directly or through one of their groups.
+        """
+        if permission not in ("read", "write"):
+            raise ValueError(f"Invalid permission: {permission}")
+
+        group_ids = get_user_group_ids(user_id)
+
+        conditions = [Note.user_id == user_id]
+        if permission == "read":
+            # Notes without access control are public
+            conditions.append(Note.access_control.is_(None))
+            conditions.append(cast(Note.access_control, String) == "null")
+
+        # Table of the ids granted the permission, as rows of grants.value
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            grants_sql = (
+                "json_each(note.access_control, '$.{permission}.{key}') AS grants"
+            )
+        elif dialect_name == "postgresql":
+            # Only arrays can be expanded, anything else grants nothing
+            grants_sql = (
+                "json_array_elements_text("
+                "    CASE WHEN json_typeof(note.access_control->'{permission}'->'{key}') = 'array'"
+                "    THEN note.access_control->'{permission}'->'{key}' END"
+                ") AS grants(value)"
+            )
+        else:
+            # No JSON support to rely on, check the grants of shared notes here
+            shared_note_ids = [
+                id
+                for id, access_control in db.query(Note.id, Note.access_control)
+                .filter(Note.user_id != user_id)
+                .all()
+                if has_access(user_id, permission, access_control, group_ids)
+            ]
+            conditions.append(Note.id.in_(shared_note_ids))
+            return query.filter(or_(*conditions))
+
+        user_ids_sql = (
+            "EXISTS ("
+            "    SELECT 1 "
+            f"    FROM {grants_sql.format(permission=permission, key='user_ids')} "
+            "    WHERE grants.value = :access_user_id"
+            ")"
+        )
+        group_ids_sql = (
+            "EXISTS ("
+            "    SELECT 1 "
+            f"    FROM {grants_sql.format(permission=permission, key='group_ids')} "
+            "    WHERE grants.value IN :access_group_ids"
+            ")"
+        )
+
+        conditions.append(text(user_ids_sql).bindparams(access_user_id=user_id))
+        if group_ids:
+            conditions.append(
+                text(group_ids_sql).bindparams(
+                    bindparam("access_group_ids", value=group_ids, expanding=True)
+                )
+            )
+        return query.filter(or_(*conditions))
+
     def get_notes_by_user_id(
-        self, user_id: str, permission: str = "write"
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
     ) -> list[NoteModel]:
-        notes = self.get_notes()
-        return [
-            note
-            for note in notes
-            if note.user_id == user_id
-            or has_access(user_id, permission, note.access_control)
-        ]
+        with get_db() as db:
+            query = self._filter_by_access(db, db.query(Note), user_id, permission)
+            query = query.order_by(Note.updated_at.desc())
+
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+
+            return [NoteModel.model_validate(note) for note in query.all()]
+
+    def get_notes_with_users_by_user_id(
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[NoteUserResponse]:
+        """Like get_notes_by_user_id, with the owners joined in the same query."""
+        with get_db() as db:
+            query = db.query(Note, User).outerjoin(User, User.id == Note.user_id)
+            query = self._filter_by_access(db, query, user_id, permission)
+            query = query.order_by(Note.updated_at.desc())
+
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+
+            return [
+                NoteUserResponse(
+                    **NoteModel.model_validate(note).model_dump(),
+                    user=(
+                        UserResponse.model_validate(user, from_attributes=True)
+                        if user
+                        else None
+                    ),
+                )
+                for note, user in query.all()
+            ]
+
+    def get_note_titles_by_user_id(
+        self,
+        user_id: str,
+        permission: str = "write",
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> list[NoteTitleIdResponse]:
+        """Ids and titles only, without loading the note contents."""
+        with get_db() as db:
+            query = db.query(Note.id, Note.title, Note.updated_at, Note.created_at)
+            query = self._filter_by_access(db, query, user_id, permission)
+            query = query.order_by(Note.updated_at.desc())
+
+            if skip:
+                query = query.offset(skip)
+            if limit:
+                query = query.limit(limit)
+
+            return [
+                NoteTitleIdResponse(
+                    id=id, title=title, updated_at=updated_at, created_at=created_at
+                )
+                for id, title, updated_at, created_at in query.all()
+            ]
 
     def get_note_by_id(self, id: str) -> Optional[NoteModel]:
         with get_db() as db:
@@ -125,6 +308,7 @@ class NoteTable:
             if not note:
                 return None
 
+            access_control = note.access_control
             form_data = form_data.model_dump(exclude_unset=True)
 
             if "title" in form_data:
@@ -137,15 +321,66 @@ class NoteTable:
             if "access_control" in form_data:
                 note.access_control = form_data["access_control"]
 
+            note.version = (note.version or 0) + 1
             note.updated_at = int(time.time_ns())
 
             db.commit()
+            bump_note_versions(note.user_id, access_control, note.access_control)
             return NoteModel.model_validate(note) if note else None
 
+    def patch_note_by_id(
+        self, id: str, form_data: NotePatchForm
+    ) -> Optional[NoteModel]:
+        """
+        Apply a partial update if the note is still at form_data.version,
+        raises NoteVersionConflict otherwise. The version check is repeated in
+        the UPDATE itself so concurrent patches cannot both win.
+        """
+        with get_db() as db:
+            note = db.query(Note).filter(Note.id == id).first()
+            if not note:
+                return None
+            if note.version != form_data.version:
+                raise NoteVersionConflict(note.version)
+
+            patch = form_data.model_dump(exclude_unset=True, exclude={"version"})
+            updated = {
+                "version": Note.version + 1,
+                "updated_at": int(time.time_ns()),
+            }
+            if "title" in patch and patch["title"] is not None:
+                updated["title"] = patch["title"]
+            if patch.get("data"):
+                updated["data"] = apply_merge_patch(note.data, patch["data"])
+            if patch.get("meta"):
+                updated["meta"] = apply_merge_patch(note.meta, patch["meta"])
+
+            count = (
+                db.query(Note)
+                .filter(Note.id == id, Note.version == form_data.version)
+                .update(updated, synchronize_session=False)
+            )
+            db.commit()
+
+            # The note loaded above is still in the session with its old
+            # values, reload it from the database
+            note = db.query(Note).populate_existing().filter(Note.id == id).first()
+            if count != 1:
+                raise NoteVersionConflict(note.version if note else 0)
+
+            note = NoteModel.model_validate(note)
+            bump_note_versions(note.user_id, note.access_control)
+            return note
+
     def delete_note_by_id(self, id: str):
         with get_db() as db:
+            note = db.query(Note).filter(Note.id == id).first()
+            note = NoteModel.model_validate(note) if note else None
+
             db.query(Note).filter(Note.id == id).delete()
             db.commit()
+            if note:
+                bump_note_versions(note.user_id, note.access_control)
             return True
 
 
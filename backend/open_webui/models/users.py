@@ -6,11 +6,13 @@ from open_webui.internal.db import Base, JSONField, get_db
 
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups
+from open_webui.utils.cache import USERS_CACHE
+from open_webui.utils.versions import VERSIONS
 
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text
-from sqlalchemy import or_
+from sqlalchemy import bindparam, or_, update
 from sqlalchemy.orm import relationship
 
 
@@ -119,6 +121,10 @@ class UserUpdateForm(BaseModel):
     password: Optional[str] = None
 
 
+def invalidate_cached_user(id: str) -> None:
+    USERS_CACHE.invalidate(f"id:{id}")
+
+
 class UsersTable:
     def insert_new_user(
         self,
@@ -147,6 +153,7 @@ class UsersTable:
             db.add(result)
             db.commit()
             db.refresh(result)
+            VERSIONS.bump("users")
             if result:
                 return user
             else:
@@ -292,6 +299,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                invalidate_cached_user(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -306,6 +314,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                invalidate_cached_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -325,6 +334,27 @@ class UsersTable:
         except Exception:
             return None
 
+    def update_users_last_active_by_ids(self, last_active: dict[str, int]) -> bool:
+        """Write many last active timestamps in a single executemany UPDATE."""
+        if not last_active:
+            return True
+
+        try:
+            with get_db() as db:
+                db.execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("last_active_at")),
+                    [
+                        {"user_id": id, "last_active_at": timestamp}
+                        for id, timestamp in last_active.items()
+                    ],
+                )
+                db.commit()
+                return True
+        except Exception:
+            return False
+
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
     ) -> Optional[UserModel]:
@@ -332,6 +362,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                invalidate_cached_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -343,6 +374,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                invalidate_cached_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -362,6 +394,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                invalidate_cached_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -380,7 +413,9 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    invalidate_cached_user(id)
 
+                VERSIONS.bump("users")
                 return True
             else:
                 return False
@@ -392,6 +427,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                invalidate_cached_user(id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -0,0 +1,254 @@
+import json
+import logging
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+from open_webui.config import BM25_INDEX_DIR
+from open_webui.retrieval.vector.main import SearchResult
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.versions import VERSIONS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class BM25Index:
+    """
+    Persistent, incrementally updated BM25 index with one SQLite FTS5 database
+    per vector collection, so term statistics stay scoped to the collection.
+
+    This is the local fallback behind VectorDBBase.keyword_search for backends
+    without native full-text search. It is kept in sync by the ingestion and
+    deletion paths; collections created before the index existed are
+    backfilled from the vector DB once, on first use.
+
+    The databases live on each node, so every write also bumps a shared
+    version counter for the collection ("bm25:{collection_name}", plus "bm25"
+    for resets). Each database records the versions it reflects, with the
+    counters' epoch since they start over after a restart or Redis flush, and
+    is rebuilt from the vector DB when searched if another node wrote since.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _get_db_path(self, collection_name: str) -> Path:
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", collection_name)
+        return self.path / f"{name}.db"
+
+    @contextmanager
+    def _connect(self, collection_name: str):
+        conn = sqlite3.connect(self._get_db_path(collection_name), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Chunks live in a regular table (indexed by id) and the FTS5 table
+            # only holds the inverted index over their text, kept in sync by triggers
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    rowid INTEGER PRIMARY KEY,
+                    id TEXT UNIQUE NOT NULL,
+                    text TEXT NOT NULL,
+                    metadata TEXT
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                    text, content='chunks', content_rowid='rowid', tokenize='unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+                    INSERT INTO chunks_fts (rowid, text) VALUES (new.rowid, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+                    INSERT INTO chunks_fts (chunks_fts, rowid, text)
+                    VALUES ('delete', old.rowid, old.text);
+                END;
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def has_index(self, collection_name: str) -> bool:
+        return self._get_db_path(collection_name).exists()
+
+    def _get_versions(self, collection_name: str) -> list:
+        return [VERSIONS.epoch, *VERSIONS.get("bm25", f"bm25:{collection_name}")]
+
+    def _get_local_versions(self, conn) -> Optional[list]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'versions'").fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def _set_local_versions(self, conn, versions: Optional[list]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('versions', ?)",
+            (json.dumps(versions) if versions else None,),
+        )
+
+    def _bump(self, collection_name: str, conn=None) -> None:
+        """
+        Publish a write to the collection. The local database written through
+        conn stays current only if no other node wrote since it was built. A
+        database created by the write is never current, the collection may
+        hold chunks it does not.
+        """
+        [version] = VERSIONS.bump(f"bm25:{collection_name}")
+        if conn is None:
+            return
+
+        epoch = VERSIONS.epoch
+        [reset_version] = VERSIONS.get("bm25")
+        self._set_local_versions(
+            conn,
+            (
+                [epoch, reset_version, version]
+                if self._get_local_versions(conn) == [epoch, reset_version, version - 1]
+                else None
+            ),
+        )
+
+    def is_current(self, collection_name: str) -> bool:
+        if not self.has_index(collection_name):
+            return False
+
+        with self._connect(collection_name) as conn:
+            local_versions = self._get_local_versions(conn)
+        return local_versions == self._get_versions(collection_name)
+
+    def add(
+        self,
+        collection_name: str,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[Any],
+    ) -> None:
+        with self._connect(collection_name) as conn:
+            self._insert(conn, ids, texts, metadatas)
+            self._bump(collection_name, conn)
+
+    def _insert(
+        self, conn, ids: list[str], texts: list[str], metadatas: list[Any]
+    ) -> None:
+        conn.executemany("DELETE FROM chunks WHERE id = ?", [(id,) for id in ids])
+        conn.executemany(
+            "INSERT INTO chunks (id, text, metadata) VALUES (?, ?, ?)",
+            [
+                (id, text, json.dumps(metadata or {}, default=str))
+                for id, text, metadata in zip(ids, texts, metadatas)
+            ],
+        )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ) -> None:
+        if not self.has_index(collection_name):
+            # Other nodes may have it
+            self._bump(collection_name)
+            return
+
+        with self._connect(collection_name) as conn:
+            self._bump(collection_name, conn)
+            if ids:
+                conn.executemany(
+                    "DELETE FROM chunks WHERE id = ?", [(id,) for id in ids]
+                )
+            elif filter:
+                clauses = " AND ".join(
+                    "json_extract(metadata, ?) = ?" for _ in filter.keys()
+                )
+                params = []
+                for key, value in filter.items():
+                    params.extend([f'$."{key}"', value])
+                conn.execute(f"DELETE FROM chunks WHERE {clauses}", params)
+            else:
+                conn.execute("DELETE FROM chunks")
+
+    def _remove(self, collection_name: str) -> None:
+        db_path = self._get_db_path(collection_name)
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            try:
+                path.unlink(missing_ok=True)
+            except Exception as e:
+                log.warning(f"Failed to remove BM25 index file {path}: {e}")
+
+    def drop(self, collection_name: str) -> None:
+        self._remove(collection_name)
+        self._bump(collection_name)
+
+    def reset(self) -> None:
+        for db_path in self.path.glob("*.db"):
+            self._remove(db_path.stem)
+        VERSIONS.bump("bm25")
+
+    def _backfill(self, collection_name: str) -> None:
+        # Lazy import: the vector DB factory is imported by most retrieval modules
+        from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+
+        log.info(f"Building BM25 index for collection {collection_name}")
+        # Read before the chunks, so a write made meanwhile triggers a rebuild
+        versions = self._get_versions(collection_name)
+        result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+        if result is None or not result.ids:
+            self._remove(collection_name)
+            return
+
+        with self._connect(collection_name) as conn:
+            conn.execute("DELETE FROM chunks")
+            self._insert(
+                conn,
+                ids=result.ids[0],
+                texts=result.documents[0],
+                metadatas=result.metadatas[0],
+            )
+            self._set_local_versions(conn, versions)
+
+    def search(
+        self, collection_name: str, query: str, k: int
+    ) -> Optional[SearchResult]:
+        if not self.is_current(collection_name):
+            self._backfill(collection_name)
+            if not self.has_index(collection_name):
+                return None
+
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return SearchResult(
+                ids=[[]], documents=[[]], metadatas=[[]], distances=[[]]
+            )
+
+        match = " OR ".join(f'"{token}"' for token in tokens)
+        with self._connect(collection_name) as conn:
+            rows = conn.execute(
+                "SELECT chunks.id, chunks.text, chunks.metadata, bm25(chunks_fts) AS score "
+                "FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid "
+                "WHERE chunks_fts MATCH ? ORDER BY score LIMIT ?",
+                (match, k),
+            ).fetchall()
+
+        # FTS5 reports bm25() as a negative value (lower is better)
+        return SearchResult(
+            ids=[[row[0] for row in rows]],
+            documents=[[row[1] for row in rows]],
+            metadatas=[[json.loads(row[2]) if row[2] else {} for row in rows]],
+            distances=[[-row[3] for row in rows]],
+        )
+
+
+BM25_INDEX = BM25Index(BM25_INDEX_DIR)
@@ -0,0 +1,344 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+from typing import Callable, Optional
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+    RAG_EMBEDDING_CACHE_REDIS_URL,
+    RAG_EMBEDDING_CACHE_REDIS_TTL,
+    RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_QUERY_EMBEDDING_CACHE_SIZE,
+    RAG_QUERY_EMBEDDING_CACHE_TTL,
+)
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.cache import TTLCache
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def encode_vector(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+def get_embedding_cache_key(
+    engine: str, model: str, prefix: Optional[str], text: str
+) -> str:
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    # The prefix field name decides whether the prefix is sent separately or
+    # prepended to the text, which changes the resulting vector
+    config = f"{engine}|{model}|{RAG_EMBEDDING_PREFIX_FIELD_NAME}|{prefix or ''}"
+    return hashlib.sha256(f"{config}|{text_hash}".encode()).hexdigest()
+
+
+class EmbeddingCache(ABC):
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return the cached vectors for the keys that are present."""
+        pass
+
+    @abstractmethod
+    def set_many(self, items: dict[str, list[float]]) -> None:
+        """Store vectors, evicting the least recently used entries if needed."""
+        pass
+
+    def embed(
+        self,
+        texts: list[str],
+        embed_function: Callable[[list[str]], Optional[list[list[float]]]],
+        engine: str,
+        model: str,
+        prefix: Optional[str] = None,
+    ) -> Optional[list[list[float]]]:
+        keys = [get_embedding_cache_key(engine, model, prefix, text) for text in texts]
+
+        try:
+            cached = self.get_many(list(set(keys)))
+        except Exception as e:
+            log.warning(f"Embedding cache lookup failed: {e}")
+            cached = {}
+
+        # Embed each missing text once, even if it appears several times
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        log.debug(
+            f"embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+        )
+
+        if missing:
+            embeddings = embed_function(list(missing.values()))
+            if embeddings is None:
+                return None
+
+            computed = dict(zip(missing.keys(), embeddings))
+            try:
+                self.set_many(computed)
+            except Exception as e:
+                log.warning(f"Embedding cache update failed: {e}")
+            cached.update(computed)
+
+        return [cached[key] for key in keys]
+
+
+class SQLiteEmbeddingCache(EmbeddingCache):
+    def __init__(self, path: Path, max_entries: int):
+        self.db_path = Path(path) / "embeddings.db"
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+                "ON embedding_cache (last_used)"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        result = {}
+        if not keys:
+            return result
+
+        conn = self._connect()
+        try:
+            # Stay well below SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                result.update({key: decode_vector(vector) for key, vector in rows})
+
+                if rows:
+                    conn.execute(
+                        f"UPDATE embedding_cache SET last_used = ? WHERE key IN ({placeholders})",
+                        [time.time(), *batch],
+                    )
+            conn.commit()
+        finally:
+            conn.close()
+        return result
+
+    def set_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, vector, last_used) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (key, encode_vector(vector), now)
+                        for key, vector in items.items()
+                    ],
+                )
+
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM embedding_cache"
+                ).fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM embedding_cache WHERE key IN ("
+                        "SELECT key FROM embedding_cache ORDER BY last_used ASC LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+
+
+class RedisEmbeddingCache(EmbeddingCache):
+    """
+    Redis-backed cache shared between nodes. Entries expire after a TTL that is
+    refreshed on every hit; with an LRU maxmemory policy Redis also bounds size.
+    """
+
+    def __init__(self, redis_url: str, ttl: int, namespace: str = "embedding_cache"):
+        self.redis = get_redis_connection(
+            redis_url=redis_url,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            decode_responses=False,
+        )
+        self.ttl = ttl
+        self.prefix = f"{REDIS_KEY_PREFIX}:{namespace}"
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        if not keys:
+            return {}
+
+        redis_keys = [f"{self.prefix}:{key}" for key in keys]
+        values = self.redis.mget(redis_keys)
+
+        result = {}
+        pipe = self.redis.pipeline()
+        for key, redis_key, value in zip(keys, redis_keys, values):
+            if value is not None:
+                result[key] = decode_vector(value)
+                pipe.expire(redis_key, self.ttl)
+        if result:
+            pipe.execute()
+        return result
+
+    def set_many(self, items: dict[str, list[float]]) -> None:
+        if not items:
+            return
+
+        pipe = self.redis.pipeline()
+        for key, vector in items.items():
+            pipe.set(f"{self.prefix}:{key}", encode_vector(vector), ex=self.ttl)
+        pipe.execute()
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+class QueryEmbeddingCache:
+    """
+    In-process LRU cache with TTL for query embeddings, optionally backed by a
+    shared Redis tier so that nodes can reuse each other's query embeddings.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: int,
+        shared: Optional[RedisEmbeddingCache] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._items = TTLCache(ttl, max_size)
+
+    def embed(
+        self,
+        query: str,
+        embed_function: Callable[[str], Optional[list[float]]],
+        engine: str,
+        model: str,
+        prefix: Optional[str] = None,
+    ) -> Optional[list[float]]:
+        key = get_embedding_cache_key(engine, model, prefix, normalize_query(query))
+
+        vector = self._items.get(key)
+        if vector is None and self.shared is not None:
+            try:
+                vector = self.shared.get_many([key]).get(key)
+                if vector is not None:
+                    self._items.set(key, vector)
+            except Exception as e:
+                log.warning(f"Shared query embedding cache lookup failed: {e}")
+
+        if vector is not None:
+            self.hits += 1
+            return vector
+
+        self.misses += 1
+        vector = embed_function(query)
+        if vector is None:
+            return None
+
+        self._items.set(key, vector)
+        if self.shared is not None:
+            try:
+                self.shared.set_many({key: vector})
+            except Exception as e:
+                log.warning(f"Shared query embedding cache update failed: {e}")
+        return vector
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": self._items.size(),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "shared": self.shared is not None,
+        }
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    if not ENABLE_RAG_EMBEDDING_CACHE:
+        return None
+
+    try:
+        if RAG_EMBEDDING_CACHE_REDIS_URL:
+            return RedisEmbeddingCache(
+                RAG_EMBEDDING_CACHE_REDIS_URL, RAG_EMBEDDING_CACHE_REDIS_TTL
+            )
+        return SQLiteEmbeddingCache(
+            RAG_EMBEDDING_CACHE_DIR, RAG_EMBEDDING_CACHE_MAX_ENTRIES
+        )
+    except Exception as e:
+        log.error(f"Failed to initialize the embedding cache: {e}")
+        return None
+
+
+def get_query_embedding_cache() -> Optional[QueryEmbeddingCache]:
+    if RAG_QUERY_EMBEDDING_CACHE_SIZE <= 0:
+        return None
+
+    shared = None
+    if RAG_EMBEDDING_CACHE_REDIS_URL:
+        try:
+            shared = RedisEmbeddingCache(
+                RAG_EMBEDDING_CACHE_REDIS_URL,
+                RAG_QUERY_EMBEDDING_CACHE_TTL,
+                namespace="query_embedding_cache",
+            )
+        except Exception as e:
+            log.error(f"Failed to initialize the shared query embedding cache: {e}")
+
+    return QueryEmbeddingCache(
+        RAG_QUERY_EMBEDDING_CACHE_SIZE, RAG_QUERY_EMBEDDING_CACHE_TTL, shared
+    )
+
+
+EMBEDDING_CACHE = get_embedding_cache()
+QUERY_EMBEDDING_CACHE = get_query_embedding_cache()
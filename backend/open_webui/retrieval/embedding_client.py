@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Iterable, Optional
+
+import aiohttp
+
+from open_webui.config import (
+    RAG_EMBEDDING_CONCURRENT_REQUESTS,
+    RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS,
+)
+from open_webui.env import (
+    AIOHTTP_CLIENT_SESSION_SSL,
+    AIOHTTP_CLIENT_TIMEOUT,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+RETRY_STATUS_CODES = {429, 503}
+MAX_RETRIES = 5
+
+
+def get_retry_after(headers, attempt: int) -> float:
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+            except Exception:
+                pass
+    return float(2**attempt)
+
+
+class EmbeddingClient:
+    """
+    Embedding HTTP client with one pooled aiohttp session, owned by a background
+    event loop so the synchronous embedding functions can share it.
+
+    Batches are dispatched concurrently up to RAG_EMBEDDING_CONCURRENT_REQUESTS
+    in flight, rate limits are retried after Retry-After with asyncio.sleep, and
+    results are returned in submission order. Search queries go through their
+    own session, limited by RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS, so they
+    never wait behind ingestion batches.
+    """
+
+    def __init__(self, max_concurrency: int, query_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.query_concurrency = max(1, query_concurrency)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # {query: (session, semaphore)}
+        self._pools: dict[bool, tuple[aiohttp.ClientSession, asyncio.Semaphore]] = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="embedding-client",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    async def _get_pool(
+        self, query: bool
+    ) -> tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        pool = self._pools.get(query)
+        if pool is None or pool[0].closed:
+            limit = self.query_concurrency if query else self.max_concurrency
+            pool = (
+                aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=limit, ssl=AIOHTTP_CLIENT_SESSION_SSL
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                    trust_env=True,
+                ),
+                asyncio.Semaphore(limit),
+            )
+            self._pools[query] = pool
+        return pool
+
+    async def post(
+        self, url: str, headers: dict, payload: dict, query: bool = False
+    ) -> Any:
+        session, semaphore = await self._get_pool(query)
+
+        for attempt in range(MAX_RETRIES):
+            async with semaphore:
+                async with session.post(url, headers=headers, json=payload) as r:
+                    if r.status not in RETRY_STATUS_CODES:
+                        r.raise_for_status()
+                        return await r.json(content_type=None)
+
+                    delay = get_retry_after(r.headers, attempt)
+
+            # Wait outside of the semaphore so other batches can proceed
+            log.debug(f"Embedding request rate limited ({r.status}), retry in {delay}s")
+            await asyncio.sleep(delay)
+
+        raise Exception(f"Embedding request failed after {MAX_RETRIES} attempts")
+
+    async def gather(self, coroutines: Iterable[Awaitable]) -> list:
+        # asyncio.gather keeps the results in submission order
+        return await asyncio.gather(*coroutines)
+
+    def run(self, coroutine: Awaitable) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+
+        for session, _ in self._pools.values():
+            if not session.closed:
+                self.run(session.close())
+        self._pools = {}
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+EMBEDDING_CLIENT = EmbeddingClient(
+    RAG_EMBEDDING_CONCURRENT_REQUESTS, RAG_EMBEDDING_QUERY_CONCURRENT_REQUESTS
+)
@@ -2,18 +2,20 @@ import logging
 import os
 from typing import Optional, Union
 
-import requests
 import hashlib
 from concurrent.futures import ThreadPoolExecutor
-import time
 
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
 from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
+from open_webui.retrieval.embedding_cache import (
+    EMBEDDING_CACHE,
+    QUERY_EMBEDDING_CACHE,
+)
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 from open_webui.models.users import UserModel
@@ -21,7 +23,6 @@ from open_webui.models.files import Files
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
 from open_webui.utils.access_control import has_access
 
 
@@ -78,6 +79,40 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class KeywordSearchRetriever(BaseRetriever):
+    collection_name: Any
+    top_k: int
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        result = VECTOR_DB_CLIENT.keyword_search(
+            collection_name=self.collection_name,
+            query=query,
+            limit=self.top_k,
+        )
+
+        if not result:
+            return []
+
+        ids = result.ids[0]
+        metadatas = result.metadatas[0]
+        documents = result.documents[0]
+
+        results = []
+        for idx in range(len(ids)):
+            results.append(
+                Document(
+                    metadata=metadatas[idx],
+                    page_content=documents[idx],
+                )
+            )
+        return results
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -114,7 +149,6 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
     query: str,
     embedding_function,
     k: int,
@@ -125,11 +159,10 @@ def query_doc_with_hybrid_search(
 ) -> dict:
     try:
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
+        bm25_retriever = KeywordSearchRetriever(
+            collection_name=collection_name,
+            top_k=k,
         )
-        bm25_retriever.k = k
 
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
@@ -294,13 +327,21 @@ def query_collection(
             log.exception(f"Error when querying the collection: {e}")
             return None, e
 
-    # Generate all query embeddings (in one call)
-    query_embeddings = embedding_function(queries, prefix=RAG_EMBEDDING_QUERY_PREFIX)
     log.debug(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
     with ThreadPoolExecutor() as executor:
+        # Embed each query on its own so repeated queries hit the query embedding cache
+        query_embeddings = list(
+            executor.map(
+                lambda query: embedding_function(
+                    query, prefix=RAG_EMBEDDING_QUERY_PREFIX
+                ),
+                queries,
+            )
+        )
+
         future_results = []
         for query_embedding in query_embeddings:
             for collection_name in collection_names:
@@ -334,20 +375,6 @@ def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
-    collection_results = {}
-    for collection_name in collection_names:
-        try:
-            log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
-            )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
-            )
-        except Exception as e:
-            log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -357,7 +384,6 @@ def query_collection_with_hybrid_search(
         try:
             result = query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -372,13 +398,9 @@ def query_collection_with_hybrid_search(
             return None, e
 
     # Prepare tasks for all collections and queries
-    # Avoid running any tasks for collections that failed to fetch data (have assigned None)
-    tasks = [
-        (cn, q)
-        for cn in collection_names
-        if collection_results[cn] is not None
-        for q in queries
-    ]
+    # Lexical candidates come from VECTOR_DB_CLIENT.keyword_search (server-side
+    # or the local BM25 index), so collections are never fetched in full here
+    tasks = [(cn, q) for cn in collection_names for q in queries]
 
     with ThreadPoolExecutor() as executor:
         future_results = [executor.submit(process_query, cn, q) for cn, q in tasks]
@@ -408,42 +430,81 @@ def get_embedding_function(
     azure_api_version=None,
 ):
     if embedding_engine == "":
-        return lambda query, prefix=None, user=None: embedding_function.encode(
+        func = lambda query, prefix=None, user=None: embedding_function.encode(
             query, **({"prompt": prefix} if prefix else {})
         ).tolist()
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
-        func = lambda query, prefix=None, user=None: generate_embeddings(
-            engine=embedding_engine,
-            model=embedding_model,
-            text=query,
-            prefix=prefix,
-            url=url,
-            key=key,
-            user=user,
-            azure_api_version=azure_api_version,
-        )
 
-        def generate_multiple(query, prefix, user, func):
+        def generate(query, prefix, user):
+            return agenerate_embeddings(
+                engine=embedding_engine,
+                model=embedding_model,
+                text=query,
+                prefix=prefix,
+                url=url,
+                key=key,
+                user=user,
+                azure_api_version=azure_api_version,
+            )
+
+        def generate_multiple(query, prefix=None, user=None):
             if isinstance(query, list):
-                embeddings = []
-                for i in range(0, len(query), embedding_batch_size):
-                    embeddings.extend(
-                        func(
-                            query[i : i + embedding_batch_size],
-                            prefix=prefix,
-                            user=user,
-                        )
+                # Dispatch all batches concurrently through the shared client;
+                # results come back in batch order
+                batches = [
+                    query[i : i + embedding_batch_size]
+                    for i in range(0, len(query), embedding_batch_size)
+                ]
+                results = EMBEDDING_CLIENT.run(
+                    EMBEDDING_CLIENT.gather(
+                        generate(batch, prefix, user) for batch in batches
                     )
+                )
+
+                embeddings = []
+                for result in results:
+                    if result is None:
+                        raise Exception("Failed to generate embeddings for a batch")
+                    embeddings.extend(result)
                 return embeddings
             else:
-                return func(query, prefix, user)
+                return EMBEDDING_CLIENT.run(generate(query, prefix, user))
 
-        return lambda query, prefix=None, user=None: generate_multiple(
-            query, prefix, user, func
-        )
+        func = generate_multiple
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
+    if EMBEDDING_CACHE is None and QUERY_EMBEDDING_CACHE is None:
+        return func
+
+    def generate_with_cache(query, prefix=None, user=None):
+        # Single strings are search queries and go through the in-process query
+        # cache; lists are chunk batches and go through the persistent cache
+        if not isinstance(query, list):
+            if QUERY_EMBEDDING_CACHE is None:
+                return func(query, prefix, user)
+
+            return QUERY_EMBEDDING_CACHE.embed(
+                query,
+                lambda text: func(text, prefix, user),
+                engine=embedding_engine,
+                model=embedding_model,
+                prefix=prefix,
+            )
+
+        if EMBEDDING_CACHE is None:
+            return func(query, prefix, user)
+
+        return EMBEDDING_CACHE.embed(
+            query,
+            lambda texts: func(texts, prefix=prefix, user=user),
+            engine=embedding_engine,
+            model=embedding_model,
+            prefix=prefix,
+        )
+
+    return generate_with_cache
+
 
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
@@ -724,13 +785,25 @@ def get_model_path(model: str, update_model: bool = False):
         return model
 
 
-def generate_openai_batch_embeddings(
+def get_user_info_headers(user: UserModel = None) -> dict:
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        return {
+            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
+            "X-OpenWebUI-User-Id": user.id,
+            "X-OpenWebUI-User-Email": user.email,
+            "X-OpenWebUI-User-Role": user.role,
+        }
+    return {}
+
+
+async def agenerate_openai_batch_embeddings(
     model: str,
     texts: list[str],
     url: str = "https://api.openai.com/v1",
     key: str = "",
     prefix: str = None,
     user: UserModel = None,
+    query: bool = False,
 ) -> Optional[list[list[float]]]:
     try:
         log.debug(
@@ -740,36 +813,26 @@ def generate_openai_batch_embeddings(
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
-        r = requests.post(
+        data = await EMBEDDING_CLIENT.post(
             f"{url}/embeddings",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {key}",
-                **(
-                    {
-                        "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                        "X-OpenWebUI-User-Id": user.id,
-                        "X-OpenWebUI-User-Email": user.email,
-                        "X-OpenWebUI-User-Role": user.role,
-                    }
-                    if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                    else {}
-                ),
+                **get_user_info_headers(user),
             },
-            json=json_data,
+            payload=json_data,
+            query=query,
         )
-        r.raise_for_status()
-        data = r.json()
         if "data" in data:
             return [elem["embedding"] for elem in data["data"]]
         else:
-            raise "Something went wrong :/"
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
 
 
-def generate_azure_openai_batch_embeddings(
+async def agenerate_azure_openai_batch_embeddings(
     model: str,
     texts: list[str],
     url: str,
@@ -777,6 +840,7 @@ def generate_azure_openai_batch_embeddings(
     version: str = "",
     prefix: str = None,
     user: UserModel = None,
+    query: bool = False,
 ) -> Optional[list[list[float]]]:
     try:
         log.debug(
@@ -788,48 +852,33 @@ def generate_azure_openai_batch_embeddings(
 
         url = f"{url}/openai/deployments/{model}/embeddings?api-version={version}"
 
-        for _ in range(5):
-            r = requests.post(
-                url,
-                headers={
-                    "Content-Type": "application/json",
-                    "api-key": key,
-                    **(
-                        {
-                            "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                            "X-OpenWebUI-User-Id": user.id,
-                            "X-OpenWebUI-User-Email": user.email,
-                            "X-OpenWebUI-User-Role": user.role,
-                        }
-                        if ENABLE_FORWARD_USER_INFO_HEADERS and user
-                        else {}
-                    ),
-                },
-                json=json_data,
-            )
-            if r.status_code == 429:
-                retry = float(r.headers.get("Retry-After", "1"))
-                time.sleep(retry)
-                continue
-            r.raise_for_status()
-            data = r.json()
-            if "data" in data:
-                return [elem["embedding"] for elem in data["data"]]
-            else:
-                raise Exception("Something went wrong :/")
-        return None
+        data = await EMBEDDING_CLIENT.post(
+            url,
+            headers={
+                "Content-Type": "application/json",
+                "api-key": key,
+                **get_user_info_headers(user),
+            },
+            payload=json_data,
+            query=query,
+        )
+        if "data" in data:
+            return [elem["embedding"] for elem in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
 
 
-def generate_ollama_batch_embeddings(
+async def agenerate_ollama_batch_embeddings(
     model: str,
     texts: list[str],
     url: str,
     key: str = "",
     prefix: str = None,
     user: UserModel = None,
+    query: bool = False,
 ) -> Optional[list[list[float]]]:
     try:
         log.debug(
@@ -839,37 +888,43 @@ def generate_ollama_batch_embeddings(
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             json_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
-        r = requests.post(
+        data = await EMBEDDING_CLIENT.post(
             f"{url}/api/embed",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {key}",
-                **(
-                    {
-                        "X-OpenWebUI-User-Name": quote(user.name, safe=" "),
-                        "X-OpenWebUI-User-Id": user.id,
-                        "X-OpenWebUI-User-Email": user.email,
-                        "X-OpenWebUI-User-Role": user.role,
-                    }
-                    if ENABLE_FORWARD_USER_INFO_HEADERS
-                    else {}
-                ),
+                **get_user_info_headers(user),
             },
-            json=json_data,
+            payload=json_data,
+            query=query,
         )
-        r.raise_for_status()
-        data = r.json()
 
         if "embeddings" in data:
             return data["embeddings"]
         else:
-            raise "Something went wrong :/"
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
-def generate_embeddings(
+def generate_openai_batch_embeddings(*args, **kwargs) -> Optional[list[list[float]]]:
+    return EMBEDDING_CLIENT.run(agenerate_openai_batch_embeddings(*args, **kwargs))
+
+
+def generate_azure_openai_batch_embeddings(
+    *args, **kwargs
+) -> Optional[list[list[float]]]:
+    return EMBEDDING_CLIENT.run(
+        agenerate_azure_openai_batch_embeddings(*args, **kwargs)
+    )
+
+
+def generate_ollama_batch_embeddings(*args, **kwargs) -> Optional[list[list[float]]]:
+    return EMBEDDING_CLIENT.run(agenerate_ollama_batch_embeddings(*args, **kwargs))
+
+
+async def agenerate_embeddings(
     engine: str,
     model: str,
     text: Union[str, list[str]],
@@ -887,7 +942,7 @@ def generate_embeddings(
             text = f"{prefix}{text}"
 
     if engine == "ollama":
-        embeddings = generate_ollama_batch_embeddings(
+        embeddings = await agenerate_ollama_batch_embeddings(
             **{
                 "model": model,
                 "texts": text if isinstance(text, list) else [text],
@@ -895,17 +950,22 @@ def generate_embeddings(
                 "key": key,
                 "prefix": prefix,
                 "user": user,
+                "query": isinstance(text, str),
             }
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "openai":
-        embeddings = generate_openai_batch_embeddings(
-            model, text if isinstance(text, list) else [text], url, key, prefix, user
+        embeddings = await agenerate_openai_batch_embeddings(
+            model,
+            text if isinstance(text, list) else [text],
+            url,
+            key,
+            prefix,
+            user,
+            query=isinstance(text, str),
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "azure_openai":
         azure_api_version = kwargs.get("azure_api_version", "")
-        embeddings = generate_azure_openai_batch_embeddings(
+        embeddings = await agenerate_azure_openai_batch_embeddings(
             model,
             text if isinstance(text, list) else [text],
             url,
@@ -913,8 +973,26 @@ def generate_embeddings(
             azure_api_version,
             prefix,
             user,
+            query=isinstance(text, str),
         )
-        return embeddings[0] if isinstance(text, str) else embeddings
+    else:
+        return None
+
+    if embeddings is None:
+        return None
+    return embeddings[0] if isinstance(text, str) else embeddings
+
+
+def generate_embeddings(
+    engine: str,
+    model: str,
+    text: Union[str, list[str]],
+    prefix: Union[str, None] = None,
+    **kwargs,
+):
+    return EMBEDDING_CLIENT.run(
+        agenerate_embeddings(engine, model, text, prefix, **kwargs)
+    )
 
 
 import operator
@@ -3,7 +3,7 @@ import logging
 from chromadb import Settings
 from chromadb.utils.batch_utils import create_batches
 
-from typing import Optional
+from typing import Any, Optional
 
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
@@ -68,6 +68,13 @@ class ChromaClient(VectorDBBase):
         # Delete the collection based on the collection name.
         return self.client.delete_collection(name=collection_name)
 
+    def list_collections(self) -> Optional[list[str]]:
+        # Older Chroma versions return Collection objects instead of names
+        return [
+            collection if isinstance(collection, str) else collection.name
+            for collection in self.client.list_collections()
+        ]
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -170,6 +177,13 @@ class ChromaClient(VectorDBBase):
             ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
         )
 
+    def update_metadata(
+        self, collection_name: str, ids: list[str], metadatas: list[Any]
+    ) -> bool:
+        collection = self.client.get_collection(name=collection_name)
+        collection.update(ids=ids, metadatas=metadatas)
+        return True
+
     def delete(
         self,
         collection_name: str,
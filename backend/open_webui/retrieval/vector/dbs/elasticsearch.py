@@ -28,6 +28,8 @@ class ElasticsearchClient(VectorDBBase):
     baesd on the embedding length.
     """
 
+    native_keyword_search = True
+
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
         self.client = Elasticsearch(
@@ -149,6 +151,30 @@ class ElasticsearchClient(VectorDBBase):
         query = {"query": {"term": {"collection": collection_name}}}
         self.client.delete_by_query(index=f"{self.index_prefix}*", body=query)
 
+    def list_collections(self) -> Optional[list[str]]:
+        collections = []
+        after = None
+        while True:
+            composite = {
+                "size": 1000,
+                "sources": [{"collection": {"terms": {"field": "collection"}}}],
+            }
+            if after:
+                composite["after"] = after
+
+            result = self.client.search(
+                index=f"{self.index_prefix}*",
+                body={"size": 0, "aggs": {"collections": {"composite": composite}}},
+            )
+            aggregation = result["aggregations"]["collections"]
+            collections.extend(
+                bucket["key"]["collection"] for bucket in aggregation["buckets"]
+            )
+
+            after = aggregation.get("after_key")
+            if not after or not aggregation["buckets"]:
+                return collections
+
     # Status: works
     def search(
         self, collection_name: str, vectors: list[list[float]], limit: int
@@ -177,6 +203,32 @@ class ElasticsearchClient(VectorDBBase):
 
         return self._result_to_search_result(result)
 
+    def keyword_search(
+        self, collection_name: str, query: str, limit: int
+    ) -> Optional[SearchResult]:
+        # BM25 over the analyzed "text" field, scoped to the collection
+        query_body = {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "bool": {
+                    "must": [{"match": {"text": query}}],
+                    "filter": [{"term": {"collection": collection_name}}],
+                }
+            },
+        }
+
+        try:
+            result = self.client.search(
+                index=f"{self.index_prefix}*",
+                body=query_body,
+            )
+
+            return self._result_to_search_result(result)
+
+        except Exception as e:
+            return None
+
     # Status: only tested halfwat
     def query(
         self, collection_name: str, filter: dict, limit: Optional[int] = None
@@ -2,6 +2,7 @@ from pymilvus import MilvusClient as Client
 from pymilvus import FieldSchema, DataType
 import json
 import logging
+import re
 from typing import Optional
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
@@ -24,6 +25,11 @@ from open_webui.env import SRC_LOG_LEVELS
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Stored forms of the file-{uuid} and web-search-{sha256} collection names
+MILVUS_COLLECTION_NAME_PATTERN = re.compile(
+    r"^(file_[0-9a-f]{8}(_[0-9a-f]{4}){3}_[0-9a-f]{12}|web_search_[0-9a-f]+)$"
+)
+
 
 class MilvusClient(VectorDBBase):
     def __init__(self):
@@ -168,6 +174,18 @@ class MilvusClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def list_collections(self) -> Optional[list[str]]:
+        # Names are stored with "-" replaced by "_", which cannot be undone in
+        # general. Only names of a known shape are listed, so callers never get
+        # a name the app did not use.
+        prefix = f"{self.collection_prefix}_"
+        collection_names = []
+        for name in self.client.list_collections():
+            name = name[len(prefix) :] if name.startswith(prefix) else ""
+            if MILVUS_COLLECTION_NAME_PATTERN.match(name):
+                collection_names.append(name.replace("_", "-"))
+        return collection_names
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -18,6 +18,8 @@ from open_webui.config import (
 
 
 class OpenSearchClient(VectorDBBase):
+    native_keyword_search = True
+
     def __init__(self):
         self.index_prefix = "open_webui"
         self.client = OpenSearch(
@@ -111,6 +113,14 @@ class OpenSearchClient(VectorDBBase):
         # We are simply adapting to the norms of the other DBs.
         self.client.indices.delete(index=self._get_index_name(collection_name))
 
+    def list_collections(self) -> Optional[list[str]]:
+        prefix = f"{self.index_prefix}_"
+        return [
+            index[len(prefix) :]
+            for index in self.client.indices.get(index=f"{prefix}*")
+            if index.startswith(prefix)
+        ]
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -144,6 +154,29 @@ class OpenSearchClient(VectorDBBase):
         except Exception as e:
             return None
 
+    def keyword_search(
+        self, collection_name: str, query: str, limit: int
+    ) -> Optional[SearchResult]:
+        try:
+            if not self.has_collection(collection_name):
+                return None
+
+            # BM25 over the analyzed "text" field
+            query_body = {
+                "size": limit,
+                "_source": ["text", "metadata"],
+                "query": {"match": {"text": query}},
+            }
+
+            result = self.client.search(
+                index=self._get_index_name(collection_name), body=query_body
+            )
+
+            return self._result_to_search_result(result)
+
+        except Exception as e:
+            return None
+
     def query(
         self, collection_name: str, filter: dict, limit: Optional[int] = None
     ) -> Optional[GetResult]:
@@ -1,6 +1,7 @@
 from typing import Optional, List, Dict, Any
 import logging
 import json
+import threading
 from sqlalchemy import (
     func,
     literal,
@@ -32,6 +33,7 @@ from open_webui.retrieval.vector.main import (
     SearchResult,
     GetResult,
 )
+from open_webui.retrieval.bm25 import tokenize
 from open_webui.config import (
     PGVECTOR_DB_URL,
     PGVECTOR_INITIALIZE_MAX_VECTOR_LENGTH,
@@ -76,6 +78,9 @@ class DocumentChunk(Base):
 
 
 class PgvectorClient(VectorDBBase):
+    # Encrypted chunk text cannot be indexed for full-text search
+    native_keyword_search = not PGVECTOR_PGCRYPTO
+
     def __init__(self) -> None:
 
         # if no pgvector uri, use the existing database connection
@@ -149,6 +154,53 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during initialization: {e}")
             raise
 
+        if not PGVECTOR_PGCRYPTO:
+            threading.Thread(target=self.create_text_index, daemon=True).start()
+
+    def create_text_index(self) -> None:
+        """
+        Build the full-text index used by keyword_search. A plain CREATE INDEX
+        blocks writes to document_chunk (and startup) for as long as it runs on
+        a large table, so it is built concurrently, outside a transaction, by
+        one node at a time. Keyword search works without it, only slower.
+        """
+        try:
+            with self.session.get_bind().connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                if not connection.execute(
+                    text("SELECT pg_try_advisory_lock(hashtext(:name))"),
+                    {"name": "idx_document_chunk_text_tsv"},
+                ).scalar():
+                    return
+
+                valid = connection.execute(
+                    text(
+                        "SELECT i.indisvalid FROM pg_index i "
+                        "JOIN pg_class c ON c.oid = i.indexrelid "
+                        "WHERE c.relname = 'idx_document_chunk_text_tsv'"
+                    )
+                ).scalar()
+                if valid:
+                    return
+                if valid is not None:
+                    # Left invalid by an interrupted concurrent build
+                    connection.execute(
+                        text(
+                            "DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunk_text_tsv;"
+                        )
+                    )
+
+                log.info("Building the full-text index on document_chunk")
+                connection.execute(
+                    text(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_document_chunk_text_tsv "
+                        "ON document_chunk USING gin (to_tsvector('simple', text));"
+                    )
+                )
+                log.info("Full-text index on document_chunk is ready")
+        except Exception as e:
+            log.warning(f"Failed to build the full-text index on document_chunk: {e}")
+
     def check_vector_length(self) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
@@ -314,6 +366,42 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during upsert: {e}")
             raise
 
+    def update_metadata(
+        self, collection_name: str, ids: List[str], metadatas: List[Any]
+    ) -> bool:
+        try:
+            if PGVECTOR_PGCRYPTO:
+                self.session.execute(
+                    text(
+                        """
+                        UPDATE document_chunk
+                        SET vmetadata = pgp_sym_encrypt(:metadata::text, :key)
+                        WHERE id = :id AND collection_name = :collection_name
+                        """
+                    ),
+                    [
+                        {
+                            "id": id,
+                            "collection_name": collection_name,
+                            "metadata": json.dumps(metadata),
+                            "key": PGVECTOR_PGCRYPTO_KEY,
+                        }
+                        for id, metadata in zip(ids, metadatas)
+                    ],
+                )
+            else:
+                for id, metadata in zip(ids, metadatas):
+                    self.session.query(DocumentChunk).filter(
+                        DocumentChunk.id == id,
+                        DocumentChunk.collection_name == collection_name,
+                    ).update({"vmetadata": metadata}, synchronize_session=False)
+            self.session.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during metadata update: {e}")
+            raise
+
     def search(
         self,
         collection_name: str,
@@ -423,6 +511,51 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during search: {e}")
             return None
 
+    def keyword_search(
+        self, collection_name: str, query: str, limit: int
+    ) -> Optional[SearchResult]:
+        if PGVECTOR_PGCRYPTO:
+            return super().keyword_search(collection_name, query, limit)
+
+        try:
+            terms = list(dict.fromkeys(tokenize(query)))
+            if not terms:
+                return SearchResult(
+                    ids=[[]], distances=[[]], documents=[[]], metadatas=[[]]
+                )
+
+            # Match any of the query terms, ranked by cover density
+            tsvector = func.to_tsvector("simple", DocumentChunk.text)
+            tsquery = func.to_tsquery(
+                "simple", " | ".join(f"'{term}'" for term in terms)
+            )
+            rank = func.ts_rank_cd(tsvector, tsquery).label("rank")
+
+            results = (
+                self.session.query(
+                    DocumentChunk.id,
+                    DocumentChunk.text,
+                    DocumentChunk.vmetadata,
+                    rank,
+                )
+                .filter(DocumentChunk.collection_name == collection_name)
+                .filter(tsvector.op("@@")(tsquery))
+                .order_by(rank.desc())
+                .limit(limit)
+                .all()
+            )
+
+            return SearchResult(
+                ids=[[row.id for row in results]],
+                distances=[[row.rank for row in results]],
+                documents=[[row.text for row in results]],
+                metadatas=[[row.vmetadata for row in results]],
+            )
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during keyword search: {e}")
+            return None
+
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
     ) -> Optional[GetResult]:
@@ -595,3 +728,16 @@ class PgvectorClient(VectorDBBase):
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+    def list_collections(self) -> Optional[List[str]]:
+        try:
+            return [
+                row[0]
+                for row in self.session.query(DocumentChunk.collection_name)
+                .distinct()
+                .all()
+            ]
+        except Exception as e:
+            log.exception(f"Error listing collections: {e}")
+            self.session.rollback()
+            return None
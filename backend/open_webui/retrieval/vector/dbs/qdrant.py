@@ -134,6 +134,14 @@ class QdrantClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def list_collections(self) -> Optional[list[str]]:
+        prefix = f"{self.collection_prefix}_"
+        return [
+            collection.name[len(prefix) :]
+            for collection in self.client.get_collections().collections
+            if collection.name.startswith(prefix)
+        ]
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
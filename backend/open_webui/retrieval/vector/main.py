@@ -31,6 +31,10 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    # Whether keyword_search is answered by the backend itself, in which case
+    # the local BM25 index does not need to be maintained for it
+    native_keyword_search: bool = False
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -41,6 +45,13 @@ class VectorDBBase(ABC):
         """Delete a collection from the vector DB."""
         pass
 
+    def list_collections(self) -> Optional[List[str]]:
+        """
+        List the names of all collections, or None if the backend cannot
+        enumerate them (used to garbage collect orphaned collections).
+        """
+        return None
+
     @abstractmethod
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         """Insert a list of vector items into a collection."""
@@ -51,6 +62,15 @@ class VectorDBBase(ABC):
         """Insert or update vector items in a collection."""
         pass
 
+    def update_metadata(
+        self, collection_name: str, ids: List[str], metadatas: List[Any]
+    ) -> bool:
+        """
+        Replace the metadata of stored items without touching their vectors.
+        Returns False if the backend cannot, callers then upsert the items.
+        """
+        return False
+
     @abstractmethod
     def search(
         self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
@@ -58,6 +78,19 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def keyword_search(
+        self, collection_name: str, query: str, limit: int
+    ) -> Optional[SearchResult]:
+        """
+        Return the top lexical (BM25-style) matches for a text query.
+
+        Backends with native full-text search override this to answer it
+        server-side; the default scores against the local BM25 index.
+        """
+        from open_webui.retrieval.bm25 import BM25_INDEX
+
+        return BM25_INDEX.search(collection_name, query, limit)
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from open_webui.config import (
+    VECTOR_GC_BATCH_DELAY,
+    VECTOR_GC_BATCH_SIZE,
+    VECTOR_GC_INTERVAL,
+    WEB_SEARCH_COLLECTION_TTL,
+)
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS
+from open_webui.models.files import Files
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+FILE_COLLECTION_PREFIX = "file-"
+WEB_SEARCH_COLLECTION_PREFIX = "web-search-"
+
+# Report of the last run, returned by the admin endpoint
+LAST_REPORT: Optional[dict] = None
+
+
+def is_web_search_expired(collection_name: str, now: int) -> bool:
+    # All chunks of a web search are saved at once, one of them is enough
+    result = VECTOR_DB_CLIENT.query(collection_name=collection_name, filter={}, limit=1)
+    if result is None:
+        # Unknown, e.g. the query failed
+        return False
+    if not result.metadatas or not result.metadatas[0]:
+        return True
+
+    try:
+        created_at = int((result.metadatas[0][0] or {}).get("created_at"))
+    except (TypeError, ValueError):
+        # Saved before timestamps were recorded
+        return True
+    return now - created_at > WEB_SEARCH_COLLECTION_TTL
+
+
+def find_orphaned_collections(collection_names: list[str]) -> dict[str, str]:
+    """
+    Return {collection_name: reason} for collections without a live owner.
+    Only collections whose owner is known from their name are considered,
+    others (knowledge bases, text, web pages, ...) are left alone.
+    """
+    file_ids = set(Files.get_file_ids())
+    now = int(time.time())
+
+    orphaned = {}
+    for collection_name in collection_names:
+        if collection_name.startswith(WEB_SEARCH_COLLECTION_PREFIX):
+            if is_web_search_expired(collection_name, now):
+                orphaned[collection_name] = "web_search_expired"
+        elif collection_name.startswith(FILE_COLLECTION_PREFIX):
+            if collection_name[len(FILE_COLLECTION_PREFIX) :] not in file_ids:
+                orphaned[collection_name] = "file_deleted"
+
+    return orphaned
+
+
+def reconcile_vector_collections(dry_run: bool = False) -> dict:
+    """
+    Drop orphaned vector collections in batches of VECTOR_GC_BATCH_SIZE, with a
+    VECTOR_GC_BATCH_DELAY pause between batches to limit load on the vector DB.
+    """
+    global LAST_REPORT
+
+    started_at = time.time()
+    collection_names = VECTOR_DB_CLIENT.list_collections()
+    if collection_names is None:
+        log.info("Vector DB cannot list collections, skipping garbage collection")
+        return {"status": False, "message": "Vector DB cannot list collections"}
+
+    orphaned = find_orphaned_collections(collection_names)
+
+    deleted = []
+    errors = []
+    if not dry_run:
+        names = list(orphaned.keys())
+        for i in range(0, len(names), VECTOR_GC_BATCH_SIZE):
+            if i > 0:
+                time.sleep(VECTOR_GC_BATCH_DELAY)
+
+            for collection_name in names[i : i + VECTOR_GC_BATCH_SIZE]:
+                try:
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                    BM25_INDEX.drop(collection_name)
+                    deleted.append(collection_name)
+                except Exception as e:
+                    log.warning(f"Failed to delete collection {collection_name}: {e}")
+                    errors.append({"collection_name": collection_name, "error": str(e)})
+
+    reasons = {}
+    for reason in orphaned.values():
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+    report = {
+        "status": True,
+        "dry_run": dry_run,
+        "scanned": len(collection_names),
+        "orphaned": reasons,
+        "deleted": len(deleted),
+        "collections": (
+            orphaned if dry_run else {name: orphaned[name] for name in deleted}
+        ),
+        "errors": errors,
+        "started_at": int(started_at),
+        "duration": round(time.time() - started_at, 3),
+    }
+
+    log.info(
+        f"Vector garbage collection: scanned {report['scanned']} collections, "
+        f"{len(orphaned)} orphaned {reasons}, deleted {len(deleted)}"
+        + (" (dry run)" if dry_run else "")
+    )
+    if not dry_run:
+        LAST_REPORT = report
+    return report
+
+
+async def periodic_vector_gc(app):
+    while True:
+        await asyncio.sleep(VECTOR_GC_INTERVAL)
+
+        try:
+            # With several nodes, only the one taking the lock runs this interval
+            redis = app.state.redis
+            if redis is not None and not await redis.set(
+                f"{REDIS_KEY_PREFIX}:vector_gc_lock",
+                app.state.instance_id or "1",
+                nx=True,
+                ex=max(VECTOR_GC_INTERVAL - 1, 1),
+            ):
+                continue
+
+            await run_in_threadpool(reconcile_vector_collections)
+        except Exception as e:
+            log.exception(f"Error during vector garbage collection: {e}")
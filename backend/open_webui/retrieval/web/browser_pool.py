@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.config import (
+    PLAYWRIGHT_BLOCKED_RESOURCE_TYPES,
+    PLAYWRIGHT_MAX_BROWSERS,
+    PLAYWRIGHT_MAX_PAGES_PER_BROWSER,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Recreate a browser context after this many pages so cookies, caches and
+# leaked page state do not build up forever
+MAX_PAGES_PER_CONTEXT = 100
+
+
+class PooledBrowser:
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.active_pages = 0
+        self.total_pages = 0
+
+
+class BrowserPool:
+    """
+    Bounded pool of long-lived Chromium browsers for the Playwright web loader.
+
+    Browsers are launched (or connected to) lazily, up to max_browsers, and each
+    serves up to max_pages concurrent pages from one reusable context that
+    aborts requests for blocked resource types. The pool lives on its own event
+    loop thread, since Playwright objects are bound to the loop that created
+    them, so both the sync and the async loader paths can share it.
+    """
+
+    def __init__(
+        self,
+        ws_url: Optional[str] = None,
+        headless: bool = True,
+        proxy: Optional[dict] = None,
+        max_browsers: int = PLAYWRIGHT_MAX_BROWSERS,
+        max_pages: int = PLAYWRIGHT_MAX_PAGES_PER_BROWSER,
+    ):
+        self.ws_url = ws_url
+        self.headless = headless
+        self.proxy = proxy
+        self.max_browsers = max(1, max_browsers)
+        self.max_pages = max(1, max_pages)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browsers: list[PooledBrowser] = []
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="playwright-browser-pool",
+                    daemon=True,
+                ).start()
+            return self._loop
+
+    def submit(self, coroutine: Awaitable):
+        """Schedule a coroutine on the pool loop, returns a concurrent future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+
+    async def _route(self, route):
+        if route.request.resource_type in PLAYWRIGHT_BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_context(self, browser):
+        context = await browser.new_context()
+        if PLAYWRIGHT_BLOCKED_RESOURCE_TYPES:
+            await context.route("**/*", self._route)
+        return context
+
+    async def _launch(self) -> PooledBrowser:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+
+        if self.ws_url:
+            browser = await self._playwright.chromium.connect(self.ws_url)
+        else:
+            browser = await self._playwright.chromium.launch(
+                headless=self.headless, proxy=self.proxy
+            )
+
+        log.info(f"Started pooled browser ({len(self._browsers) + 1})")
+        return PooledBrowser(browser, await self._new_context(browser))
+
+    async def _acquire(self) -> PooledBrowser:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            while True:
+                # Forget browsers that crashed or whose remote endpoint went away
+                self._browsers = [
+                    pooled for pooled in self._browsers if pooled.browser.is_connected()
+                ]
+
+                available = [
+                    pooled
+                    for pooled in self._browsers
+                    if pooled.active_pages < self.max_pages
+                ]
+                if available:
+                    pooled = min(available, key=lambda pooled: pooled.active_pages)
+                elif len(self._browsers) < self.max_browsers:
+                    pooled = await self._launch()
+                    self._browsers.append(pooled)
+                else:
+                    await self._condition.wait()
+                    continue
+
+                if (
+                    pooled.total_pages >= MAX_PAGES_PER_CONTEXT
+                    and pooled.active_pages == 0
+                ):
+                    await pooled.context.close()
+                    pooled.context = await self._new_context(pooled.browser)
+                    pooled.total_pages = 0
+
+                pooled.active_pages += 1
+                pooled.total_pages += 1
+                return pooled
+
+    async def _release(self, pooled: PooledBrowser):
+        async with self._condition:
+            pooled.active_pages -= 1
+            self._condition.notify()
+
+    async def load(
+        self,
+        url: str,
+        timeout: int,
+        evaluate: Callable[[Any, Any, Any], Awaitable[str]],
+    ) -> str:
+        """
+        Render a url in a pooled page and return evaluate(page, browser,
+        response). timeout (ms) bounds the whole page load and evaluation.
+        """
+
+        async def _load(pooled: PooledBrowser) -> str:
+            page = await pooled.context.new_page()
+            try:
+                page.set_default_timeout(timeout)
+                response = await page.goto(url, timeout=timeout)
+                if response is None:
+                    raise ValueError(f"page.goto() returned None for url {url}")
+                return await evaluate(page, pooled.browser, response)
+            finally:
+                await page.close()
+
+        pooled = await self._acquire()
+        try:
+            return await asyncio.wait_for(_load(pooled), timeout=timeout / 1000)
+        finally:
+            await self._release(pooled)
+
+    async def _close(self):
+        for pooled in self._browsers:
+            try:
+                await pooled.browser.close()
+            except Exception as e:
+                log.warning(f"Failed to close pooled browser: {e}")
+        self._browsers = []
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+
+        self.submit(self._close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+BROWSER_POOLS: dict[str, BrowserPool] = {}
+BROWSER_POOLS_LOCK = threading.Lock()
+
+
+def get_browser_pool(
+    ws_url: Optional[str] = None,
+    headless: bool = True,
+    proxy: Optional[dict] = None,
+) -> BrowserPool:
+    key = json.dumps([ws_url, headless, proxy], sort_keys=True)
+    with BROWSER_POOLS_LOCK:
+        if key not in BROWSER_POOLS:
+            BROWSER_POOLS[key] = BrowserPool(ws_url, headless, proxy)
+        return BROWSER_POOLS[key]
+
+
+def close_browser_pools() -> None:
+    with BROWSER_POOLS_LOCK:
+        for pool in BROWSER_POOLS.values():
+            try:
+                pool.close()
+            except Exception as e:
+                log.warning(f"Failed to close browser pool: {e}")
+        BROWSER_POOLS.clear()
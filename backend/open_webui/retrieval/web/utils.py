@@ -26,6 +26,7 @@ from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 from open_webui.retrieval.loaders.tavily import TavilyLoader
 from open_webui.retrieval.loaders.external_web import ExternalWebLoader
+from open_webui.retrieval.web.browser_pool import BrowserPool, get_browser_pool
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.config import (
     ENABLE_RAG_LOCAL_WEB_FETCH,
@@ -428,65 +429,86 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
         self.trust_env = trust_env
         self.playwright_timeout = playwright_timeout
 
+    def _get_browser_pool(self) -> BrowserPool:
+        return get_browser_pool(self.playwright_ws_url, self.headless, self.proxy)
+
     def lazy_load(self) -> Iterator[Document]:
         """Safely load URLs synchronously with support for remote browser."""
-        from playwright.sync_api import sync_playwright
+        pool = self._get_browser_pool()
 
-        with sync_playwright() as p:
-            # Use remote browser if ws_endpoint is provided, otherwise use local browser
-            if self.playwright_ws_url:
-                browser = p.chromium.connect(self.playwright_ws_url)
-            else:
-                browser = p.chromium.launch(headless=self.headless, proxy=self.proxy)
+        # Rate limiting spaces out the page loads, which then run concurrently
+        # in the pooled browsers; results are yielded in url order
+        futures = []
+        for url in self.urls:
+            try:
+                self._safe_process_url_sync(url)
+                futures.append(
+                    (
+                        url,
+                        pool.submit(
+                            pool.load(
+                                url,
+                                self.playwright_timeout,
+                                self.evaluator.evaluate_async,
+                            )
+                        ),
+                    )
+                )
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.exception(f"Error loading {url}: {e}")
+                    continue
+                raise e
 
-            for url in self.urls:
-                try:
-                    self._safe_process_url_sync(url)
-                    page = browser.new_page()
-                    response = page.goto(url, timeout=self.playwright_timeout)
-                    if response is None:
-                        raise ValueError(f"page.goto() returned None for url {url}")
-
-                    text = self.evaluator.evaluate(page, browser, response)
-                    metadata = {"source": url}
-                    yield Document(page_content=text, metadata=metadata)
-                except Exception as e:
-                    if self.continue_on_failure:
-                        log.exception(f"Error loading {url}: {e}")
-                        continue
-                    raise e
-            browser.close()
+        for url, future in futures:
+            try:
+                text = future.result()
+                metadata = {"source": url}
+                yield Document(page_content=text, metadata=metadata)
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.exception(f"Error loading {url}: {e}")
+                    continue
+                raise e
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Safely load URLs asynchronously with support for remote browser."""
-        from playwright.async_api import async_playwright
+        pool = self._get_browser_pool()
 
-        async with async_playwright() as p:
-            # Use remote browser if ws_endpoint is provided, otherwise use local browser
-            if self.playwright_ws_url:
-                browser = await p.chromium.connect(self.playwright_ws_url)
-            else:
-                browser = await p.chromium.launch(
-                    headless=self.headless, proxy=self.proxy
+        futures = []
+        for url in self.urls:
+            try:
+                await self._safe_process_url(url)
+                futures.append(
+                    (
+                        url,
+                        asyncio.wrap_future(
+                            pool.submit(
+                                pool.load(
+                                    url,
+                                    self.playwright_timeout,
+                                    self.evaluator.evaluate_async,
+                                )
+                            )
+                        ),
+                    )
                 )
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.exception(f"Error loading {url}: {e}")
+                    continue
+                raise e
 
-            for url in self.urls:
-                try:
-                    await self._safe_process_url(url)
-                    page = await browser.new_page()
-                    response = await page.goto(url, timeout=self.playwright_timeout)
-                    if response is None:
-                        raise ValueError(f"page.goto() returned None for url {url}")
-
-                    text = await self.evaluator.evaluate_async(page, browser, response)
-                    metadata = {"source": url}
-                    yield Document(page_content=text, metadata=metadata)
-                except Exception as e:
-                    if self.continue_on_failure:
-                        log.exception(f"Error loading {url}: {e}")
-                        continue
-                    raise e
-            await browser.close()
+        for url, future in futures:
+            try:
+                text = await future
+                metadata = {"source": url}
+                yield Document(page_content=text, metadata=metadata)
+            except Exception as e:
+                if self.continue_on_failure:
+                    log.exception(f"Error loading {url}: {e}")
+                    continue
+                raise e
 
 
 class SafeWebBaseLoader(WebBaseLoader):
@@ -73,14 +73,15 @@ class SessionUserResponse(Token, UserResponse):
     permissions: Optional[dict] = None
 
 
-@router.get("/", response_model=SessionUserResponse)
-async def get_session_user(
-    request: Request, response: Response, user=Depends(get_current_user)
-):
-
+def get_session_user_data(
+    request: Request,
+    response: Response,
+    user,
+    user_permissions: Optional[dict] = None,
+) -> dict:
     auth_header = request.headers.get("Authorization")
     auth_token = get_http_authorization_cred(auth_header)
-    token = auth_token.credentials
+    token = auth_token.credentials if auth_token else request.cookies.get("token")
     data = decode_token(token)
 
     expires_at = None
@@ -108,9 +109,10 @@ async def get_session_user(
             secure=WEBUI_AUTH_COOKIE_SECURE,
         )
 
-    user_permissions = get_permissions(
-        user.id, request.app.state.config.USER_PERMISSIONS
-    )
+    if user_permissions is None:
+        user_permissions = get_permissions(
+            user.id, request.app.state.config.USER_PERMISSIONS
+        )
 
     return {
         "token": token,
@@ -125,6 +127,13 @@ async def get_session_user(
     }
 
 
+@router.get("/", response_model=SessionUserResponse)
+async def get_session_user(
+    request: Request, response: Response, user=Depends(get_current_user)
+):
+    return get_session_user_data(request, response, user)
+
+
 ############################
 # Update Profile
 ############################
@@ -19,9 +19,11 @@ from fastapi import (
     Query,
 )
 from fastapi.responses import FileResponse, StreamingResponse
+from open_webui.config import ENABLE_BACKGROUND_FILE_PROCESSING
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEX
 
 from open_webui.models.users import Users
 from open_webui.models.files import (
@@ -34,6 +36,13 @@ from open_webui.models.files import (
 from open_webui.routers.retrieval import ProcessFileForm, process_file
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
+from open_webui.models.ingestion_jobs import (
+    IngestionJobModel,
+    IngestionJobs,
+    IngestionJobStatus,
+)
+from open_webui.tasks import stop_task
+from open_webui.utils.ingestion import INGESTION_WORKER
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from pydantic import BaseModel
 
@@ -71,6 +80,43 @@ def has_access_to_file(
 ############################
 
 
+def get_file_processing_engine(
+    request: Request, content_type: Optional[str]
+) -> Optional[str]:
+    """
+    Return "audio" if the file should be transcribed, the content extraction
+    engine if it should be extracted, or None if it should not be processed.
+    """
+    engine = request.app.state.config.CONTENT_EXTRACTION_ENGINE or "default"
+
+    if not content_type:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        return engine
+
+    stt_supported_content_types = getattr(
+        request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+    )
+
+    if any(
+        fnmatch(content_type, supported_content_type)
+        for supported_content_type in (
+            stt_supported_content_types
+            if stt_supported_content_types
+            and any(t.strip() for t in stt_supported_content_types)
+            else ["audio/*", "video/webm"]
+        )
+    ):
+        return "audio"
+    elif (not content_type.startswith(("image/", "video/"))) or (
+        request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+    ):
+        return engine
+
+    return None
+
+
 @router.post("/", response_model=FileModelResponse)
 def upload_file(
     request: Request,
@@ -143,39 +189,29 @@ def upload_file(
         )
         if process:
             try:
-                if file.content_type:
-                    stt_supported_content_types = getattr(
-                        request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                    )
+                engine = get_file_processing_engine(request, file.content_type)
 
-                    if any(
-                        fnmatch(file.content_type, content_type)
-                        for content_type in (
-                            stt_supported_content_types
-                            if stt_supported_content_types
-                            and any(t.strip() for t in stt_supported_content_types)
-                            else ["audio/*", "video/webm"]
-                        )
-                    ):
-                        file_path = Storage.get_file(file_path)
-                        result = transcribe(request, file_path, file_metadata)
-
-                        process_file(
-                            request,
-                            ProcessFileForm(file_id=id, content=result.get("text", "")),
-                            user=user,
-                        )
-                    elif (not file.content_type.startswith(("image/", "video/"))) or (
-                        request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                    ):
-                        process_file(request, ProcessFileForm(file_id=id), user=user)
-                else:
-                    log.info(
-                        f"File type {file.content_type} is not provided, but trying to process anyway"
+                if engine and ENABLE_BACKGROUND_FILE_PROCESSING:
+                    # Return right away, progress is reported over "file-events"
+                    job = INGESTION_WORKER.enqueue(
+                        user.id, id, engine, {"transcribe": engine == "audio"}
+                    )
+                    file_item = FileModelResponse(
+                        **{**file_item.model_dump(), "job_id": job.id if job else None}
                     )
+                elif engine == "audio":
+                    file_path = Storage.get_file(file_path)
+                    result = transcribe(request, file_path, file_metadata)
+
+                    process_file(
+                        request,
+                        ProcessFileForm(file_id=id, content=result.get("text", "")),
+                        user=user,
+                    )
+                    file_item = Files.get_file_by_id(id=id)
+                elif engine:
                     process_file(request, ProcessFileForm(file_id=id), user=user)
-
-                file_item = Files.get_file_by_id(id=id)
+                    file_item = Files.get_file_by_id(id=id)
             except Exception as e:
                 log.exception(e)
                 log.error(f"Error processing file: {file_item.id}")
@@ -264,6 +300,58 @@ async def search_files(
     return matching_files
 
 
+############################
+# Processing Jobs
+############################
+
+
+@router.get("/jobs", response_model=list[IngestionJobModel])
+async def list_processing_jobs(
+    job_status: Optional[str] = Query(None, alias="status"),
+    user=Depends(get_verified_user),
+):
+    return IngestionJobs.get_jobs_by_user_id(user.id, status=job_status)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobModel)
+async def get_processing_job_by_id(job_id: str, user=Depends(get_verified_user)):
+    job = IngestionJobs.get_job_by_id(job_id)
+
+    if not job or (job.user_id != user.id and user.role != "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=IngestionJobModel)
+async def cancel_processing_job_by_id(
+    request: Request, job_id: str, user=Depends(get_verified_user)
+):
+    job = IngestionJobs.get_job_by_id(job_id)
+
+    if not job or (job.user_id != user.id and user.role != "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    # Pending jobs are cancelled in place, running ones through their task
+    if not IngestionJobs.cancel_job_by_id(job.id):
+        if job.status == IngestionJobStatus.RUNNING and job.task_id:
+            try:
+                await stop_task(request.app.state.redis, job.task_id)
+            except Exception as e:
+                log.warning(f"Failed to stop task {job.task_id}: {e}")
+                IngestionJobs.update_job_by_id(
+                    job.id, {"status": IngestionJobStatus.CANCELLED}
+                )
+
+    return IngestionJobs.get_job_by_id(job.id)
+
+
 ############################
 # Delete All Files
 ############################
@@ -276,6 +364,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            BM25_INDEX.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -598,7 +687,9 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
         if result:
             try:
                 Storage.delete_file(file.path)
-                VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                if VECTOR_DB_CLIENT.has_collection(collection_name=f"file-{id}"):
+                    VECTOR_DB_CLIENT.delete_collection(collection_name=f"file-{id}")
+                BM25_INDEX.drop(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
@@ -3,7 +3,15 @@ import logging
 from typing import Optional
 
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+    BackgroundTasks,
+)
 from pydantic import BaseModel
 
 from open_webui.socket.main import sio
@@ -20,6 +28,13 @@ from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.versions import (
+    VERSIONS,
+    get_etag,
+    get_not_modified_response,
+    is_not_modified,
+    set_etag_headers,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,7 +47,9 @@ router = APIRouter()
 
 
 @router.get("/", response_model=list[NoteFolderModel])
-async def get_note_folders(request: Request, user=Depends(get_verified_user)):
+async def get_note_folders(
+    request: Request, response: Response, user=Depends(get_verified_user)
+):
 
     if user.role != "admin" and not has_permission(
         user.id, "features.notes", request.app.state.config.USER_PERMISSIONS
@@ -42,6 +59,11 @@ async def get_note_folders(request: Request, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
+    etag = get_etag("note_folders", user.id, *VERSIONS.get(f"note_folders:{user.id}"))
+    if is_not_modified(request, etag):
+        return get_not_modified_response(etag)
+    set_etag_headers(response, etag)
+
     folders = NoteFolders.get_folders_by_user_id(user.id)
     return folders
 
@@ -3,14 +3,29 @@ import logging
 from typing import Optional
 
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+    BackgroundTasks,
+)
 from pydantic import BaseModel
 
 from open_webui.socket.main import sio
 
 
-from open_webui.models.users import Users, UserResponse
-from open_webui.models.notes import Notes, NoteModel, NoteForm, NoteUserResponse
+from open_webui.models.notes import (
+    Notes,
+    NoteModel,
+    NoteForm,
+    NotePatchForm,
+    NoteTitleIdResponse,
+    NoteUserResponse,
+    NoteVersionConflict,
+)
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
@@ -19,19 +34,39 @@ from open_webui.env import SRC_LOG_LEVELS
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access, has_permission
+from open_webui.utils.versions import (
+    VERSIONS,
+    get_etag,
+    get_not_modified_response,
+    is_not_modified,
+    set_etag_headers,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+PAGE_ITEM_COUNT = 60
+
 ############################
 # GetNotes
 ############################
 
 
+def get_page_range(page: Optional[int]) -> tuple[Optional[int], Optional[int]]:
+    # Without a page, everything is returned
+    if page is None:
+        return None, None
+
+    page = max(1, page)
+    return (page - 1) * PAGE_ITEM_COUNT, PAGE_ITEM_COUNT
+
+
 @router.get("/", response_model=list[NoteUserResponse])
-async def get_notes(request: Request, user=Depends(get_verified_user)):
+async def get_notes(
+    request: Request, page: Optional[int] = None, user=Depends(get_verified_user)
+):
 
     if user.role != "admin" and not has_permission(
         user.id, "features.notes", request.app.state.config.USER_PERMISSIONS
@@ -41,28 +76,19 @@ async def get_notes(request: Request, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    notes = [
-        NoteUserResponse(
-            **{
-                **note.model_dump(),
-                "user": UserResponse(**Users.get_user_by_id(note.user_id).model_dump()),
-            }
-        )
-        for note in Notes.get_notes_by_user_id(user.id, "write")
-    ]
-
-    return notes
-
-
-class NoteTitleIdResponse(BaseModel):
-    id: str
-    title: str
-    updated_at: int
-    created_at: int
+    skip, limit = get_page_range(page)
+    return Notes.get_notes_with_users_by_user_id(
+        user.id, "write", skip=skip, limit=limit
+    )
 
 
 @router.get("/list", response_model=list[NoteTitleIdResponse])
-async def get_note_list(request: Request, user=Depends(get_verified_user)):
+async def get_note_list(
+    request: Request,
+    response: Response,
+    page: Optional[int] = None,
+    user=Depends(get_verified_user),
+):
 
     if user.role != "admin" and not has_permission(
         user.id, "features.notes", request.app.state.config.USER_PERMISSIONS
@@ -72,12 +98,19 @@ async def get_note_list(request: Request, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    notes = [
-        NoteTitleIdResponse(**note.model_dump())
-        for note in Notes.get_notes_by_user_id(user.id, "write")
-    ]
+    # Shared notes show up through write grants to the user or their groups
+    etag = get_etag(
+        "notes",
+        user.id,
+        page,
+        *VERSIONS.get(f"notes:{user.id}", "notes:shared", "groups"),
+    )
+    if is_not_modified(request, etag):
+        return get_not_modified_response(etag)
+    set_etag_headers(response, etag)
 
-    return notes
+    skip, limit = get_page_range(page)
+    return Notes.get_note_titles_by_user_id(user.id, "write", skip=skip, limit=limit)
 
 
 ############################
@@ -187,6 +220,88 @@ async def update_note_by_id(
         )
 
 
+############################
+# PatchNoteById
+############################
+
+
+class NotePatchResponse(BaseModel):
+    id: str
+    version: int
+    updated_at: int
+
+
+@router.post("/{id}/patch", response_model=NotePatchResponse)
+async def patch_note_by_id(
+    request: Request, id: str, form_data: NotePatchForm, user=Depends(get_verified_user)
+):
+    """
+    Partial update for autosave: only changed fields are sent (data and meta
+    as JSON merge patches) and applied if the note is still at
+    form_data.version, otherwise 409. Other clients receive just the patch.
+    """
+    if user.role != "admin" and not has_permission(
+        user.id, "features.notes", request.app.state.config.USER_PERMISSIONS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.UNAUTHORIZED,
+        )
+
+    note = Notes.get_note_by_id(id)
+    if not note:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
+        )
+
+    if user.role != "admin" and (
+        user.id != note.user_id
+        and not has_access(user.id, type="write", access_control=note.access_control)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
+        )
+
+    try:
+        note = Notes.patch_note_by_id(id, form_data)
+    except NoteVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=ERROR_MESSAGES.NOTE_VERSION_CONFLICT,
+            headers={"X-Note-Version": str(e.version)},
+        )
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=ERROR_MESSAGES.DEFAULT()
+        )
+
+    if not note:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=ERROR_MESSAGES.NOT_FOUND
+        )
+
+    await sio.emit(
+        "note-events",
+        {
+            "type": "note:patch",
+            "data": {
+                "id": note.id,
+                "version": note.version,
+                "base_version": form_data.version,
+                "patch": form_data.model_dump(exclude_unset=True, exclude={"version"}),
+                "updated_at": note.updated_at,
+                "user_id": user.id,
+            },
+        },
+        to=f"note:{note.id}",
+    )
+
+    return NotePatchResponse(
+        id=note.id, version=note.version, updated_at=note.updated_at
+    )
+
+
 ############################
 # DeleteNoteById
 ############################
@@ -1,15 +1,19 @@
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import shutil
 import asyncio
+import itertools
+import time
 
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -21,8 +25,10 @@ from fastapi import (
     Request,
     status,
     APIRouter,
+    Query,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import tiktoken
@@ -38,6 +44,12 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector import reconciler as vector_reconciler
+from open_webui.retrieval.bm25 import BM25_INDEX
+from open_webui.retrieval.embedding_cache import (
+    EMBEDDING_CACHE,
+    QUERY_EMBEDDING_CACHE,
+)
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -92,6 +104,9 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_INGEST_BATCH_SIZE,
+    ENABLE_BACKGROUND_FILE_PROCESSING,
+    FILE_PROCESSING_BATCH_CONCURRENCY,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -249,6 +264,17 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
     }
 
 
+@router.get("/embedding/cache")
+async def get_embedding_cache_stats(user=Depends(get_admin_user)):
+    return {
+        "status": True,
+        "enabled": EMBEDDING_CACHE is not None,
+        "query_cache": (
+            QUERY_EMBEDDING_CACHE.get_stats() if QUERY_EMBEDDING_CACHE else None
+        ),
+    }
+
+
 class OpenAIConfigForm(BaseModel):
     url: str
     key: str
@@ -1108,6 +1134,93 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: Iterable[Document]) -> Iterator[Document]:
+    """
+    Lazily split documents into chunks, one source document at a time, so that
+    chunks can be embedded and inserted while later pages are still pending.
+    """
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        for doc in docs:
+            yield from text_splitter.split_documents([doc])
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                yield Document(
+                    page_content=split_chunk.page_content,
+                    metadata={**doc.metadata, "headings": headings_list},
+                )
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+def iter_batches(items: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        yield batch
+
+
+def get_chunk_id(namespace: str, text: str, occurrence: int) -> str:
+    """
+    Deterministic chunk id from the chunk content and its position among
+    identical chunks, so the same chunk keeps its id when text before it moves.
+    The namespace must change whenever the vectors would (e.g. the embedding
+    model), so stored chunks are never reused across models.
+    """
+    text_hash = hashlib.sha256(text.encode()).hexdigest()
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{namespace}:{text_hash}:{occurrence}"))
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1117,7 +1230,23 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    on_progress: Optional[Callable[[dict], None]] = None,
+    incremental: bool = False,
 ) -> bool:
+    """
+    Split, embed and insert documents as a bounded pipeline: chunks are pulled
+    from the splitter RAG_INGEST_BATCH_SIZE at a time, embedded, and inserted
+    before the next batch is split, so memory stays flat for large documents
+    and inserted chunks are searchable right away.
+
+    With incremental, the collection is synced to the documents instead: chunks
+    get deterministic ids, only chunks that are not stored yet are embedded and
+    upserted, stored chunks only get their metadata refreshed, and stored
+    chunks that no longer exist are deleted.
+
+    on_progress, if given, is called with {"stage", "chunks"} after each batch.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1139,7 +1268,7 @@ def save_docs_to_vector_db(
     )
 
     # Check if entries with the same hash (metadata.hash) already exist
-    if metadata and "hash" in metadata:
+    if metadata and "hash" in metadata and not incremental:
         result = VECTOR_DB_CLIENT.query(
             collection_name=collection_name,
             filter={"hash": metadata["hash"]},
@@ -1151,82 +1280,15 @@ def save_docs_to_vector_db(
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
-    if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
+    chunks = split_docs(request, docs) if split else iter(docs)
 
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
-
-    if len(docs) == 0:
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    chunks = itertools.chain([first_chunk], chunks)
 
-    texts = [doc.page_content for doc in docs]
-    metadatas = [
-        {
+    def _get_metadata(doc: Document) -> dict:
+        doc_metadata = {
             **doc.metadata,
             **(metadata if metadata else {}),
             "embedding_config": json.dumps(
@@ -1236,26 +1298,32 @@ def save_docs_to_vector_db(
                 }
             ),
         }
-        for doc in docs
-    ]
 
-    # ChromaDB does not like datetime formats
-    # for meta-data so convert them to string.
-    for metadata in metadatas:
-        for key, value in metadata.items():
+        # ChromaDB does not like datetime formats
+        # for meta-data so convert them to string.
+        for key, value in doc_metadata.items():
             if (
                 isinstance(value, datetime)
                 or isinstance(value, list)
                 or isinstance(value, dict)
             ):
-                metadata[key] = str(value)
+                doc_metadata[key] = str(value)
+        return doc_metadata
 
+    # Ids inserted by this call, removed again if it fails part way
+    inserted_ids = []
     try:
+        existing_metadatas = {}
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
             log.info(f"collection {collection_name} already exists")
 
-            if overwrite:
+            if incremental and not overwrite:
+                result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+                if result is not None and result.ids:
+                    existing_metadatas = dict(zip(result.ids[0], result.metadatas[0]))
+            elif overwrite:
                 VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                BM25_INDEX.drop(collection_name)
                 log.info(f"deleting existing collection {collection_name}")
             elif add is False:
                 log.info(
@@ -1294,30 +1362,139 @@ def save_docs_to_vector_db(
             ),
         )
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
+        total = 0
+        refreshed = 0
+        seen_ids = set()
+        occurrences = {}
+        for batch in iter_batches(chunks, RAG_INGEST_BATCH_SIZE):
+            if incremental:
+                ids = []
+                for doc in batch:
+                    key = (doc.metadata.get("file_id"), doc.page_content)
+                    occurrences[key] = occurrences.get(key, -1) + 1
+                    ids.append(
+                        get_chunk_id(
+                            f"{doc.metadata.get('file_id') or collection_name}:"
+                            f"{request.app.state.config.RAG_EMBEDDING_ENGINE}:"
+                            f"{request.app.state.config.RAG_EMBEDDING_MODEL}",
+                            doc.page_content,
+                            occurrences[key],
+                        )
+                    )
+                seen_ids.update(ids)
+
+                # Chunks already stored under the same id keep their vector,
+                # but their metadata (file hash, start_index...) may be stale
+                changed = []
+                stale = []
+                for id, doc in zip(ids, batch):
+                    if id not in existing_metadatas:
+                        changed.append((id, doc))
+                    elif existing_metadatas[id] != _get_metadata(doc):
+                        stale.append((id, doc))
+
+                if stale:
+                    stale_ids = [id for id, _ in stale]
+                    stale_metadatas = [_get_metadata(doc) for _, doc in stale]
+                    if VECTOR_DB_CLIENT.update_metadata(
+                        collection_name, stale_ids, stale_metadatas
+                    ):
+                        if not VECTOR_DB_CLIENT.native_keyword_search:
+                            BM25_INDEX.add(
+                                collection_name,
+                                ids=stale_ids,
+                                texts=[doc.page_content for _, doc in stale],
+                                metadatas=stale_metadatas,
+                            )
+                        refreshed += len(stale)
+                    else:
+                        # Upserted whole, the embedding cache spares the
+                        # embedding calls for them
+                        changed.extend(stale)
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+                ids = [id for id, _ in changed]
+                batch = [doc for _, doc in changed]
+                if not batch:
+                    continue
+            else:
+                ids = [str(uuid.uuid4()) for _ in batch]
 
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+            texts = [doc.page_content for doc in batch]
+            metadatas = [_get_metadata(doc) for doc in batch]
+
+            embeddings = embedding_function(
+                list(map(lambda x: x.replace("\n", " "), texts)),
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            )
+
+            items = [
+                {
+                    "id": ids[idx],
+                    "text": text,
+                    "vector": embeddings[idx],
+                    "metadata": metadatas[idx],
+                }
+                for idx, text in enumerate(texts)
+            ]
+
+            if incremental:
+                VECTOR_DB_CLIENT.upsert(
+                    collection_name=collection_name,
+                    items=items,
+                )
+            else:
+                VECTOR_DB_CLIENT.insert(
+                    collection_name=collection_name,
+                    items=items,
+                )
+                inserted_ids.extend(item["id"] for item in items)
+
+            # Keep the sparse index used by hybrid search in sync with the collection
+            if not VECTOR_DB_CLIENT.native_keyword_search:
+                BM25_INDEX.add(
+                    collection_name,
+                    ids=[item["id"] for item in items],
+                    texts=[item["text"] for item in items],
+                    metadatas=[item["metadata"] for item in items],
+                )
+
+            total += len(items)
+            log.debug(f"save_docs_to_vector_db: {total} chunks in {collection_name}")
+            if on_progress:
+                on_progress({"stage": "inserted", "chunks": total})
+
+        if incremental:
+            vanished_ids = list(existing_metadatas.keys() - seen_ids)
+            if vanished_ids:
+                VECTOR_DB_CLIENT.delete(
+                    collection_name=collection_name, ids=vanished_ids
+                )
+                BM25_INDEX.delete(collection_name, ids=vanished_ids)
+
+            log.info(
+                f"save_docs_to_vector_db: {total} chunks upserted, "
+                f"{refreshed} refreshed, {len(vanished_ids)} deleted, "
+                f"{len(seen_ids) - total - refreshed} unchanged in {collection_name}"
+            )
 
         return True
     except Exception as e:
         log.exception(e)
+
+        # Don't leave half a document behind (also when a job is cancelled).
+        # Incremental syncs upsert deterministic ids, a retry completes them.
+        if inserted_ids:
+            try:
+                VECTOR_DB_CLIENT.delete(
+                    collection_name=collection_name, ids=inserted_ids
+                )
+                BM25_INDEX.delete(collection_name, ids=inserted_ids)
+            except Exception as cleanup_error:
+                log.error(
+                    f"Failed to remove {len(inserted_ids)} partially inserted "
+                    f"chunks from {collection_name}: {cleanup_error}"
+                )
         raise e
 
 
@@ -1333,8 +1510,24 @@ def process_file(
     form_data: ProcessFileForm,
     user=Depends(get_verified_user),
 ):
+    return process_file_with_progress(request, form_data, user)
+
+
+def process_file_with_progress(
+    request: Request,
+    form_data: ProcessFileForm,
+    user,
+    on_progress: Optional[Callable[[dict], None]] = None,
+):
+    """
+    Extract, embed and store a file. on_progress, if given, is called with
+    {"stage", ...} as processing advances; background ingestion jobs use it to
+    report progress and to abort cancelled jobs by raising from the callback.
+    """
     try:
         file = Files.get_file_by_id(form_data.file_id)
+        if on_progress:
+            on_progress({"stage": "extracting"})
 
         collection_name = form_data.collection_name
 
@@ -1345,13 +1538,8 @@ def process_file(
             # Update the content in the file
             # Usage: /files/{file_id}/data/content/update, /files/ (audio file upload pipeline)
 
-            try:
-                # /files/{file_id}/data/content/update
-                VECTOR_DB_CLIENT.delete_collection(collection_name=f"file-{file.id}")
-            except:
-                # Audio file upload pipeline
-                pass
-
+            # The file-{id} collection is synced chunk by chunk below, so only
+            # changed chunks are embedded again
             docs = [
                 Document(
                     page_content=form_data.content.replace("<br/>", "\n"),
@@ -1431,10 +1619,10 @@ def process_file(
                     DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                     MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                 )
-                docs = loader.load(
-                    file.filename, file.meta.get("content_type"), file_path
-                )
-
+                # All pages are loaded before anything is stored: the file content
+                # and its hash (used for duplicate checks and in every chunk's
+                # metadata) need the full text. Splitting, embedding and insertion
+                # are then batched by save_docs_to_vector_db
                 docs = [
                     Document(
                         page_content=doc.page_content,
@@ -1446,7 +1634,9 @@ def process_file(
                             "source": file.filename,
                         },
                     )
-                    for doc in docs
+                    for doc in loader.lazy_load(
+                        file.filename, file.meta.get("content_type"), file_path
+                    )
                 ]
             else:
                 docs = [
@@ -1485,6 +1675,8 @@ def process_file(
                     },
                     add=(True if form_data.collection_name else False),
                     user=user,
+                    on_progress=on_progress,
+                    incremental=(collection_name == f"file-{file.id}"),
                 )
 
                 if result:
@@ -2196,6 +2388,8 @@ async def process_web_search(
                     request,
                     docs,
                     collection_name,
+                    # Lets the vector reconciler expire the collection
+                    metadata={"created_at": int(time.time())},
                     overwrite=True,
                     user=user,
                 )
@@ -2223,6 +2417,7 @@ class QueryDocForm(BaseModel):
     k_reranker: Optional[int] = None
     r: Optional[float] = None
     hybrid: Optional[bool] = None
+    hybrid_bm25_weight: Optional[float] = None
 
 
 @router.post("/query/doc")
@@ -2233,13 +2428,8 @@ def query_doc_handler(
 ):
     try:
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH:
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2266,7 +2456,6 @@ def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
-                user=user,
             )
         else:
             return query_doc(
@@ -2371,8 +2560,9 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 
             VECTOR_DB_CLIENT.delete(
                 collection_name=form_data.collection_name,
-                metadata={"hash": hash},
+                filter={"hash": hash},
             )
+            BM25_INDEX.delete(form_data.collection_name, filter={"hash": hash})
             return {"status": True}
         else:
             return {"status": False}
@@ -2384,9 +2574,20 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEX.reset()
     Knowledges.delete_all_knowledge()
 
 
+@router.get("/vector/gc")
+async def get_vector_gc_report(user=Depends(get_admin_user)):
+    return {"status": True, "report": vector_reconciler.LAST_REPORT}
+
+
+@router.post("/vector/gc")
+def run_vector_gc(dry_run: bool = Query(False), user=Depends(get_admin_user)):
+    return vector_reconciler.reconcile_vector_collections(dry_run=dry_run)
+
+
 @router.post("/reset/uploads")
 def reset_upload_dir(user=Depends(get_admin_user)) -> bool:
     folder = f"{UPLOAD_DIR}"
@@ -2441,20 +2642,46 @@ class BatchProcessFilesResponse(BaseModel):
 def process_files_batch(
     request: Request,
     form_data: BatchProcessFilesForm,
+    stream: bool = Query(False),
     user=Depends(get_verified_user),
 ) -> BatchProcessFilesResponse:
     """
     Process a batch of files and save them to the vector database.
+
+    Files are processed concurrently (FILE_PROCESSING_BATCH_CONCURRENCY) and
+    independently. With ?stream=true, per-file results are streamed as NDJSON
+    as soon as each file finishes.
     """
     results: List[BatchProcessFilesResult] = []
     errors: List[BatchProcessFilesResult] = []
     collection_name = form_data.collection_name
 
-    # Prepare all documents first
-    all_docs: List[Document] = []
-    for file in form_data.files:
+    if ENABLE_BACKGROUND_FILE_PROCESSING:
+        # Lazy import: the ingestion worker imports this router
+        from open_webui.utils.ingestion import INGESTION_WORKER
+
+        for file in form_data.files:
+            job = INGESTION_WORKER.enqueue(
+                user.id, file.id, "embedding", {"collection_name": collection_name}
+            )
+            if job:
+                results.append(
+                    BatchProcessFilesResult(file_id=file.id, status="queued")
+                )
+            else:
+                errors.append(
+                    BatchProcessFilesResult(
+                        file_id=file.id, status="failed", error="Failed to queue file"
+                    )
+                )
+        return BatchProcessFilesResponse(results=results, errors=errors)
+
+    def _process(file: FileModel) -> tuple[BatchProcessFilesResult, Optional[dict]]:
+        # Each file is embedded and inserted on its own, so a failure only
+        # affects that file
         try:
             text_content = file.data.get("content", "")
+            hash = calculate_sha256_string(text_content)
 
             docs: List[Document] = [
                 Document(
@@ -2469,45 +2696,51 @@ def process_files_batch(
                 )
             ]
 
-            hash = calculate_sha256_string(text_content)
-            Files.update_file_hash_by_id(file.id, hash)
-            Files.update_file_data_by_id(file.id, {"content": text_content})
-
-            all_docs.extend(docs)
-            results.append(BatchProcessFilesResult(file_id=file.id, status="prepared"))
-
-        except Exception as e:
-            log.error(f"process_files_batch: Error processing file {file.id}: {str(e)}")
-            errors.append(
-                BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e))
-            )
-
-    # Save all documents in one batch
-    if all_docs:
-        try:
             save_docs_to_vector_db(
                 request=request,
-                docs=all_docs,
+                docs=docs,
                 collection_name=collection_name,
                 add=True,
                 user=user,
             )
 
-            # Update all files with collection name
-            for result in results:
-                Files.update_file_metadata_by_id(
-                    result.file_id, {"collection_name": collection_name}
-                )
-                result.status = "completed"
-
+            return BatchProcessFilesResult(file_id=file.id, status="completed"), {
+                "hash": hash,
+                "data": {"content": text_content},
+                "meta": {"collection_name": collection_name},
+            }
         except Exception as e:
-            log.error(
-                f"process_files_batch: Error saving documents to vector DB: {str(e)}"
+            log.error(f"process_files_batch: Error processing file {file.id}: {str(e)}")
+            return (
+                BatchProcessFilesResult(file_id=file.id, status="failed", error=str(e)),
+                None,
             )
-            for result in results:
-                result.status = "failed"
-                errors.append(
-                    BatchProcessFilesResult(file_id=result.file_id, error=str(e))
-                )
+
+    def _iter_results() -> Iterator[BatchProcessFilesResult]:
+        updates = {}
+        try:
+            with ThreadPoolExecutor(
+                max_workers=FILE_PROCESSING_BATCH_CONCURRENCY
+            ) as executor:
+                futures = [executor.submit(_process, file) for file in form_data.files]
+                for future in as_completed(futures):
+                    result, update = future.result()
+                    if update:
+                        updates[result.file_id] = update
+                    yield result
+        finally:
+            # One transaction for all files instead of three commits per file
+            Files.update_files_by_ids(updates)
+
+    if stream:
+        return StreamingResponse(
+            (f"{result.model_dump_json()}\n" for result in _iter_results()),
+            media_type="application/x-ndjson",
+        )
+
+    for result in _iter_results():
+        results.append(result)
+        if result.status == "failed":
+            errors.append(result)
 
     return BatchProcessFilesResponse(results=results, errors=errors)
@@ -22,11 +22,18 @@ from open_webui.socket.main import (
 )
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 
 from open_webui.utils.auth import get_admin_user, get_password_hash, get_verified_user
 from open_webui.utils.access_control import get_permissions, has_permission
+from open_webui.utils.versions import (
+    VERSIONS,
+    get_etag,
+    get_not_modified_response,
+    is_not_modified,
+    set_etag_headers,
+)
 
 
 log = logging.getLogger(__name__)
@@ -48,7 +55,7 @@ async def get_active_users(
     Get a list of active users.
     """
     return {
-        "user_ids": get_active_user_ids(),
+        "user_ids": await get_active_user_ids(),
     }
 
 
@@ -107,7 +114,19 @@ async def get_user_groups(user=Depends(get_verified_user)):
 
 
 @router.get("/permissions")
-async def get_user_permissisions(request: Request, user=Depends(get_verified_user)):
+async def get_user_permissisions(
+    request: Request, response: Response, user=Depends(get_verified_user)
+):
+    etag = get_etag(
+        "permissions",
+        user.id,
+        request.app.state.config.get_version(),
+        *VERSIONS.get("groups"),
+    )
+    if is_not_modified(request, etag):
+        return get_not_modified_response(etag)
+    set_etag_headers(response, etag)
+
     user_permissions = get_permissions(
         user.id, request.app.state.config.USER_PERMISSIONS
     )
@@ -317,7 +336,7 @@ async def get_user_by_id(user_id: str, user=Depends(get_verified_user)):
             **{
                 "name": user.name,
                 "profile_image_url": user.profile_image_url,
-                "active": get_active_status_by_user_id(user_id),
+                "active": await get_active_status_by_user_id(user_id),
             }
         )
     else:
@@ -335,7 +354,7 @@ async def get_user_by_id(user_id: str, user=Depends(get_verified_user)):
 @router.get("/{user_id}/active", response_model=dict)
 async def get_user_active_status_by_id(user_id: str, user=Depends(get_verified_user)):
     return {
-        "active": get_user_active_status(user_id),
+        "active": await get_user_active_status(user_id),
     }
 
 
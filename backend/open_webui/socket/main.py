@@ -5,14 +5,15 @@ import socketio
 import logging
 import sys
 import time
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from redis import asyncio as aioredis
 import pycrdt as Y
 
+from open_webui.internal.db import run_in_db_threadpool
 from open_webui.models.users import Users, UserNameResponse
 from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
-from open_webui.models.notes import Notes, NoteUpdateForm
+from open_webui.models.notes import Notes, NoteModel, NoteUpdateForm
 from open_webui.utils.redis import (
     get_sentinels_from_env,
     get_sentinel_url_from_env,
@@ -25,10 +26,21 @@ from open_webui.env import (
     WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
+    WEBSOCKET_POOL_CACHE_TTL,
+    YDOC_COMPACTION_MAX_UPDATES,
+    YDOC_COMPACTION_MAX_BYTES,
+    YDOC_SAVE_DELAY,
+    YDOC_SAVE_MAX_DELAY,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
-from open_webui.tasks import create_task, stop_item_tasks
+from open_webui.socket.utils import (
+    AsyncDict,
+    AsyncRedisDict,
+    RedisLock,
+    YdocManager,
+    YdocSaveScheduler,
+)
+from open_webui.utils.prosemirror import get_prosemirror_json
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
 
@@ -91,18 +103,24 @@ if WEBSOCKET_MANAGER == "redis":
     redis_sentinels = get_sentinels_from_env(
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
-    SESSION_POOL = RedisDict(
+    SESSION_POOL = AsyncRedisDict(
         "open-webui:session_pool",
+        redis=REDIS,
+        cache_ttl=WEBSOCKET_POOL_CACHE_TTL,
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
     )
-    USER_POOL = RedisDict(
+    USER_POOL = AsyncRedisDict(
         "open-webui:user_pool",
+        redis=REDIS,
+        cache_ttl=WEBSOCKET_POOL_CACHE_TTL,
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
     )
-    USAGE_POOL = RedisDict(
+    USAGE_POOL = AsyncRedisDict(
         "open-webui:usage_pool",
+        redis=REDIS,
+        cache_ttl=WEBSOCKET_POOL_CACHE_TTL,
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
     )
@@ -117,16 +135,32 @@ if WEBSOCKET_MANAGER == "redis":
     renew_func = clean_up_lock.renew_lock
     release_func = clean_up_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
+    SESSION_POOL = AsyncDict()
+    USER_POOL = AsyncDict()
+    USAGE_POOL = AsyncDict()
 
     aquire_func = release_func = renew_func = lambda: True
 
 
+# Yjs updates are stored as raw bytes
+YDOC_REDIS = (
+    get_redis_connection(
+        redis_url=WEBSOCKET_REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
+        ),
+        async_mode=True,
+        decode_responses=False,
+    )
+    if WEBSOCKET_MANAGER == "redis"
+    else None
+)
+
 YDOC_MANAGER = YdocManager(
-    redis=REDIS,
+    redis=YDOC_REDIS,
     redis_key_prefix="open-webui:ydoc:documents",
+    max_updates=YDOC_COMPACTION_MAX_UPDATES,
+    max_bytes=YDOC_COMPACTION_MAX_BYTES,
 )
 
 
@@ -158,25 +192,20 @@ async def periodic_usage_pool_cleanup():
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
             now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
+            for model_id, connections in await USAGE_POOL.items():
                 # Creating a list of sids to remove if they have timed out
                 expired_sids = [
                     sid
                     for sid, details in connections.items()
                     if now - details["updated_at"] > TIMEOUT_DURATION
                 ]
+                if not expired_sids:
+                    continue
 
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
+                # Only drops the expired sids, usage recorded meanwhile is kept
+                if not await USAGE_POOL.remove_from_dict(model_id, *expired_sids):
                     log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
 
-                send_usage = True
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
         release_func()
@@ -188,24 +217,29 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_POOL.keys()
     return models_in_use
 
 
-def get_active_user_ids():
+async def get_active_user_ids():
     """Get the list of active user IDs."""
-    return list(USER_POOL.keys())
+    return await USER_POOL.keys()
 
 
-def get_user_active_status(user_id):
+def get_active_user_count():
+    """Number of active users, for sync callers outside the event loop."""
+    return len(USER_POOL.sync_keys())
+
+
+async def get_user_active_status(user_id):
     """Check if a user is currently active."""
-    return user_id in USER_POOL
+    return await USER_POOL.contains(user_id)
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
@@ -220,33 +254,32 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
-    active_user_ids = list(
-        set([SESSION_POOL.get(session_id)["id"] for session_id in active_session_ids])
-    )
+    sessions = await SESSION_POOL.get_many(active_session_ids)
+    active_user_ids = list(set([session["id"] for session in sessions.values()]))
     return active_user_ids
 
 
-def get_active_status_by_user_id(user_id):
-    if user_id in USER_POOL:
-        return True
-    return False
+async def get_active_status_by_user_id(user_id):
+    return await USER_POOL.contains(user_id)
+
+
+async def add_user_session(sid, user):
+    await SESSION_POOL.set(sid, user.model_dump())
+    await USER_POOL.add_to_list(user.id, sid)
 
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
+    if await SESSION_POOL.contains(sid):
         model_id = data["model"]
         # Record the timestamp for the last update
         current_time = int(time.time())
 
         # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_POOL.set_in_dict(model_id, sid, {"updated_at": current_time})
 
 
 @sio.event
@@ -256,14 +289,10 @@ async def connect(sid, environ, auth):
         data = decode_token(auth["token"])
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await run_in_db_threadpool(Users.get_user_by_id, data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            await add_user_session(sid, user)
 
 
 @sio.on("user-join")
@@ -277,18 +306,14 @@ async def user_join(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await run_in_db_threadpool(Users.get_user_by_id, data["id"])
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump()
-    if user.id in USER_POOL:
-        USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-    else:
-        USER_POOL[user.id] = [sid]
+    await add_user_session(sid, user)
 
     # Join all the channels
-    channels = Channels.get_channels_by_user_id(user.id)
+    channels = await run_in_db_threadpool(Channels.get_channels_by_user_id, user.id)
     log.debug(f"{channels=}")
     for channel in channels:
         await sio.enter_room(sid, f"channel:{channel.id}")
@@ -305,17 +330,37 @@ async def join_channel(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await run_in_db_threadpool(Users.get_user_by_id, data["id"])
     if not user:
         return
 
     # Join all the channels
-    channels = Channels.get_channels_by_user_id(user.id)
+    channels = await run_in_db_threadpool(Channels.get_channels_by_user_id, user.id)
     log.debug(f"{channels=}")
     for channel in channels:
         await sio.enter_room(sid, f"channel:{channel.id}")
 
 
+def get_note_with_access(
+    note_id: str, user_id: str, role: str, type: str = "read"
+) -> Optional[NoteModel]:
+    """Note lookup plus access check, run in the DB threadpool as one step."""
+    note = Notes.get_note_by_id(note_id)
+    if not note:
+        log.error(f"Note {note_id} not found")
+        return None
+
+    if (
+        role != "admin"
+        and user_id != note.user_id
+        and not has_access(user_id, type=type, access_control=note.access_control)
+    ):
+        log.error(f"User {user_id} does not have access to note {note_id}")
+        return None
+
+    return note
+
+
 @sio.on("join-note")
 async def join_note(sid, data):
     auth = data["auth"] if "auth" in data else None
@@ -326,21 +371,14 @@ async def join_note(sid, data):
     if token_data is None or "id" not in token_data:
         return
 
-    user = Users.get_user_by_id(token_data["id"])
+    user = await run_in_db_threadpool(Users.get_user_by_id, token_data["id"])
     if not user:
         return
 
-    note = Notes.get_note_by_id(data["note_id"])
+    note = await run_in_db_threadpool(
+        get_note_with_access, data["note_id"], user.id, user.role
+    )
     if not note:
-        log.error(f"Note {data['note_id']} not found for user {user.id}")
-        return
-
-    if (
-        user.role != "admin"
-        and user.id != note.user_id
-        and not has_access(user.id, type="read", access_control=note.access_control)
-    ):
-        log.error(f"User {user.id} does not have access to note {data['note_id']}")
         return
 
     log.debug(f"Joining note {note.id} for user {user.id}")
@@ -369,38 +407,54 @@ async def channel_events(sid, data):
                 "channel_id": data["channel_id"],
                 "message_id": data.get("message_id", None),
                 "data": event_data,
-                "user": UserNameResponse(**SESSION_POOL[sid]).model_dump(),
+                "user": UserNameResponse(**(await SESSION_POOL.get(sid))).model_dump(),
             },
             room=room,
         )
 
 
+def get_yjs_payload(payload) -> bytes:
+    """
+    Yjs updates arrive as binary attachments, older clients send them as
+    arrays of ints. Either way they are relayed and stored as bytes.
+    """
+    return bytes(payload)
+
+
+# Documents each session on this node joined, and whether it may write them.
+# Socket.IO pins a session to one node, so this never needs to be shared.
+YDOC_SESSION_DOCUMENTS: Dict[str, Dict[str, bool]] = {}
+
+
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
+    if not user:
+        return
 
     try:
         document_id = data["document_id"]
 
+        writable = True
         if document_id.startswith("note:"):
             note_id = document_id.split(":")[1]
-            note = Notes.get_note_by_id(note_id)
+            note = await run_in_db_threadpool(
+                get_note_with_access, note_id, user.get("id"), user.get("role")
+            )
             if not note:
-                log.error(f"Note {note_id} not found")
                 return
 
-            if (
-                user.get("role") != "admin"
-                and user.get("id") != note.user_id
-                and not has_access(
-                    user.get("id"), type="read", access_control=note.access_control
-                )
-            ):
-                log.error(
-                    f"User {user.get('id')} does not have access to note {note_id}"
+            writable = (
+                user.get("role") == "admin"
+                or user.get("id") == note.user_id
+                or await run_in_db_threadpool(
+                    has_access,
+                    user.get("id"),
+                    type="write",
+                    access_control=note.access_control,
                 )
-                return
+            )
 
         user_id = data.get("user_id", sid)
         user_name = data.get("user_name", "Anonymous")
@@ -411,22 +465,18 @@ async def ydoc_document_join(sid, data):
 
         # Join Socket.IO room
         await sio.enter_room(sid, f"doc_{document_id}")
+        YDOC_SESSION_DOCUMENTS.setdefault(sid, {})[document_id] = writable
 
         active_session_ids = get_session_ids_from_room(f"doc_{document_id}")
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
         # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        state_update = await YDOC_MANAGER.get_state(document_id)
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
+                # Sent as a binary attachment
+                "state": state_update,
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -452,25 +502,52 @@ async def ydoc_document_join(sid, data):
         await sio.emit("error", {"message": "Failed to join document"}, room=sid)
 
 
-async def document_save_handler(document_id, data, user):
-    if document_id.startswith("note:"):
-        note_id = document_id.split(":")[1]
-        note = Notes.get_note_by_id(note_id)
-        if not note:
-            log.error(f"Note {note_id} not found")
-            return
+def get_prosemirror_json_from_state(state: bytes) -> dict:
+    ydoc = Y.Doc()
+    ydoc.apply_update(state)
+    return get_prosemirror_json(ydoc)
 
-        if (
-            user.get("role") != "admin"
-            and user.get("id") != note.user_id
-            and not has_access(
-                user.get("id"), type="read", access_control=note.access_control
-            )
-        ):
-            log.error(f"User {user.get('id')} does not have access to note {note_id}")
-            return
 
-        Notes.update_note_by_id(note_id, NoteUpdateForm(data=data))
+async def save_document(document_id: str):
+    """Persist a collaborative document from its merged Yjs state."""
+    document_type, _, item_id = document_id.partition("_")
+    if document_type != "note":
+        return
+
+    # Never overwrite a note with the empty state of a cleared document
+    if not await YDOC_MANAGER.document_exists(document_id):
+        return
+
+    state = await YDOC_MANAGER.get_state(document_id)
+    content_json = await asyncio.to_thread(get_prosemirror_json_from_state, state)
+
+    note = await run_in_db_threadpool(Notes.get_note_by_id, item_id)
+    if not note:
+        return
+
+    # Only the ProseMirror JSON is held losslessly by the Y.Doc, the HTML and
+    # markdown are the ones the editor rendered
+    current = (note.data or {}).get("content") or {}
+    content = {
+        **current,
+        **(await YDOC_MANAGER.get_rendered(document_id)),
+        "json": content_json,
+    }
+    if content == current:
+        return
+
+    await run_in_db_threadpool(
+        Notes.update_note_by_id, item_id, NoteUpdateForm(data={"content": content})
+    )
+
+
+YDOC_SAVE_SCHEDULER = YdocSaveScheduler(
+    save_document,
+    redis=YDOC_REDIS,
+    redis_key_prefix="open-webui:ydoc:saves",
+    delay=YDOC_SAVE_DELAY,
+    max_delay=YDOC_SAVE_MAX_DELAY,
+)
 
 
 @sio.on("ydoc:document:state")
@@ -490,20 +567,15 @@ async def yjs_document_state(sid, data):
             log.warning(f"Document {document_id} not found")
             return
 
-        # Get the Yjs document state
-        ydoc = Y.Doc()
-        updates = await YDOC_MANAGER.get_updates(document_id)
-        for update in updates:
-            ydoc.apply_update(bytes(update))
-
         # Encode the entire document state as an update
-        state_update = ydoc.get_update()
+        state_update = await YDOC_MANAGER.get_state(document_id)
 
         await sio.emit(
             "ydoc:document:state",
             {
                 "document_id": document_id,
-                "state": list(state_update),  # Convert bytes to list for JSON
+                # Sent as a binary attachment
+                "state": state_update,
                 "sessions": active_session_ids,
             },
             room=sid,
@@ -518,19 +590,24 @@ async def yjs_document_update(sid, data):
     try:
         document_id = data["document_id"]
 
-        try:
-            await stop_item_tasks(REDIS, document_id)
-        except:
-            pass
+        # Only sessions that joined the document with write access may change
+        # it, everything they send ends up in the saved note
+        if not YDOC_SESSION_DOCUMENTS.get(sid, {}).get(document_id):
+            log.warning(f"Session {sid} cannot write document {document_id}")
+            return
 
         user_id = data.get("user_id", sid)
 
-        update = data["update"]  # List of bytes from frontend
+        update = get_yjs_payload(data["update"])
 
-        await YDOC_MANAGER.append_to_updates(
-            document_id=document_id,
-            update=update,  # Convert list of bytes to bytes
-        )
+        await YDOC_MANAGER.append_to_updates(document_id=document_id, update=update)
+
+        content = (data.get("data") or {}).get("content") or {}
+        rendered = {key: content[key] for key in ("html", "md") if key in content}
+        if rendered:
+            await YDOC_MANAGER.set_rendered(document_id, rendered)
+
+        await YDOC_SAVE_SCHEDULER.touch(document_id)
 
         # Broadcast update to all other users in the document
         await sio.emit(
@@ -545,15 +622,6 @@ async def yjs_document_update(sid, data):
             skip_sid=sid,
         )
 
-        async def debounced_save():
-            await asyncio.sleep(0.5)
-            await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
-            )
-
-        if data.get("data"):
-            await create_task(REDIS, debounced_save(), document_id)
-
     except Exception as e:
         log.error(f"Error in yjs_document_update: {e}")
 
@@ -572,6 +640,7 @@ async def yjs_document_leave(sid, data):
 
         # Leave Socket.IO room
         await sio.leave_room(sid, f"doc_{document_id}")
+        YDOC_SESSION_DOCUMENTS.get(sid, {}).pop(document_id, None)
 
         # Notify other users
         await sio.emit(
@@ -580,11 +649,9 @@ async def yjs_document_leave(sid, data):
             room=f"doc_{document_id}",
         )
 
-        if (
-            YDOC_MANAGER.document_exists(document_id)
-            and len(await YDOC_MANAGER.get_users(document_id)) == 0
-        ):
+        if len(await YDOC_MANAGER.get_users(document_id)) == 0:
             log.info(f"Cleaning up document {document_id} as no users are left")
+            await YDOC_SAVE_SCHEDULER.flush(document_id)
             await YDOC_MANAGER.clear_document(document_id)
 
     except Exception as e:
@@ -596,8 +663,11 @@ async def yjs_awareness_update(sid, data):
     """Handle awareness updates (cursors, selections, etc.)"""
     try:
         document_id = data["document_id"]
+        if document_id not in YDOC_SESSION_DOCUMENTS.get(sid, {}):
+            return
+
         user_id = data.get("user_id", sid)
-        update = data["update"]
+        update = get_yjs_payload(data["update"])
 
         # Broadcast awareness update to all other users in the document
         await sio.emit(
@@ -613,29 +683,68 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    YDOC_SESSION_DOCUMENTS.pop(sid, None)
 
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
+    user = await SESSION_POOL.get(sid)
+    if user:
+        await SESSION_POOL.delete(sid)
 
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
+        await USER_POOL.remove_from_list(user["id"], sid)
 
-        await YDOC_MANAGER.remove_user_from_all_documents(sid)
+        for document_id in await YDOC_MANAGER.remove_user_from_all_documents(sid):
+            log.info(f"Cleaning up document {document_id} as no users are left")
+            await YDOC_SAVE_SCHEDULER.flush(document_id)
+            await YDOC_MANAGER.clear_document(document_id)
     else:
         pass
         # print(f"Unknown session ID {sid} disconnected")
 
 
+def update_chat_message(request_info, event_data):
+    if "type" in event_data and event_data["type"] == "status":
+        Chats.add_message_status_to_chat_by_id_and_message_id(
+            request_info["chat_id"],
+            request_info["message_id"],
+            event_data.get("data", {}),
+        )
+
+    if "type" in event_data and event_data["type"] == "message":
+        message = Chats.get_message_by_id_and_message_id(
+            request_info["chat_id"],
+            request_info["message_id"],
+        )
+
+        if message:
+            content = message.get("content", "")
+            content += event_data.get("data", {}).get("content", "")
+
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                request_info["chat_id"],
+                request_info["message_id"],
+                {
+                    "content": content,
+                },
+            )
+
+    if "type" in event_data and event_data["type"] == "replace":
+        content = event_data.get("data", {}).get("content", "")
+
+        Chats.upsert_message_to_chat_by_id_and_message_id(
+            request_info["chat_id"],
+            request_info["message_id"],
+            {
+                "content": content,
+            },
+        )
+
+
 def get_event_emitter(request_info, update_db=True):
     async def __event_emitter__(event_data):
         user_id = request_info["user_id"]
 
         session_ids = list(
             set(
-                USER_POOL.get(user_id, [])
+                (await USER_POOL.get(user_id, []))
                 + (
                     [request_info.get("session_id")]
                     if request_info.get("session_id")
@@ -660,41 +769,7 @@ def get_event_emitter(request_info, update_db=True):
         await asyncio.gather(*emit_tasks)
 
         if update_db:
-            if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    event_data.get("data", {}),
-                )
-
-            if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                if message:
-                    content = message.get("content", "")
-                    content += event_data.get("data", {}).get("content", "")
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "content": content,
-                        },
-                    )
-
-            if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "content": content,
-                    },
-                )
+            await run_in_db_threadpool(update_chat_message, request_info, event_data)
 
     return __event_emitter__
 
@@ -716,3 +791,18 @@ def get_event_call(request_info):
 
 
 get_event_caller = get_event_call
+
+
+def get_user_event_emitter(user_id, event="events"):
+    """
+    Emit events to every session of a user, for work that is not tied to a chat
+    (e.g. background file processing).
+    """
+
+    async def __event_emitter__(event_data):
+        session_ids = list(set(await USER_POOL.get(user_id, [])))
+        await asyncio.gather(
+            *[sio.emit(event, event_data, to=session_id) for session_id in session_ids]
+        )
+
+    return __event_emitter__
@@ -1,9 +1,16 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
+from open_webui.env import SRC_LOG_LEVELS
 from open_webui.utils.redis import get_redis_connection
-from typing import Optional, List, Tuple
+from typing import Any, Awaitable, Callable, Iterable, Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
 
 class RedisLock:
     def __init__(self, redis_url, lock_name, timeout_secs, redis_sentinels=[]):
@@ -93,43 +100,511 @@ class RedisDict:
         return self[key]
 
 
+class AsyncDict:
+    """In-process pool with the AsyncRedisDict interface, for single-node setups."""
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key, default=None, cached: bool = True):
+        return self._data.get(key, default)
+
+    async def get_many(self, keys: Iterable[str]) -> dict:
+        return {key: self._data[key] for key in keys if key in self._data}
+
+    async def set(self, key, value):
+        self._data[key] = value
+
+    async def update(self, mapping: dict):
+        self._data.update(mapping)
+
+    async def delete(self, *keys) -> int:
+        return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    async def add_to_list(self, key, item):
+        items = self._data.setdefault(key, [])
+        if item not in items:
+            items.append(item)
+
+    async def remove_from_list(self, key, item) -> list:
+        items = [_item for _item in self._data.get(key, []) if _item != item]
+        if items:
+            self._data[key] = items
+        else:
+            self._data.pop(key, None)
+        return items
+
+    async def set_in_dict(self, key, field, value):
+        self._data.setdefault(key, {})[field] = value
+
+    async def remove_from_dict(self, key, *fields) -> dict:
+        values = self._data.get(key, {})
+        for field in fields:
+            values.pop(field, None)
+        if not values:
+            self._data.pop(key, None)
+        return values
+
+    async def contains(self, key) -> bool:
+        return key in self._data
+
+    async def keys(self) -> list:
+        return list(self._data.keys())
+
+    async def items(self) -> list:
+        return list(self._data.items())
+
+    def sync_keys(self) -> list:
+        return list(self._data.keys())
+
+
+# Atomic edits of a single item of a JSON list or dict stored in a pool
+# hash, so concurrent edits of the same key (e.g. two sessions of a user
+# connecting at once) cannot overwrite each other. Each returns the new value,
+# or false once it is empty and the key was deleted.
+POOL_ADD_TO_LIST_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+local items = raw and cjson.decode(raw) or {}
+for _, item in ipairs(items) do
+    if item == ARGV[2] then
+        return raw
+    end
+end
+table.insert(items, ARGV[2])
+raw = cjson.encode(items)
+redis.call('HSET', KEYS[1], ARGV[1], raw)
+return raw
+"""
+
+POOL_REMOVE_FROM_LIST_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then
+    return false
+end
+local items = {}
+for _, item in ipairs(cjson.decode(raw)) do
+    if item ~= ARGV[2] then
+        table.insert(items, item)
+    end
+end
+if #items == 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return false
+end
+raw = cjson.encode(items)
+redis.call('HSET', KEYS[1], ARGV[1], raw)
+return raw
+"""
+
+POOL_SET_IN_DICT_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+local values = raw and cjson.decode(raw) or {}
+values[ARGV[2]] = cjson.decode(ARGV[3])
+raw = cjson.encode(values)
+redis.call('HSET', KEYS[1], ARGV[1], raw)
+return raw
+"""
+
+POOL_REMOVE_FROM_DICT_SCRIPT = """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then
+    return false
+end
+local values = cjson.decode(raw)
+for index = 2, #ARGV do
+    values[ARGV[index]] = nil
+end
+if next(values) == nil then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return false
+end
+raw = cjson.encode(values)
+redis.call('HSET', KEYS[1], ARGV[1], raw)
+return raw
+"""
+
+
+class AsyncRedisDict:
+    """
+    Redis hash used as a pool shared by all nodes, through the async client.
+
+    Reads are served from a small local cache for up to cache_ttl seconds.
+    Every write publishes the changed keys on "{name}:invalidate" and every
+    node drops them from its cache, so the TTL only bounds staleness when a
+    message is lost (e.g. while the subscription reconnects). Multi-key
+    operations are pipelined into a single round-trip.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis,
+        cache_ttl: float = 5.0,
+        redis_url: Optional[str] = None,
+        redis_sentinels=[],
+    ):
+        self.name = name
+        self.redis = redis
+        self.cache_ttl = cache_ttl
+        self.channel = f"{name}:invalidate"
+
+        self._node_id = str(uuid.uuid4())
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+        # Only for sync callers outside the event loop (metrics exporters)
+        self._redis_url = redis_url
+        self._redis_sentinels = redis_sentinels
+        self._sync_redis = None
+
+    def _ensure_listener(self):
+        if self.cache_ttl <= 0:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                # Entries cached while unsubscribed may have missed updates
+                self._cache.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("node_id") == self._node_id:
+                        continue
+                    for key in data.get("keys", []):
+                        self._cache.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"Pool invalidation listener for {self.name} failed: {e}")
+                self._cache.clear()
+                await asyncio.sleep(1)
+
+    def _get_cached(self, key: str):
+        item = self._cache.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at > time.monotonic():
+                return True, value
+            del self._cache[key]
+        return False, None
+
+    def _set_cached(self, key: str, value):
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+
+    def _invalidate(self, pipe, keys: list[str]):
+        pipe.publish(self.channel, json.dumps({"node_id": self._node_id, "keys": keys}))
+
+    async def get(self, key, default=None, cached: bool = True):
+        """cached=False reads from Redis, for read-modify-write updates."""
+        self._ensure_listener()
+        found, value = self._get_cached(key) if cached else (False, None)
+        if not found:
+            raw = await self.redis.hget(self.name, key)
+            value = json.loads(raw) if raw is not None else None
+            self._set_cached(key, value)
+        return default if value is None else value
+
+    async def get_many(self, keys: Iterable[str]) -> dict:
+        self._ensure_listener()
+        result = {}
+        missing = []
+        for key in keys:
+            found, value = self._get_cached(key)
+            if found:
+                if value is not None:
+                    result[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            values = await self.redis.hmget(self.name, missing)
+            for key, raw in zip(missing, values):
+                value = json.loads(raw) if raw is not None else None
+                self._set_cached(key, value)
+                if value is not None:
+                    result[key] = value
+        return result
+
+    async def set(self, key, value):
+        await self.update({key: value})
+
+    async def update(self, mapping: dict):
+        if not mapping:
+            return
+        self._ensure_listener()
+        pipe = self.redis.pipeline()
+        pipe.hset(self.name, mapping={k: json.dumps(v) for k, v in mapping.items()})
+        self._invalidate(pipe, list(mapping.keys()))
+        await pipe.execute()
+        for key, value in mapping.items():
+            self._set_cached(key, value)
+
+    async def delete(self, *keys) -> int:
+        if not keys:
+            return 0
+        self._ensure_listener()
+        pipe = self.redis.pipeline()
+        pipe.hdel(self.name, *keys)
+        self._invalidate(pipe, list(keys))
+        result = await pipe.execute()
+        for key in keys:
+            self._set_cached(key, None)
+        return result[0]
+
+    async def _eval(self, script: str, key, *args):
+        self._ensure_listener()
+        pipe = self.redis.pipeline()
+        pipe.eval(script, 1, self.name, key, *args)
+        self._invalidate(pipe, [key])
+        raw = (await pipe.execute())[0]
+        value = json.loads(raw) if raw else None
+        self._set_cached(key, value)
+        return value
+
+    async def add_to_list(self, key, item: str):
+        await self._eval(POOL_ADD_TO_LIST_SCRIPT, key, item)
+
+    async def remove_from_list(self, key, item: str) -> list:
+        return await self._eval(POOL_REMOVE_FROM_LIST_SCRIPT, key, item) or []
+
+    async def set_in_dict(self, key, field: str, value):
+        await self._eval(POOL_SET_IN_DICT_SCRIPT, key, field, json.dumps(value))
+
+    async def remove_from_dict(self, key, *fields: str) -> dict:
+        if not fields:
+            return await self.get(key, {}, cached=False)
+        return await self._eval(POOL_REMOVE_FROM_DICT_SCRIPT, key, *fields) or {}
+
+    async def contains(self, key) -> bool:
+        return await self.get(key) is not None
+
+    async def keys(self) -> list:
+        return await self.redis.hkeys(self.name)
+
+    async def items(self) -> list:
+        items = await self.redis.hgetall(self.name)
+        return [(k, json.loads(v)) for k, v in items.items()]
+
+    def sync_keys(self) -> list:
+        if self._sync_redis is None:
+            self._sync_redis = get_redis_connection(
+                self._redis_url, self._redis_sentinels, decode_responses=True
+            )
+        return self._sync_redis.hkeys(self.name)
+
+
+# Reverse index entries of sessions that never disconnected cleanly (e.g. a
+# node crashed) expire after this many seconds
+YDOC_SESSION_INDEX_TTL = 24 * 60 * 60
+
+# Swap the compacted head of an update list for its snapshot, unless the list
+# was cleared or compacted by someone else since it was read. The size counter
+# keeps only the bytes appended since, so a large snapshot does not trigger
+# compaction again by itself.
+YDOC_COMPACT_SCRIPT = """
+if redis.call('LINDEX', KEYS[1], 0) ~= ARGV[2] then
+    return 0
+end
+redis.call('LTRIM', KEYS[1], tonumber(ARGV[3]), -1)
+local size = 0
+for _, update in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    size = size + #update
+end
+redis.call('SET', KEYS[2], size)
+redis.call('LPUSH', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def merge_updates(updates: List[bytes]) -> bytes:
+    """Merge Yjs updates into a single update holding the whole state."""
+    ydoc = Y.Doc()
+    for update in updates:
+        ydoc.apply_update(update)
+    return ydoc.get_update()
+
+
+def decode_member(member) -> str:
+    return member.decode() if isinstance(member, bytes) else member
+
+
 class YdocManager:
+    """
+    Yjs updates of the documents being edited, in Redis (shared by all nodes)
+    or in memory.
+
+    Updates are stored as raw bytes and compacted into a single snapshot once a
+    document has more than max_updates updates or max_bytes of them, so
+    loading a document costs the same whatever its edit history. In Redis a
+    lock keeps nodes from compacting the same document at once, and the swap
+    itself is a script that backs off if the list changed under it.
+
+    The Redis client must be created with decode_responses=False.
+    """
+
     def __init__(
         self,
         redis=None,
         redis_key_prefix: str = "open-webui:ydoc:documents",
+        redis_session_key_prefix: str = "open-webui:ydoc:sessions",
+        max_updates: int = 500,
+        max_bytes: int = 1024 * 1024,
     ):
         self._updates = {}
+        self._sizes = {}
+        self._rendered = {}
         self._users = {}
+        # Reverse index: session id -> ids of the documents it joined
+        self._sessions = {}
+        self._compacting = set()
         self._redis = redis
         self._redis_key_prefix = redis_key_prefix
+        self._redis_session_key_prefix = redis_session_key_prefix
+        self.max_updates = max_updates
+        self.max_bytes = max_bytes
+
+    def _get_session_key(self, user_id: str) -> str:
+        return f"{self._redis_session_key_prefix}:{user_id}:documents"
+
+    def _get_updates_key(self, document_id: str) -> str:
+        # Binary updates, separate from the JSON-encoded lists stored before
+        return f"{self._redis_key_prefix}:{document_id}:binary_updates"
+
+    def _get_size_key(self, document_id: str) -> str:
+        # Bytes appended since the last snapshot
+        return f"{self._redis_key_prefix}:{document_id}:size"
 
     async def append_to_updates(self, document_id: str, update: bytes):
         document_id = document_id.replace(":", "_")
+        update = bytes(update)
+
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.rpush(redis_key, json.dumps(list(update)))
+            pipe = self._redis.pipeline()
+            pipe.rpush(self._get_updates_key(document_id), update)
+            pipe.incrby(self._get_size_key(document_id), len(update))
+            count, size = await pipe.execute()
         else:
-            if document_id not in self._updates:
-                self._updates[document_id] = []
-            self._updates[document_id].append(update)
+            updates = self._updates.setdefault(document_id, [])
+            updates.append(update)
+            self._sizes[document_id] = self._sizes.get(document_id, 0) + len(update)
+            count, size = len(updates), self._sizes[document_id]
+
+        if count > self.max_updates or size > self.max_bytes:
+            self._schedule_compaction(document_id)
 
     async def get_updates(self, document_id: str) -> List[bytes]:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            updates = await self._redis.lrange(redis_key, 0, -1)
-            return [bytes(json.loads(update)) for update in updates]
+            return await self._redis.lrange(self._get_updates_key(document_id), 0, -1)
+        else:
+            return list(self._updates.get(document_id, []))
+
+    def _get_rendered_key(self, document_id: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}:rendered"
+
+    async def set_rendered(self, document_id: str, rendered: dict):
+        """
+        Keep the latest renderings (e.g. HTML, markdown) of a document a client
+        sent along with its updates. The Yjs state cannot be rendered
+        faithfully on the server.
+        """
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            await self._redis.set(
+                self._get_rendered_key(document_id),
+                json.dumps(rendered),
+                ex=YDOC_SESSION_INDEX_TTL,
+            )
+        else:
+            self._rendered[document_id] = rendered
+
+    async def get_rendered(self, document_id: str) -> dict:
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            rendered = await self._redis.get(self._get_rendered_key(document_id))
+            return json.loads(rendered) if rendered else {}
+        else:
+            return dict(self._rendered.get(document_id, {}))
+
+    async def get_state(self, document_id: str) -> bytes:
+        """The whole document as a single Yjs update."""
+        updates = await self.get_updates(document_id)
+        if len(updates) == 1:
+            return updates[0]
+        return await asyncio.to_thread(merge_updates, updates)
+
+    def _schedule_compaction(self, document_id: str):
+        if document_id in self._compacting:
+            return
+        self._compacting.add(document_id)
+
+        async def _compact():
+            try:
+                await self.compact(document_id)
+            except Exception as e:
+                log.error(f"Failed to compact document {document_id}: {e}")
+            finally:
+                self._compacting.discard(document_id)
+
+        asyncio.create_task(_compact())
+
+    async def compact(self, document_id: str) -> bool:
+        """Replace the stored updates of a document with one snapshot."""
+        document_id = document_id.replace(":", "_")
+
+        if self._redis:
+            lock_key = f"{self._redis_key_prefix}:{document_id}:compact_lock"
+            if not await self._redis.set(lock_key, b"1", nx=True, ex=30):
+                return False
+
+            try:
+                updates_key = self._get_updates_key(document_id)
+                updates = await self._redis.lrange(updates_key, 0, -1)
+                if len(updates) <= 1:
+                    return False
+
+                snapshot = await asyncio.to_thread(merge_updates, updates)
+                compacted = await self._redis.eval(
+                    YDOC_COMPACT_SCRIPT,
+                    2,
+                    updates_key,
+                    self._get_size_key(document_id),
+                    snapshot,
+                    updates[0],
+                    len(updates),
+                )
+                return bool(compacted)
+            finally:
+                await self._redis.delete(lock_key)
         else:
-            return self._updates.get(document_id, [])
+            updates = self._updates.get(document_id, [])
+            count = len(updates)
+            if count <= 1:
+                return False
+
+            snapshot = await asyncio.to_thread(merge_updates, updates[:count])
+            # Keep updates appended while merging, drop the merged ones
+            if self._updates.get(document_id) is not updates:
+                return False
+            updates[:count] = [snapshot]
+            self._sizes[document_id] = sum(len(update) for update in updates[1:])
+            return True
 
     async def document_exists(self, document_id: str) -> bool:
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            return await self._redis.exists(redis_key) > 0
+            return await self._redis.exists(self._get_updates_key(document_id)) > 0
         else:
             return document_id in self._updates
 
@@ -139,7 +614,7 @@ class YdocManager:
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:users"
             users = await self._redis.smembers(redis_key)
-            return list(users)
+            return [decode_member(user) for user in users]
         else:
             return self._users.get(document_id, [])
 
@@ -148,52 +623,236 @@ class YdocManager:
 
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.sadd(redis_key, user_id)
+            session_key = self._get_session_key(user_id)
+
+            pipe = self._redis.pipeline()
+            pipe.sadd(redis_key, user_id)
+            pipe.sadd(session_key, document_id)
+            pipe.expire(session_key, YDOC_SESSION_INDEX_TTL)
+            await pipe.execute()
         else:
             if document_id not in self._users:
                 self._users[document_id] = set()
             self._users[document_id].add(user_id)
+            self._sessions.setdefault(user_id, set()).add(document_id)
 
     async def remove_user(self, document_id: str, user_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
             redis_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.srem(redis_key, user_id)
+
+            pipe = self._redis.pipeline()
+            pipe.srem(redis_key, user_id)
+            pipe.srem(self._get_session_key(user_id), document_id)
+            await pipe.execute()
         else:
             if document_id in self._users and user_id in self._users[document_id]:
                 self._users[document_id].remove(user_id)
-
-    async def remove_user_from_all_documents(self, user_id: str):
+            self._sessions.get(user_id, set()).discard(document_id)
+
+    async def remove_user_from_all_documents(self, user_id: str) -> List[str]:
+        """
+        Remove a session from the documents it joined, found through the
+        reverse index. Returns the documents nobody is left in, for the caller
+        to persist and clear.
+        """
         if self._redis:
-            keys = await self._redis.keys(f"{self._redis_key_prefix}:*")
-            for key in keys:
-                if key.endswith(":users"):
-                    await self._redis.srem(key, user_id)
-
-                    document_id = key.split(":")[-2]
-                    if len(await self.get_users(document_id)) == 0:
-                        await self.clear_document(document_id)
-
+            session_key = self._get_session_key(user_id)
+            document_ids = [
+                decode_member(document_id)
+                for document_id in await self._redis.smembers(session_key)
+            ]
+
+            pipe = self._redis.pipeline()
+            for document_id in document_ids:
+                redis_key = f"{self._redis_key_prefix}:{document_id}:users"
+                pipe.srem(redis_key, user_id)
+                pipe.scard(redis_key)
+            pipe.delete(session_key)
+            results = await pipe.execute()
+
+            return [
+                document_id
+                for document_id, count in zip(document_ids, results[1:-1:2])
+                if count == 0
+            ]
         else:
-            for document_id in list(self._users.keys()):
-                if user_id in self._users[document_id]:
+            empty_document_ids = []
+            for document_id in self._sessions.pop(user_id, set()):
+                if user_id in self._users.get(document_id, set()):
                     self._users[document_id].remove(user_id)
                     if not self._users[document_id]:
                         del self._users[document_id]
-
-                        await self.clear_document(document_id)
+                        empty_document_ids.append(document_id)
+            return empty_document_ids
 
     async def clear_document(self, document_id: str):
         document_id = document_id.replace(":", "_")
 
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:{document_id}:updates"
-            await self._redis.delete(redis_key)
-            redis_users_key = f"{self._redis_key_prefix}:{document_id}:users"
-            await self._redis.delete(redis_users_key)
+            await self._redis.delete(
+                self._get_updates_key(document_id),
+                self._get_size_key(document_id),
+                self._get_rendered_key(document_id),
+                f"{self._redis_key_prefix}:{document_id}:users",
+                # JSON-encoded updates stored before they were binary
+                f"{self._redis_key_prefix}:{document_id}:updates",
+            )
         else:
             if document_id in self._updates:
                 del self._updates[document_id]
+            self._sizes.pop(document_id, None)
+            self._rendered.pop(document_id, None)
             if document_id in self._users:
                 del self._users[document_id]
+
+
+# Mark a save done. If the document was updated again since the saver read
+# it, keep it dirty, with the max delay counted from this save.
+YDOC_SAVE_DONE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'seq') == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+redis.call('HSET', KEYS[1], 'first', ARGV[2])
+return 0
+"""
+
+
+class YdocSaveScheduler:
+    """
+    Debounced persistence of collaborative documents.
+
+    Updates only mark their document dirty, a document is saved delay seconds
+    after its last update and at most max_delay seconds after its first
+    unsaved one. Each node runs a single timer per dirty document. In Redis the
+    dirty marks are shared and a lease elects the one node that saves a
+    document, so it is written once whichever nodes received its updates.
+
+    save(document_id) is called with the YdocManager form of the document id
+    and must persist the current merged state of the document.
+    """
+
+    def __init__(
+        self,
+        save: Callable[[str], Awaitable[None]],
+        redis=None,
+        redis_key_prefix: str = "open-webui:ydoc:saves",
+        delay: float = 1.0,
+        max_delay: float = 10.0,
+        lease: int = 30,
+    ):
+        self._save = save
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self.delay = delay
+        self.max_delay = max_delay
+        self.lease = lease
+
+        self._pending = {}
+        self._timers = {}
+        # Bumped after each dirty mark is written, see _run()
+        self._generations = {}
+
+    def _get_key(self, document_id: str) -> str:
+        return f"{self._redis_key_prefix}:{document_id}"
+
+    async def touch(self, document_id: str):
+        """Mark a document as changed."""
+        document_id = document_id.replace(":", "_")
+        now = time.time()
+
+        if self._redis:
+            key = self._get_key(document_id)
+            pipe = self._redis.pipeline()
+            pipe.hsetnx(key, "first", now)
+            pipe.hset(key, "last", now)
+            pipe.hincrby(key, "seq", 1)
+            pipe.expire(key, YDOC_SESSION_INDEX_TTL)
+            await pipe.execute()
+        else:
+            pending = self._pending.setdefault(document_id, {"first": now, "seq": 0})
+            pending["last"] = now
+            pending["seq"] += 1
+
+        self._generations[document_id] = self._generations.get(document_id, 0) + 1
+        if document_id not in self._timers:
+            self._timers[document_id] = asyncio.create_task(self._run(document_id))
+
+    async def _get_pending(self, document_id: str) -> Optional[dict]:
+        if self._redis:
+            values = await self._redis.hgetall(self._get_key(document_id))
+            if not values:
+                return None
+            return {
+                "first": float(values[b"first"]),
+                "last": float(values[b"last"]),
+                "seq": int(values[b"seq"]),
+            }
+        else:
+            pending = self._pending.get(document_id)
+            return dict(pending) if pending else None
+
+    async def _save_pending(self, document_id: str, pending: dict) -> bool:
+        if self._redis:
+            lock_key = f"{self._get_key(document_id)}:lock"
+            if not await self._redis.set(lock_key, b"1", nx=True, ex=self.lease):
+                # Another node is saving it
+                return False
+
+            try:
+                started_at = time.time()
+                await self._save(document_id)
+                await self._redis.eval(
+                    YDOC_SAVE_DONE_SCRIPT,
+                    1,
+                    self._get_key(document_id),
+                    pending["seq"],
+                    started_at,
+                )
+            finally:
+                await self._redis.delete(lock_key)
+        else:
+            started_at = time.time()
+            await self._save(document_id)
+            current = self._pending.get(document_id)
+            if current and current["seq"] == pending["seq"]:
+                del self._pending[document_id]
+            elif current:
+                current["first"] = started_at
+        return True
+
+    async def _run(self, document_id: str):
+        try:
+            while True:
+                generation = self._generations.get(document_id)
+                pending = await self._get_pending(document_id)
+                if pending is None:
+                    # A touch() that wrote its mark after the read above has
+                    # bumped the generation, keep going for it
+                    if self._generations.get(document_id) == generation:
+                        self._timers.pop(document_id, None)
+                        self._generations.pop(document_id, None)
+                        return
+                    continue
+
+                due = min(
+                    pending["last"] + self.delay, pending["first"] + self.max_delay
+                )
+                if due > time.time():
+                    await asyncio.sleep(due - time.time())
+                elif not await self._save_pending(document_id, pending):
+                    await asyncio.sleep(self.delay)
+        except Exception as e:
+            log.error(f"Failed to save document {document_id}: {e}")
+            self._timers.pop(document_id, None)
+            self._generations.pop(document_id, None)
+
+    async def flush(self, document_id: str):
+        """Save a document now if it has unsaved changes."""
+        document_id = document_id.replace(":", "_")
+
+        pending = await self._get_pending(document_id)
+        if pending is not None:
+            await self._save_pending(document_id, pending)
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import open_webui.models.notes as notes_module
+from open_webui.models.notes import (
+    Note,
+    NoteForm,
+    NotePatchForm,
+    NoteVersionConflict,
+    Notes,
+)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Note.__table__.create(engine)
+    # Same session settings as internal/db.py
+    SessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    )
+
+    @contextmanager
+    def get_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(notes_module, "get_db", get_db)
+    yield
+    engine.dispose()
+
+
+def test_patch_returns_the_patched_note(db):
+    note = Notes.insert_new_note(
+        NoteForm(title="Note", data={"content": {"md": "a"}}), "user"
+    )
+    assert note.version == 0
+
+    # Each patch is made against the version returned by the previous one
+    first = Notes.patch_note_by_id(
+        note.id, NotePatchForm(version=note.version, title="First")
+    )
+    assert first.version == 1
+    assert first.title == "First"
+
+    second = Notes.patch_note_by_id(
+        note.id,
+        NotePatchForm(version=first.version, data={"content": {"md": "b"}}),
+    )
+    assert second.version == 2
+    assert second.title == "First"
+    assert second.data == {"content": {"md": "b"}}
+
+    assert Notes.get_note_by_id(note.id).version == 2
+
+
+def test_patch_conflict_reports_the_current_version(db):
+    note = Notes.insert_new_note(NoteForm(title="Note"), "user")
+    Notes.patch_note_by_id(note.id, NotePatchForm(version=0, title="First"))
+
+    with pytest.raises(NoteVersionConflict) as e:
+        Notes.patch_note_by_id(note.id, NotePatchForm(version=0, title="Stale"))
+    assert e.value.version == 1
+    assert Notes.get_note_by_id(note.id).title == "First"
@@ -1,12 +1,55 @@
-from typing import Optional, Union, List, Dict, Any
+from contextvars import ContextVar
+from typing import Callable, Optional, Union, List, Dict, Any
 from open_webui.models.users import Users, UserModel
 from open_webui.models.groups import Groups
 
 
 from open_webui.config import DEFAULT_USER_PERMISSIONS
+from open_webui.utils.cache import PERMISSIONS_CACHE
 import json
 
 
+# Memo of the group ids and permissions resolved while handling a request,
+# set up for every HTTP request by a middleware in main.py
+PERMISSIONS_REQUEST_CACHE: ContextVar[Optional[dict]] = ContextVar(
+    "permissions_request_cache", default=None
+)
+
+
+def get_cached(key: str, resolve: Callable[[], Any]) -> Any:
+    """
+    Resolve a value once per request, and across requests once per
+    PERMISSIONS_CACHE TTL. Group and config updates invalidate the latter.
+    """
+    request_cache = PERMISSIONS_REQUEST_CACHE.get()
+    if request_cache is not None and key in request_cache:
+        return request_cache[key]
+
+    value = PERMISSIONS_CACHE.get(key)
+    if value is None:
+        value = resolve()
+        PERMISSIONS_CACHE.set(key, value)
+
+    if request_cache is not None:
+        request_cache[key] = value
+    return value
+
+
+def get_user_group_ids(user_id: str) -> List[str]:
+    return get_cached(
+        f"group_ids:{user_id}", lambda: Groups.get_group_ids_by_member_id(user_id)
+    )
+
+
+def get_user_group_permissions(user_id: str) -> List[Dict[str, Any]]:
+    return get_cached(
+        f"group_permissions:{user_id}",
+        lambda: [
+            group.permissions or {} for group in Groups.get_groups_by_member_id(user_id)
+        ],
+    )
+
+
 def fill_missing_permissions(
     permissions: Dict[str, Any], default_permissions: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -33,6 +76,8 @@ def get_permissions(
     Get all permissions for a user by combining the permissions of all groups the user is a member of.
     If a permission is defined in multiple groups, the most permissive value is used (True > False).
     Permissions are nested in a dict with the permission key as the key and a boolean as the value.
+
+    The result is cached and shared, callers must not modify it.
     """
 
     def combine_permissions(
@@ -53,19 +98,24 @@ def get_permissions(
                     )  # Use the most permissive value (True > False)
         return permissions
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
+    def resolve_permissions() -> tuple[Dict[str, Any], Dict[str, Any]]:
+        # Deep copy default permissions to avoid modifying the original dict
+        permissions = json.loads(json.dumps(default_permissions))
 
-    # Deep copy default permissions to avoid modifying the original dict
-    permissions = json.loads(json.dumps(default_permissions))
+        # Combine permissions from all user groups
+        for group_permissions in get_user_group_permissions(user_id):
+            permissions = combine_permissions(permissions, group_permissions)
 
-    # Combine permissions from all user groups
-    for group in user_groups:
-        group_permissions = group.permissions or {}
-        permissions = combine_permissions(permissions, group_permissions)
+        # Ensure all fields from default_permissions are present and filled in
+        permissions = fill_missing_permissions(permissions, default_permissions)
 
-    # Ensure all fields from default_permissions are present and filled in
-    permissions = fill_missing_permissions(permissions, default_permissions)
+        return default_permissions, permissions
 
+    # Cached along with the defaults they were merged with, a config update
+    # replaces the defaults object
+    defaults, permissions = get_cached(f"permissions:{user_id}", resolve_permissions)
+    if defaults is not default_permissions:
+        defaults, permissions = resolve_permissions()
     return permissions
 
 
@@ -93,10 +143,7 @@ def has_permission(
     permission_hierarchy = permission_key.split(".")
 
     # Retrieve user group permissions
-    user_groups = Groups.get_groups_by_member_id(user_id)
-
-    for group in user_groups:
-        group_permissions = group.permissions
+    for group_permissions in get_user_group_permissions(user_id):
         if get_permission(group_permissions, permission_hierarchy):
             return True
 
@@ -111,12 +158,13 @@ def has_access(
     user_id: str,
     type: str = "write",
     access_control: Optional[dict] = None,
+    user_group_ids: Optional[List[str]] = None,
 ) -> bool:
     if access_control is None:
         return type == "read"
 
-    user_groups = Groups.get_groups_by_member_id(user_id)
-    user_group_ids = [group.id for group in user_groups]
+    if user_group_ids is None:
+        user_group_ids = get_user_group_ids(user_id)
     permission_access = access_control.get(type, {})
     permitted_group_ids = permission_access.get("group_ids", [])
     permitted_user_ids = permission_access.get("user_ids", [])
@@ -139,9 +187,9 @@ def get_users_with_access(
 
     user_ids_with_access = set(permitted_user_ids)
 
-    for group_id in permitted_group_ids:
-        group_user_ids = Groups.get_group_user_ids_by_id(group_id)
-        if group_user_ids:
-            user_ids_with_access.update(group_user_ids)
+    for group_user_ids in Groups.get_user_ids_by_group_ids(
+        permitted_group_ids
+    ).values():
+        user_ids_with_access.update(group_user_ids)
 
     return Users.get_users_by_user_ids(list(user_ids_with_access))
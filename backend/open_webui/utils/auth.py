@@ -15,7 +15,7 @@ from typing import Optional, Union, List, Dict
 
 from opentelemetry import trace
 
-from open_webui.models.users import Users
+from open_webui.models.users import Users, UserModel
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import (
@@ -26,6 +26,9 @@ from open_webui.env import (
     WEBUI_AUTH_TRUSTED_EMAIL_HEADER,
 )
 
+from open_webui.utils.cache import USERS_CACHE
+from open_webui.utils.last_active import LAST_ACTIVE_TRACKER
+
 from fastapi import BackgroundTasks, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
@@ -162,6 +165,36 @@ def get_http_authorization_cred(auth_header: Optional[str]):
         return None
 
 
+def get_cached_user_by_id(id: str) -> Optional[UserModel]:
+    user = USERS_CACHE.get(f"id:{id}")
+    if user is None:
+        user = Users.get_user_by_id(id)
+        if user is None:
+            return None
+        USERS_CACHE.set(f"id:{id}", user)
+
+    # Callers may modify the user they get
+    return user.model_copy(deep=True)
+
+
+def get_cached_user_by_api_key(api_key: str) -> Optional[UserModel]:
+    # API keys are cached by hash only, mapped to the id of their user
+    key = f"api_key:{hashlib.sha256(api_key.encode()).hexdigest()}"
+
+    id = USERS_CACHE.get(key)
+    if id is not None:
+        user = get_cached_user_by_id(id)
+        # The key may have been regenerated or deleted since
+        if user and user.api_key and hmac.compare_digest(user.api_key, api_key):
+            return user
+
+    user = Users.get_user_by_api_key(api_key)
+    if user is not None:
+        USERS_CACHE.set(key, user.id)
+        USERS_CACHE.set(f"id:{user.id}", user.model_copy(deep=True))
+    return user
+
+
 def get_current_user(
     request: Request,
     response: Response,
@@ -226,7 +259,7 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = get_cached_user_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -256,10 +289,8 @@ def get_current_user(
                 current_span.set_attribute("client.user.role", user.role)
                 current_span.set_attribute("client.auth.type", "jwt")
 
-            # Refresh the user's last active timestamp asynchronously
-            # to prevent blocking the request
-            if background_tasks:
-                background_tasks.add_task(Users.update_user_last_active_by_id, user.id)
+            # Buffered and written in bulk
+            LAST_ACTIVE_TRACKER.record(user.id)
         return user
     else:
         raise HTTPException(
@@ -269,7 +300,7 @@ def get_current_user(
 
 
 def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+    user = get_cached_user_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -285,7 +316,7 @@ def get_current_user_by_api_key(api_key: str):
             current_span.set_attribute("client.user.role", user.role)
             current_span.set_attribute("client.auth.type", "api_key")
 
-        Users.update_user_last_active_by_id(user.id)
+        LAST_ACTIVE_TRACKER.record(user.id)
 
     return user
 
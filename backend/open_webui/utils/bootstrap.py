@@ -0,0 +1,30 @@
+import hashlib
+import logging
+
+from open_webui.config import BOOTSTRAP_CACHE_SIZE, BOOTSTRAP_CACHE_TTL
+from open_webui.env import SRC_LOG_LEVELS
+from open_webui.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+def get_bootstrap_cache_key(user, *versions) -> str:
+    """
+    Key a bootstrap payload by user and the versions of everything else it is
+    built from (config, models, groups). The user part hashes the fields the
+    payload depends on, so profile, role and settings updates miss the cache
+    even though they do not bump updated_at.
+    """
+    user_hash = hashlib.sha256(
+        user.model_dump_json(
+            include={"name", "email", "role", "profile_image_url", "settings"}
+        ).encode()
+    ).hexdigest()
+    return f"{user.id}:{user_hash}:{':'.join(str(version) for version in versions)}"
+
+
+# Per-user part of /api/bootstrap (permissions, settings, config and models).
+# The key holds the versions of what an entry was built from, so changes miss
+# the cache right away.
+BOOTSTRAP_CACHE = TTLCache(BOOTSTRAP_CACHE_TTL, BOOTSTRAP_CACHE_SIZE)
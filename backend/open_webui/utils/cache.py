@@ -0,0 +1,164 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from open_webui.env import (
+    PERMISSION_CACHE_SIZE,
+    PERMISSION_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def size(self) -> int:
+        return len(self._items)
+
+    def _drop(self, keys: Optional[list[str]]):
+        with self._lock:
+            if keys is None:
+                self._items.clear()
+            else:
+                for key in keys:
+                    self._items.pop(key, None)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.ttl <= 0:
+            return default
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._items.move_to_end(key)
+                    return value
+                del self._items[key]
+        return default
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys, or everything when called without keys."""
+        self._drop(list(keys) if keys else None)
+
+
+class InvalidatedTTLCache(TTLCache):
+    """
+    TTLCache whose invalidations reach every node.
+
+    Entries are only ever stored locally. With Redis configured, invalidate()
+    also publishes the invalidated keys on "{prefix}:cache:{name}:invalidate"
+    and every node drops them from its own copy, so a node serves stale data
+    at most until the message arrives (or the TTL runs out if Redis is down).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_size: int,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_key_prefix: str = "open-webui",
+    ):
+        super().__init__(ttl, max_size)
+        self.name = name
+
+        self._redis = None
+        self._channel = f"{redis_key_prefix}:cache:{name}:invalidate"
+        if redis_url and ttl > 0:
+            self._redis = get_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+
+        self._pubsub_thread = None
+
+    def _subscribe(self):
+        # Lazily, so importing the module does not connect to Redis
+        if self._redis is None or self._pubsub_thread is not None:
+            return
+
+        with self._lock:
+            if self._pubsub_thread is not None:
+                return
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self._channel: self._on_invalidate})
+                self._pubsub_thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+            except Exception as e:
+                log.error(f"Failed to subscribe to {self._channel}: {e}")
+
+    def _on_invalidate(self, message):
+        try:
+            keys = json.loads(message["data"])
+        except Exception:
+            return
+        self._drop(keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._subscribe()
+        return super().get(key, default)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys, or everything when called without keys."""
+        keys = list(keys) if keys else None
+        self._drop(keys)
+
+        if self._redis:
+            try:
+                self._redis.publish(self._channel, json.dumps(keys))
+            except Exception as e:
+                log.error(f"Failed to publish invalidation of {self.name}: {e}")
+
+
+def get_invalidated_ttl_cache(
+    name: str, ttl: float, max_size: int
+) -> InvalidatedTTLCache:
+    return InvalidatedTTLCache(
+        name,
+        ttl,
+        max_size,
+        redis_url=REDIS_URL,
+        redis_sentinels=get_sentinels_from_env(
+            REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+        ),
+        redis_key_prefix=REDIS_KEY_PREFIX,
+    )
+
+
+# Group ids and merged permissions of users, see utils/access_control.py
+PERMISSIONS_CACHE = get_invalidated_ttl_cache(
+    "permissions", PERMISSION_CACHE_TTL, PERMISSION_CACHE_SIZE
+)
+
+# Authenticated users by id and hashed API key, see utils/auth.py
+USERS_CACHE = get_invalidated_ttl_cache("users", USER_CACHE_TTL, USER_CACHE_SIZE)
@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from open_webui.config import (
+    FILE_PROCESSING_CONCURRENCY,
+    FILE_PROCESSING_ENGINE_CONCURRENCY,
+    FILE_PROCESSING_MAX_RETRIES,
+    FILE_PROCESSING_POLL_INTERVAL,
+    FILE_PROCESSING_STALE_TIMEOUT,
+)
+from open_webui.env import INSTANCE_ID, SRC_LOG_LEVELS
+from open_webui.internal.db import run_in_db_threadpool
+from open_webui.models.files import Files
+from open_webui.models.ingestion_jobs import (
+    IngestionJobForm,
+    IngestionJobModel,
+    IngestionJobs,
+    IngestionJobStatus,
+)
+from open_webui.models.users import Users
+from open_webui.routers.audio import transcribe
+from open_webui.routers.retrieval import ProcessFileForm, process_file_with_progress
+from open_webui.socket.main import get_user_event_emitter
+from open_webui.storage.provider import Storage
+from open_webui.tasks import create_task
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class IngestionCancelled(Exception):
+    pass
+
+
+def get_job_event(job: IngestionJobModel, **updated) -> dict:
+    return {
+        "type": "file:processing",
+        "data": {
+            "job_id": job.id,
+            "file_id": job.file_id,
+            "status": job.status,
+            "progress": job.progress,
+            "error": job.error,
+            **updated,
+        },
+    }
+
+
+class IngestionWorker:
+    """
+    Runs file extraction and embedding as background jobs.
+
+    Jobs are rows in the ingestion_job table, so the queue survives restarts and
+    is shared by all nodes: each node polls for runnable jobs and claims them
+    with an atomic status update. Each job runs as a task from open_webui.tasks,
+    so a running job can be cancelled with stop_task (also across nodes through
+    Redis), or by marking it cancelled in the table, which the node running it
+    notices on its next heartbeat. Concurrency is limited per engine on each
+    node, failed jobs are retried with exponential backoff, and progress is
+    pushed to the owner's sessions as "file-events" over Socket.IO.
+    """
+
+    def __init__(self):
+        self.app: Optional[FastAPI] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Jobs keep their slot until their processing thread has exited
+        self._running: dict[str, IngestionJobModel] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
+
+    def _get_engine_limit(self, engine: str) -> int:
+        return max(
+            1,
+            int(
+                FILE_PROCESSING_ENGINE_CONCURRENCY.get(
+                    engine, FILE_PROCESSING_CONCURRENCY
+                )
+            ),
+        )
+
+    def _get_engine_count(self, engine: str) -> int:
+        return sum(1 for job in self._running.values() if job.engine == engine)
+
+    def _get_request(self) -> Request:
+        # Processing functions only need the app (config, embedding function)
+        return Request(
+            {
+                "type": "http",
+                "asgi.version": "3.0",
+                "asgi.spec_version": "2.0",
+                "method": "POST",
+                "path": "/internal/ingestion",
+                "query_string": b"",
+                "headers": Headers({}).raw,
+                "client": ("127.0.0.1", 12345),
+                "server": ("127.0.0.1", 80),
+                "scheme": "http",
+                "app": self.app,
+            }
+        )
+
+    def enqueue(
+        self, user_id: str, file_id: str, engine: str, data: Optional[dict] = None
+    ) -> Optional[IngestionJobModel]:
+        job = IngestionJobs.insert_new_job(
+            user_id, IngestionJobForm(file_id=file_id, engine=engine, data=data or {})
+        )
+
+        # Enqueue is usually called from a threadpool (sync endpoints)
+        if job and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job
+
+    async def start(self, app: FastAPI):
+        self.app = app
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+        while True:
+            try:
+                await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.exception(f"Error polling ingestion jobs: {e}")
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=FILE_PROCESSING_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stop(self):
+        # Let another node (or this one after a restart) pick up interrupted jobs
+        count = IngestionJobs.requeue_running_jobs_by_instance_id(INSTANCE_ID)
+        if count:
+            log.info(f"Requeued {count} interrupted ingestion jobs")
+
+    async def _poll(self):
+        # Heartbeat for the jobs running here, then recover jobs from dead nodes
+        for job_id in list(self._running.keys()):
+            job = await run_in_db_threadpool(IngestionJobs.update_job_by_id, job_id, {})
+            if job and job.status != IngestionJobStatus.RUNNING:
+                # Cancelled from a node that could not reach the task
+                cancelled = self._cancel_events.get(job_id)
+                if cancelled is not None:
+                    cancelled.set()
+        await run_in_db_threadpool(
+            IngestionJobs.requeue_stale_running_jobs,
+            int(time.time()) - FILE_PROCESSING_STALE_TIMEOUT,
+        )
+
+        jobs = await run_in_db_threadpool(
+            IngestionJobs.get_runnable_jobs, FILE_PROCESSING_CONCURRENCY * 4
+        )
+        for job in jobs:
+            if self._get_engine_count(job.engine) >= self._get_engine_limit(job.engine):
+                continue
+
+            if not await run_in_db_threadpool(
+                IngestionJobs.claim_job_by_id, job.id, INSTANCE_ID
+            ):
+                continue
+
+            self._running[job.id] = job
+            task_id, _ = await create_task(
+                self.app.state.redis, self._run_job(job), id=f"ingestion:{job.id}"
+            )
+            await run_in_db_threadpool(
+                IngestionJobs.update_job_by_id, job.id, {"task_id": task_id}
+            )
+
+    def _process(self, job: IngestionJobModel, on_progress) -> dict:
+        request = self._get_request()
+        user = Users.get_user_by_id(job.user_id)
+        data = job.data or {}
+
+        content = data.get("content")
+        if data.get("transcribe"):
+            on_progress({"stage": "transcribing"})
+            file = Files.get_file_by_id(job.file_id)
+            result = transcribe(
+                request, Storage.get_file(file.path), file.meta.get("data", {})
+            )
+            content = result.get("text", "")
+
+        return process_file_with_progress(
+            request,
+            ProcessFileForm(
+                file_id=job.file_id,
+                content=content,
+                collection_name=data.get("collection_name"),
+            ),
+            user,
+            on_progress=on_progress,
+        )
+
+    def _release(self, job_id: str, processing: Optional[asyncio.Future] = None):
+        if processing is not None and not processing.cancelled():
+            # Retrieve the error (usually IngestionCancelled), nobody awaits it
+            processing.exception()
+
+        self._running.pop(job_id, None)
+        self._cancel_events.pop(job_id, None)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run_job(self, job: IngestionJobModel):
+        loop = asyncio.get_running_loop()
+        emit = get_user_event_emitter(job.user_id, "file-events")
+        cancelled = threading.Event()
+        self._cancel_events[job.id] = cancelled
+
+        def on_progress(progress: dict):
+            # Called from the processing thread
+            if cancelled.is_set():
+                raise IngestionCancelled()
+            IngestionJobs.update_job_by_id(job.id, {"progress": progress})
+            asyncio.run_coroutine_threadsafe(
+                emit(
+                    get_job_event(
+                        job, status=IngestionJobStatus.RUNNING, progress=progress
+                    )
+                ),
+                loop,
+            )
+
+        # Cancelling the task does not stop the thread, keep a handle on it
+        processing = None
+        try:
+            await emit(get_job_event(job, status=IngestionJobStatus.RUNNING))
+            processing = asyncio.ensure_future(
+                run_in_threadpool(self._process, job, on_progress)
+            )
+            await asyncio.shield(processing)
+
+            # Unless the job was cancelled meanwhile
+            updated = await run_in_db_threadpool(
+                IngestionJobs.update_running_job_by_id,
+                job.id,
+                INSTANCE_ID,
+                {
+                    "status": IngestionJobStatus.COMPLETED,
+                    "progress": {"stage": "completed"},
+                    "error": None,
+                },
+            )
+            if updated:
+                await emit(get_job_event(updated, status=IngestionJobStatus.COMPLETED))
+        except asyncio.CancelledError:
+            # The processing thread stops at its next progress report
+            cancelled.set()
+            updated = await run_in_db_threadpool(
+                IngestionJobs.update_job_by_id,
+                job.id,
+                {"status": IngestionJobStatus.CANCELLED},
+            )
+            await emit(
+                get_job_event(updated or job, status=IngestionJobStatus.CANCELLED)
+            )
+            raise
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+            log.error(f"Ingestion job {job.id} for file {job.file_id} failed: {error}")
+
+            attempts = job.attempts + 1
+            if attempts <= FILE_PROCESSING_MAX_RETRIES:
+                updated = await run_in_db_threadpool(
+                    IngestionJobs.update_running_job_by_id,
+                    job.id,
+                    INSTANCE_ID,
+                    {
+                        "status": IngestionJobStatus.PENDING,
+                        "error": error,
+                        "task_id": None,
+                        "instance_id": None,
+                        "run_after": int(time.time()) + 30 * 2 ** (attempts - 1),
+                    },
+                )
+            else:
+                updated = await run_in_db_threadpool(
+                    IngestionJobs.update_running_job_by_id,
+                    job.id,
+                    INSTANCE_ID,
+                    {"status": IngestionJobStatus.FAILED, "error": error},
+                )
+                if updated:
+                    await run_in_db_threadpool(
+                        Files.update_file_data_by_id, job.file_id, {"error": error}
+                    )
+
+            if updated:
+                await emit(get_job_event(updated, error=error))
+        finally:
+            if processing is None or processing.done():
+                self._release(job.id)
+            else:
+                # Free the slot once the thread stops at its next progress report
+                processing.add_done_callback(
+                    lambda future: self._release(job.id, future)
+                )
+
+
+INGESTION_WORKER = IngestionWorker()
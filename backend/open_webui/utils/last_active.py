@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from open_webui.env import (
+    LAST_ACTIVE_FLUSH_INTERVAL,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.internal.db import run_in_db_threadpool
+from open_webui.models.users import Users
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+# Take everything aggregated so far, in one step so no timestamp recorded in
+# between is lost
+LAST_ACTIVE_DRAIN_SCRIPT = """
+local values = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return values
+"""
+
+
+class LastActiveTracker:
+    """
+    Buffers users' last active timestamps and writes them in bulk, instead of
+    an UPDATE and commit on every authenticated request.
+
+    record() only sets the timestamp in a local dict. Every interval seconds
+    the buffer is flushed in a single executemany UPDATE. With Redis, nodes
+    push their buffers into a shared hash and the node that takes the flush
+    lock for the interval writes them all, so the user table sees one write
+    per interval whatever the number of nodes.
+    """
+
+    def __init__(
+        self,
+        interval: float = LAST_ACTIVE_FLUSH_INTERVAL,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_key_prefix: str = "open-webui",
+    ):
+        self.interval = interval
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.redis = None
+        self._redis_key = f"{redis_key_prefix}:last_active"
+        if redis_url:
+            self.redis = get_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+
+    def record(self, user_id: str) -> None:
+        if self.interval <= 0:
+            Users.update_user_last_active_by_id(user_id)
+            return
+
+        with self._lock:
+            self._pending[user_id] = int(time.time())
+
+    def _take_pending(self) -> dict[str, int]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _aggregate(self, pending: dict[str, int]) -> Optional[dict[str, int]]:
+        """
+        Push a buffer to Redis and, if this node is the one writing for this
+        interval, return everything aggregated from all nodes.
+        """
+        if pending:
+            self.redis.hset(self._redis_key, mapping=pending)
+
+        if not self.redis.set(
+            f"{self._redis_key}:lock", "1", nx=True, ex=max(1, int(self.interval))
+        ):
+            return None
+
+        values = self.redis.eval(LAST_ACTIVE_DRAIN_SCRIPT, 1, self._redis_key)
+        return {
+            values[index]: int(values[index + 1]) for index in range(0, len(values), 2)
+        }
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Write the buffered timestamps. force skips the Redis aggregation and
+        writes this node's buffer directly, e.g. on shutdown.
+        """
+        pending = self._take_pending()
+
+        if self.redis and not force:
+            try:
+                pending = self._aggregate(pending)
+                if pending is None:
+                    return
+            except Exception as e:
+                log.error(f"Failed to aggregate last active timestamps in Redis: {e}")
+
+        if pending and not Users.update_users_last_active_by_ids(pending):
+            log.error(f"Failed to write last active timestamps of {len(pending)} users")
+
+    async def start(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_db_threadpool(self.flush)
+            except Exception as e:
+                log.exception(f"Error flushing last active timestamps: {e}")
+
+
+LAST_ACTIVE_TRACKER = LastActiveTracker(
+    redis_url=REDIS_URL,
+    redis_sentinels=get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+    redis_key_prefix=REDIS_KEY_PREFIX,
+)
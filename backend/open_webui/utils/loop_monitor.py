@@ -0,0 +1,51 @@
+import asyncio
+import logging
+import time
+
+from open_webui.env import (
+    EVENT_LOOP_LAG_INTERVAL,
+    EVENT_LOOP_LAG_WARN_THRESHOLD,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed sleep. Any blocking
+    call on the loop (sync DB or Redis access, heavy CPU work) shows up as lag,
+    which is logged above a threshold and exported as the
+    webui.event_loop.lag metric.
+    """
+
+    def __init__(
+        self,
+        interval: float = EVENT_LOOP_LAG_INTERVAL,
+        warn_threshold: float = EVENT_LOOP_LAG_WARN_THRESHOLD,
+    ):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        # Worst lag since the last collect_max_lag(), so short stalls between
+        # metric exports are not lost
+        self.max_lag = 0.0
+
+    async def start(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.warn_threshold:
+                log.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+
+    def collect_max_lag(self) -> float:
+        lag, self.max_lag = self.max_lag, 0.0
+        return lag
+
+
+EVENT_LOOP_MONITOR = EventLoopLagMonitor()
@@ -1,6 +1,8 @@
 import time
 import logging
 import asyncio
+import hashlib
+import json
 import sys
 
 from aiocache import cached
@@ -76,6 +78,20 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
+def get_models_version(models: list[dict]) -> str:
+    """Digest of a model list, ignoring timestamps that change on every build."""
+    return hashlib.sha256(
+        json.dumps(
+            [
+                {key: value for key, value in model.items() if key != "created"}
+                for model in models
+            ],
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
 async def get_all_models(request, refresh: bool = False, user: UserModel = None):
     if (
         request.app.state.MODELS
@@ -92,6 +108,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
     # If there are no models, return an empty list
     if len(models) == 0:
+        request.app.state.MODELS_VERSION = get_models_version([])
         return []
 
     # Add arena models
@@ -279,6 +296,7 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
     log.debug(f"get_all_models() returned {len(models)} models")
 
     request.app.state.MODELS = {model["id"]: model for model in models}
+    request.app.state.MODELS_VERSION = get_models_version(models)
     return models
 
 
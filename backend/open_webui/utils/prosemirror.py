@@ -0,0 +1,56 @@
+import pycrdt as Y
+
+
+# Name of the XmlFragment y-prosemirror binds the editor to
+PROSEMIRROR_FRAGMENT = "prosemirror"
+
+
+def get_attrs_json(attrs) -> dict:
+    return {
+        # Yjs stores numbers as floats
+        key: int(value) if isinstance(value, float) and value.is_integer() else value
+        for key, value in attrs
+    }
+
+
+def get_text_json(text: Y.XmlText) -> list[dict]:
+    nodes = []
+    for chunk, attributes in text.diff():
+        if not isinstance(chunk, str) or not chunk:
+            continue
+
+        node = {"type": "text", "text": chunk}
+        marks = []
+        for name, attrs in (attributes or {}).items():
+            # y-prosemirror suffixes overlapping marks with "--<hash>"
+            mark = {"type": name.split("--")[0]}
+            if isinstance(attrs, dict) and attrs:
+                mark["attrs"] = get_attrs_json(attrs.items())
+            marks.append(mark)
+        if marks:
+            node["marks"] = marks
+        nodes.append(node)
+    return nodes
+
+
+def get_children_json(children) -> list[dict]:
+    content = []
+    for child in children:
+        if isinstance(child, Y.XmlText):
+            content.extend(get_text_json(child))
+        elif isinstance(child, Y.XmlElement):
+            node = {"type": child.tag}
+            attrs = get_attrs_json(child.attributes)
+            if attrs:
+                node["attrs"] = attrs
+            child_content = get_children_json(child.children)
+            if child_content:
+                node["content"] = child_content
+            content.append(node)
+    return content
+
+
+def get_prosemirror_json(ydoc: Y.Doc) -> dict:
+    """The ProseMirror document a y-prosemirror bound Y.Doc holds."""
+    fragment = ydoc.get(PROSEMIRROR_FRAGMENT, type=Y.XmlFragment)
+    return {"type": "doc", "content": get_children_json(fragment.children)}
@@ -8,6 +8,7 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.event_loop.lag (gauge, milliseconds, worst lag per export interval)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -34,8 +35,9 @@ from opentelemetry.sdk.resources import SERVICE_NAME, Resource
 
 from open_webui.env import OTEL_SERVICE_NAME, OTEL_EXPORTER_OTLP_ENDPOINT
 
-from open_webui.socket.main import get_active_user_ids
+from open_webui.socket.main import get_active_user_count
 from open_webui.models.users import Users
+from open_webui.utils.loop_monitor import EVENT_LOOP_MONITOR
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
@@ -67,6 +69,9 @@ def _build_meter_provider() -> MeterProvider:
         View(
             instrument_name="webui.users.active",
         ),
+        View(
+            instrument_name="webui.event_loop.lag",
+        ),
     ]
 
     provider = MeterProvider(
@@ -100,7 +105,7 @@ def setup_metrics(app: FastAPI) -> None:
     ) -> Sequence[metrics.Observation]:
         return [
             metrics.Observation(
-                value=len(get_active_user_ids()),
+                value=get_active_user_count(),
             )
         ]
 
@@ -127,6 +132,22 @@ def setup_metrics(app: FastAPI) -> None:
         callbacks=[observe_active_users],
     )
 
+    def observe_event_loop_lag(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [
+            metrics.Observation(
+                value=EVENT_LOOP_MONITOR.collect_max_lag() * 1000.0,
+            )
+        ]
+
+    meter.create_observable_gauge(
+        name="webui.event_loop.lag",
+        description="Worst event loop lag since the previous export",
+        unit="ms",
+        callbacks=[observe_event_loop_lag],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from typing import Optional
+
+from fastapi import Request, Response
+
+from open_webui.env import (
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+class VersionCounters:
+    """
+    Named counters bumped whenever the data behind a read-mostly endpoint
+    changes, e.g. "groups" or "note_folders:{user_id}". Endpoints derive ETags
+    from them, so answering a conditional GET costs a counter lookup instead of
+    a query.
+
+    Counters live in Redis when it is configured so that all nodes agree, and
+    in process otherwise. The epoch changes whenever the counters start over
+    (process restart, Redis flush) so old ETags can never match again.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        redis_sentinels: Optional[list] = [],
+        redis_key_prefix: str = "open-webui",
+    ):
+        self.redis = None
+        self.prefix = f"{redis_key_prefix}:versions"
+        self._epoch = uuid.uuid4().hex
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if redis_url:
+            self.redis = get_redis_connection(
+                redis_url, redis_sentinels, decode_responses=True
+            )
+
+    @property
+    def epoch(self) -> str:
+        if self.redis:
+            try:
+                key = f"{self.prefix}:epoch"
+                self.redis.set(key, self._epoch, nx=True)
+                return self.redis.get(key) or self._epoch
+            except Exception as e:
+                log.error(f"Failed to read the version epoch from Redis: {e}")
+        return self._epoch
+
+    def get(self, *keys: str) -> list[int]:
+        if self.redis:
+            try:
+                values = self.redis.mget([f"{self.prefix}:{key}" for key in keys])
+                return [int(value or 0) for value in values]
+            except Exception as e:
+                log.error(f"Failed to read versions from Redis: {e}")
+
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def bump(self, *keys: str) -> list[int]:
+        """Increment the counters, returns their new values."""
+        if self.redis:
+            try:
+                pipe = self.redis.pipeline()
+                for key in keys:
+                    pipe.incr(f"{self.prefix}:{key}")
+                return [int(value) for value in pipe.execute()]
+            except Exception as e:
+                log.error(f"Failed to bump versions in Redis: {e}")
+
+        with self._lock:
+            for key in keys:
+                self._counters[key] = self._counters.get(key, 0) + 1
+            return [self._counters[key] for key in keys]
+
+
+VERSIONS = VersionCounters(
+    redis_url=REDIS_URL,
+    redis_sentinels=get_sentinels_from_env(REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT),
+    redis_key_prefix=REDIS_KEY_PREFIX,
+)
+
+
+####################
+# ETags
+####################
+
+
+def get_etag(*parts) -> str:
+    """Strong ETag for a response identified by the given versions and keys."""
+    digest = hashlib.sha256(
+        json.dumps([VERSIONS.epoch, *parts], default=str).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def set_etag_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Per-user payloads: browsers may keep them but must revalidate
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def get_not_modified_response(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag_headers(response, etag)
+    return response